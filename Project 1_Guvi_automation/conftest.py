@@ -1,36 +1,346 @@
-from guvi_automation.utils.logger import logger,log_result_json
-from guvi_automation.drivers.driver_factory import create_driver
+from guvi_automation.utils.logger import (logger, configure_logging, set_test_context, stop_logging,
+                                          merge_worker_logs, log_run_id)
+from guvi_automation.drivers.driver_factory import (create_driver, prepare_window, execute_cdp, PROFILES,
+                                                   STARTUP_TIMES, SERVICE_SETTINGS)
+from guvi_automation.drivers.driver_pool import DriverPool, BASE_URL, reset_driver_state, remember_home_window
+from guvi_automation.drivers.grid_backend import GRID_SETTINGS, NODE_LATENCY, BACKPRESSURE
+from guvi_automation.utils.wait_engine import AdaptiveWait, WAIT_RECORDS
+from guvi_automation.utils.auth_session import AuthSession
+from guvi_automation.utils.replay_proxy import ReplayProxy, REPLAY_MODES
+from guvi_automation.utils.network_blocker import (DEFAULT_BLOCK_LIST, block_list_for, apply_blocking,
+                                                   clear_blocking, blocked_requests, learn_sizes,
+                                                   estimate_saved_bytes, save_sizes)
+from guvi_automation.utils.page_metrics import PAGE_METRICS, PAGE_LOAD_BUDGET, summary_table
+from guvi_automation.utils.data_loader import load_test_data, TEST_DATA_SCHEMA
+from guvi_automation.utils.locators import LOCATORS
+from guvi_automation.pages.base_page import BasePage
+from guvi_automation.pages.login_page import LoginPage
+from guvi_automation.pages.elements import ELEMENT_STATS
+from selenium.common.exceptions import TimeoutException
+from guvi_automation.utils.result_store import ResultStore
+from guvi_automation.utils.screenshot_writer import ScreenshotWriter, should_capture, CAPTURE_POLICIES
+from guvi_automation.utils.report_paging import pager_html
+from guvi_automation.utils.dom_snapshot import save_dom_snapshot, SNAPSHOT_POLICIES
+from guvi_automation.utils.rerun_engine import RerunBudget, run_with_reruns, RETRYABLE_CLASSES
 import pytest,pytest_html,os,json
 from datetime import datetime
-from selenium import webdriver
 from pytest_html import extras
 
+result_store = None  # SQLite result store, opened in pytest_configure
+html_page_size = 0  # Rows per page of the HTML results table, from --html-page-size
+rerun_budget = None  # In-browser retry limits, set in pytest_configure when --reruns > 0
+
+# Longest-first scheduling from historical durations, enabled with --duration-schedule.
+# Test impact map of page methods and locators per test, used by --impact-select.
+pytest_plugins = ["guvi_automation.utils.duration_scheduler", "guvi_automation.utils.test_impact"]
+
 # Initialize pytest-html plugin
 def pytest_configure(config):
     global pytest_html
     pytest_html = config.pluginmanager.getplugin("html")
 
+    # The replay proxy listens on 127.0.0.1 of this machine, which browsers on Grid nodes cannot reach
+    if config.getoption("--grid-url") and config.getoption("--replay-mode") != "off":
+        raise pytest.UsageError("--replay-mode cannot be combined with --grid-url (or $SELENIUM_GRID_URL): "
+                                "the replay proxy is only reachable from local browsers")
+
+    # Logging goes through a queue to one listener thread; each process writes its own file, named after its run
+    workerinput = getattr(config, "workerinput", {})
+    configure_logging(worker=workerinput.get("workerid", "master"), browser=config.getoption("--browser"),
+                      run_id=workerinput.get("log_run_id"))
+
+    # Driver service strategy used by create_driver
+    SERVICE_SETTINGS["cached_resolution"] = not config.getoption("--no-driver-cache")
+    SERVICE_SETTINGS["shared_service"] = config.getoption("--shared-driver-service")
+    SERVICE_SETTINGS["grid_url"] = config.getoption("--grid-url")
+    GRID_SETTINGS["capacity_timeout"] = config.getoption("--grid-capacity-timeout")
+    for capability in config.getoption("--grid-capability"):
+        name, _, value = capability.partition("=")
+        try:
+            GRID_SETTINGS["extra_capabilities"][name] = json.loads(value)
+        except ValueError:
+            GRID_SETTINGS["extra_capabilities"][name] = value  # Plain strings need no JSON quoting
+
+    # Background writer for screenshots, so teardown does not wait for disk I/O
+    config._screenshot_writer = ScreenshotWriter(make_thumbnails=not config.getoption("--no-screenshot-thumbnails"))
+    if not config._screenshot_writer.make_thumbnails and not config.getoption("--no-screenshot-thumbnails") \
+            and not hasattr(config, "workerinput"):
+        logger.warning("Pillow is not installed - screenshot thumbnails are disabled, the report links full images")
+
+    global html_page_size
+    html_page_size = config.getoption("--html-page-size")
+
+    global rerun_budget
+    if config.getoption("--reruns") > 0:
+        rerun_budget = RerunBudget(
+            max_reruns=config.getoption("--reruns"),
+            max_seconds=config.getoption("--rerun-budget") or None,
+            retry_on=[c.strip() for c in config.getoption("--rerun-on").split(",") if c.strip()],
+        )
+
+    # Results are stored once, by the process that sees every report: the xdist controller or a plain run
+    global result_store
+    if not hasattr(config, "workerinput"):
+        result_store = ResultStore(browser=config.getoption("--browser"))
+
+# Flushes pending screenshots before pytest-html writes the report in its own sessionfinish hook
+@pytest.hookimpl(tryfirst=True)
+def pytest_sessionfinish(session):
+    writer = getattr(session.config, "_screenshot_writer", None)
+    if writer:
+        writer.close()
+        session.config._screenshot_writer = None
+
+    save_sizes()  # Third-party resource sizes learned from unblocked tests
+
+    # An xdist worker hands its driver startup and Grid numbers to the controller (see pytest_testnodedown)
+    if hasattr(session.config, "workeroutput"):
+        session.config.workeroutput["driver_stats"] = {
+            "startup_times": STARTUP_TIMES, "node_latency": NODE_LATENCY, "backpressure": BACKPRESSURE,
+        }
+
+    global result_store
+    if result_store:
+        result_store.close()  # Writes the last partial batch
+        result_store = None
+
+# Controller side of the worker hand-over above, so the terminal summary covers every worker
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    stats = getattr(node, "workeroutput", {}).get("driver_stats")
+    if not stats:
+        return
+    for browser, times in stats["startup_times"].items():
+        STARTUP_TIMES.setdefault(browser, []).extend(times)
+    for grid_node, latency in stats["node_latency"].items():
+        merged = NODE_LATENCY.setdefault(grid_node, {"sessions": [], "commands": []})
+        merged["sessions"].extend(latency["sessions"])
+        merged["commands"].extend(latency["commands"])
+    BACKPRESSURE["waits"] += stats["backpressure"]["waits"]
+    BACKPRESSURE["seconds"] += stats["backpressure"]["seconds"]
+
+# Workers name their log files after the controller's run, so it merges its own workers and no other browser's
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    node.workerinput["log_run_id"] = log_run_id()
+
+# Stops the log listener last, so records from every other hook are written; the controller then merges its run's logs
+def pytest_unconfigure(config):
+    stop_logging()
+    if not hasattr(config, "workerinput"):
+        merge_worker_logs()
+
+# Stamps log records with the test that is running
+def pytest_runtest_logstart(nodeid, location):
+    set_test_context(nodeid)
+
+def pytest_runtest_logfinish(nodeid, location):
+    set_test_context()
+
 #  Enables flexible cross-browser execution
 def pytest_addoption(parser):
     parser.addoption("--browser", action="store", default="chrome", help="Browser to run tests on")
+    parser.addoption("--browser-profile", action="store", default="default", choices=sorted(PROFILES),
+                     help="Browser performance profile: default (headed) or fast (headless, eager, no images)")
+    parser.addoption("--no-driver-cache", action="store_true",
+                     help="Let Selenium Manager resolve the driver on every start (the old behaviour, for comparison)")
+    parser.addoption("--shared-driver-service", action="store_true",
+                     help="Chrome/Edge: run every session of a worker on one long-lived driver process")
+    parser.addoption("--grid-url", action="store", default=os.environ.get("SELENIUM_GRID_URL"),
+                     help="Run browsers on this Selenium Grid, e.g. http://localhost:4444 (default: $SELENIUM_GRID_URL)")
+    parser.addoption("--grid-capacity-timeout", action="store", type=float, default=300,
+                     help="Seconds to wait for a free Grid slot before failing the test")
+    parser.addoption("--grid-capability", action="append", default=[],
+                     help="Extra capability for Grid sessions as name=value (value parsed as JSON when possible)")
+    parser.addoption("--driver-mode", action="store", default="pooled", choices=["pooled", "isolated"],
+                     help="pooled: reuse warm browsers between tests, isolated: new browser per test")
+    parser.addoption("--pool-size", action="store", type=int, default=1, help="Warm browsers kept per worker")
+    parser.addoption("--driver-max-uses", action="store", type=int, default=25,
+                     help="Number of tests a pooled browser serves before it is recycled")
+    parser.addoption("--screenshot-policy", action="store", default="always", choices=CAPTURE_POLICIES,
+                     help="always, failures (failed tests only) or sampled (failures plus a share of passes)")
+    parser.addoption("--screenshot-sample-rate", action="store", type=float, default=0.1,
+                     help="Share of passing tests captured with --screenshot-policy=sampled")
+    parser.addoption("--no-screenshot-thumbnails", action="store_true",
+                     help="Link full-size screenshots in the report instead of writing thumbnails (Pillow)")
+    parser.addoption("--html-page-size", action="store", type=int, default=0,
+                     help="Show the HTML report results table in pages of this many rows (0 = all)")
+    parser.addoption("--dom-snapshots", action="store", default="failures", choices=SNAPSHOT_POLICIES,
+                     help="Save the page DOM to snapshots/ for the offline locator health check")
+    parser.addoption("--replay-mode", action="store", default="off", choices=REPLAY_MODES,
+                     help="record: save site responses to the archive, replay: serve them offline")
+    parser.addoption("--replay-archive", action="store", default=os.path.join(os.path.dirname(__file__), "recordings"),
+                     help="Directory holding recorded responses for --replay-mode")
+    parser.addoption("--block-third-party", action="store_true",
+                     help="Block chat widget, analytics and ad requests (opt out with @pytest.mark.allow_third_party)")
+    parser.addoption("--session-max-age", action="store", type=int, default=3600,
+                     help="Seconds a saved login session is reused before logging in again")
+    parser.addoption("--reruns", action="store", type=int, default=0,
+                     help="Retry a test failing with a retryable error up to this many times in the same browser")
+    parser.addoption("--rerun-budget", action="store", type=float, default=300,
+                     help="Seconds each worker may spend on retries in total (0 = no limit)")
+    parser.addoption("--rerun-on", action="store", default=",".join(RETRYABLE_CLASSES),
+                     help="Comma-separated failure classes to retry: timeout, stale_element, navigation, assertion, other")
 
 # Session-scoped fixture that retrieves the browser name from CLI options
 @pytest.fixture(scope="session")
 def browser_name(request):
     return request.config.getoption("--browser")
 
+# Session-scoped fixture that retrieves the browser performance profile from CLI options
+@pytest.fixture(scope="session")
+def browser_profile(request):
+    return request.config.getoption("--browser-profile")
+
+# Local record/replay proxy, one per worker. Yields None when --replay-mode=off.
+@pytest.fixture(scope="session")
+def replay_proxy(request):
+    mode = request.config.getoption("--replay-mode")
+    if mode == "off":
+        yield None
+        return
+
+    proxy = ReplayProxy(request.config.getoption("--replay-archive"), mode=mode).start()
+    logger.info(f"Replay proxy ({mode}) listening on {proxy.address}")
+    yield proxy
+    missing = proxy.stop()
+    for method, url in missing:
+        logger.warning(f"Replay miss (not fetched): {method} {url}")
+    request.config._replay_missing = getattr(request.config, "_replay_missing", []) + missing
+
+# Session-scoped pool of warm browsers. Each xdist worker runs its own session, so the pool is per worker.
+@pytest.fixture(scope="session")
+def driver_pool(request, browser_name, browser_profile, replay_proxy):
+    # An empty block list still turns on the Chrome/Edge performance log, so @block_urls tests can count blocked requests
+    if request.config.getoption("--block-third-party"):
+        block_list = DEFAULT_BLOCK_LIST
+    elif any(item.get_closest_marker("block_urls") for item in request.session.items):
+        block_list = []
+    else:
+        block_list = None
+    pool = DriverPool(
+        browser_name,
+        profile_name=browser_profile,
+        proxy=replay_proxy.address if replay_proxy else None,
+        block_list=block_list,
+        size=request.config.getoption("--pool-size"),
+        max_uses=request.config.getoption("--driver-max-uses"),
+    )
+    yield pool
+    pool.shutdown()  # Quits every warm browser once the session is over
+
 # Function-based driver fixture
 @pytest.fixture(scope="function")
-def driver(request, browser_name): # Initializes a new browser instance for each test function
+def driver(request, browser_name, browser_profile, driver_pool, replay_proxy):
+    block_enabled = request.config.getoption("--block-third-party")
+    patterns = block_list_for(request.node, block_enabled)
+    is_firefox = browser_name.lower() == "firefox"
+
+    # Per-test isolation stays available via --driver-mode=isolated or the isolated_driver marker.
+    # Firefox applies its block list per browser, so a Firefox test that opts out needs an unblocked browser.
+    isolated = (request.config.getoption("--driver-mode") == "isolated"
+                or request.node.get_closest_marker("isolated_driver") is not None
+                or (is_firefox and block_enabled and not patterns))
+
+    if isolated:
+        proxy = replay_proxy.address if replay_proxy else None
+        block_list = (patterns or None) if is_firefox else driver_pool.block_list
+        driver = create_driver(browser_name, browser_profile, proxy, block_list)  # Dynamically creates the WebDriver based on the CLI --browser option
+        prepare_window(driver, browser_profile)
+        remember_home_window(driver)  # The window an in-browser rerun resets back to
+    else:
+        driver = driver_pool.acquire()  # Warm browser, reset and parked on a blank page
+
+    # Chrome and Edge block per test over CDP, before the first page of the test loads
+    blocking = bool(patterns) and apply_blocking(driver, patterns, execute_cdp)
+    if blocking:
+        blocked_requests(driver)  # Drains log entries left over from earlier tests
+
+    if driver.current_url.rstrip("/") != BASE_URL.rstrip("/"):
+        BasePage(driver).navigate_to(BASE_URL)  # Navigates to the base URL, timed like every other page load
 
-    driver = create_driver(browser_name)
-    # Dynamically creates the WebDriver based on the CLI --browser option
+    yield driver  # Yields control to the test function. Keeps setup and teardown cleanly separated
 
-    driver.get("https://www.guvi.in/") # Navigates to the base URL
-    driver.maximize_window()
+    if blocking:
+        blocked = blocked_requests(driver)
+        clear_blocking(driver, execute_cdp)
+        saved = {"requests": len(blocked), "bytes": estimate_saved_bytes(blocked)}
+        request.node.user_properties.append(("third_party_blocked", saved))
+        logger.info(f"{request.node.nodeid} - blocked {saved['requests']} third-party requests, ~{saved['bytes']} bytes saved")
+    elif not patterns:
+        learn_sizes(driver)   # Unblocked run - remember third-party sizes to estimate future savings
 
-    yield driver #  Yields control to the test function. Keeps setup and teardown cleanly separated
-    driver.quit()  # Gracefully shuts down the browser after test execution
+    if isolated:
+        driver.quit()  # Gracefully shuts down the browser after test execution
+    else:
+        driver_pool.release(driver)  # Resets state for the next test, or recycles the browser
+
+
+# Credentials from tests/test_data.json, read when a test needs them instead of when its module is collected.
+# Each test gets its own copy of the cached document.
+@pytest.fixture(scope="function")
+def test_data():
+    return load_test_data("tests/test_data.json", schema=TEST_DATA_SCHEMA)
+
+# Full UI login with the valid credentials from test_data.json
+def _ui_login(driver):
+    credentials = load_test_data("tests/test_data.json")["valid_login"]
+    BasePage(driver).click_base_login_button()
+    LoginPage(driver).login_functionality_valid_user(credentials["email"], credentials["password"])
+
+# The profile menu is only rendered for a logged-in user
+def _is_authenticated(driver):
+    from selenium.webdriver.support import expected_conditions as EC  # Only once a browser runs, never at collection
+    try:
+        AdaptiveWait(driver).until(
+            EC.presence_of_element_located(LOCATORS["DashboardPage"]["profile_menu"]), "session_valid", timeout=5
+        )
+        return True
+    except TimeoutException:
+        return False
+
+# One saved login per browser and xdist worker, reused until it expires or the site rejects it
+@pytest.fixture(scope="session")
+def auth_session(request, browser_name):
+    worker = getattr(request.config, "workerinput", {}).get("workerid", "main")
+    state_path = os.path.join(os.path.dirname(__file__), ".auth", f"guvi_{browser_name}_{worker}.json")
+    return AuthSession(state_path, _ui_login, _is_authenticated,
+                       max_age=request.config.getoption("--session-max-age"))
+
+# Driver that is already logged in. Tests that exercise the login flow itself keep using the plain driver fixture.
+@pytest.fixture(scope="function")
+def authenticated_driver(driver, auth_session):
+    return auth_session.ensure(driver)
+
+# Saves the current DOM on demand, e.g. dom_snapshot("login_form") once a page has rendered
+@pytest.fixture(scope="function")
+def dom_snapshot(request, driver):
+    def capture(name=None):
+        return save_dom_snapshot(driver.page_source, name or request.node.name, "guvi", driver.current_url)
+    return capture
+
+
+# Starts every test with an empty wait log, so each report only lists its own waits
+@pytest.fixture(autouse=True)
+def wait_records():
+    WAIT_RECORDS.clear()
+    yield WAIT_RECORDS
+
+# Per-element lookup counts and times, kept per test like the wait log
+@pytest.fixture(autouse=True)
+def element_stats():
+    ELEMENT_STATS.clear()
+    yield ELEMENT_STATS
+
+
+# Starts every test with no recorded navigations and applies its @pytest.mark.page_load_budget(ms), if any
+@pytest.fixture(autouse=True)
+def page_metrics(request):
+    PAGE_METRICS.clear()
+    marker = request.node.get_closest_marker("page_load_budget")
+    PAGE_LOAD_BUDGET["ms"] = marker.args[0] if marker else None
+    yield PAGE_METRICS
+    PAGE_LOAD_BUDGET["ms"] = None
 
 
 """- Pytest hook that intercepts the test report generation phase.
@@ -47,54 +357,228 @@ def pytest_runtest_makereport(item, call):
         screenshot_path = None
         driver = item.funcargs.get("driver", None)
 
-        if driver:
-            os.makedirs("screenshots", exist_ok=True)
+        writer = item.config._screenshot_writer
+        policy = item.config.getoption("--screenshot-policy")
+        sample_rate = item.config.getoption("--screenshot-sample-rate")
+
+        if driver and writer and should_capture(policy, report.passed, sample_rate):
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             status = "PASSED" if report.passed else "FAILED"
             screenshot_path = f"screenshots/{item.name}_{status}_{timestamp}.png"
-            driver.save_screenshot(screenshot_path)
+            try:
+                # Only the capture happens here - encoding to disk runs on the writer thread
+                thumbnail_path = writer.submit(driver.get_screenshot_as_png(), screenshot_path)
+                report.user_properties.append(("screenshot", screenshot_path))
+                if thumbnail_path:
+                    report.user_properties.append(("thumbnail", thumbnail_path))
+            except Exception as e:
+                logger.error(f"Screenshot capture failed: {e}")
+                screenshot_path = None
+
+        # Rendered DOM for the offline locator health check (python -m guvi_automation.utils.locator_health)
+        snapshot_policy = item.config.getoption("--dom-snapshots")
+        if driver and (snapshot_policy == "always" or (snapshot_policy == "failures" and report.failed)):
+            try:
+                snapshot_path = save_dom_snapshot(driver.page_source, item.name, "guvi", driver.current_url)
+                report.user_properties.append(("dom_snapshot", snapshot_path))
+            except Exception as e:
+                logger.error(f"DOM snapshot failed: {e}")
+
+        # In-browser retries (see pytest_pyfunc_call): count, failure classes and time spent
+        retries = getattr(item, "_reruns", None)
+        if retries:
+            rerun_info = {"count": len(retries), "seconds": round(sum(r["seconds"] for r in retries), 2),
+                          "classes": [r["class"] for r in retries]}
+            report.user_properties.append(("reruns", rerun_info))
+            for number, retry in enumerate(retries, 1):
+                logger.warning(f"{report.nodeid} - retry {number} after {retry['class']} ({retry['error']}), "
+                               f"{retry['seconds']}s")
+            extra = getattr(report, "extra", [])
+            extra.append(extras.html(
+                f"<p>Retried {rerun_info['count']}x in the same browser ({', '.join(rerun_info['classes'])}), "
+                f"{rerun_info['seconds']}s spent retrying</p>"
+            ))
+            report.extra = extra
+
+        # find_element round trips versus cache hits per declared element
+        if ELEMENT_STATS:
+            report.user_properties.append(("elements", {name: dict(s) for name, s in ELEMENT_STATS.items()}))
+
+        # Every adaptive wait of this test, so slow conditions show up in the report
+        report.user_properties.append(("waits", list(WAIT_RECORDS)))
+        for record in WAIT_RECORDS:
+            logger.info(f"{report.nodeid} - wait '{record['name']}' took {record['elapsed']}s "
+                        f"(budget {record['timeout']}s, satisfied: {record['satisfied']})")
+
+        # Page-load timing of every navigate_to call, kept per test and browser
+        if PAGE_METRICS:
+            browser = item.config.getoption("--browser")
+            report.user_properties.append(("page_metrics", {"browser": browser, "navigations": list(PAGE_METRICS)}))
+            extra = getattr(report, "extra", [])
+            extra.append(extras.html(f"<h4>Page load ({browser})</h4>" + summary_table(PAGE_METRICS)))
+            report.extra = extra
 
-        # Log to JSON and rotating log
-        log_result_json(report.nodeid, report.outcome, screenshot_path)
+        # Log to rotating log. The result store entry is written from pytest_runtest_logreport.
         logger.info(f"{report.nodeid} - {report.outcome} - Screenshot: {screenshot_path}")
 
-        # Attach to HTML report
-        try:
-            if screenshot_path and os.path.exists(screenshot_path):
-                extra = getattr(report, "extra", [])
-                extra.append(extras.image(screenshot_path, name="Image"))
-                report.extra = extra
-        except Exception as e:
-            logger.error(f"Error attaching screenshot to report: {e}")
+        # Link the screenshot from the report instead of embedding it, so large runs keep a small report
+        # even with --self-contained-html. The file is on disk before the report is written (see pytest_sessionfinish).
+        if screenshot_path:
+            extra = getattr(report, "extra", [])
+            extra.append(extras.url(screenshot_path, name="Screenshot"))
+            report.extra = extra
+
+
+# Runs the test function itself so a retryable failure can be retried in the same, reset browser.
+# Fixtures stay set up between attempts; tests without a driver, or marked no_rerun, use pytest's default call.
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    funcargs = pyfuncitem.funcargs
+    driver = funcargs.get("authenticated_driver") or funcargs.get("driver")
+    if rerun_budget is None or driver is None or pyfuncitem.get_closest_marker("no_rerun"):
+        return None
+
+    def reset():
+        reset_driver_state(driver, BASE_URL)
+        if "authenticated_driver" in funcargs:
+            funcargs["auth_session"].ensure(driver)  # The reset logged the browser out
+
+    testargs = {arg: funcargs[arg] for arg in pyfuncitem._fixtureinfo.argnames}
+    pyfuncitem._reruns = []  # Read by pytest_runtest_makereport
+    run_with_reruns(lambda: pyfuncitem.obj(**testargs), rerun_budget, reset, pyfuncitem._reruns, WAIT_RECORDS)
+    return True
 
 
 # Adds a custom column header titled “Screenshot” to the HTML report table.
 def pytest_html_results_table_header(cells):
     cells.insert(2, '<th>Screenshot</th>')
 
-# Embed screenshot thumbnail in HTML report row
+# Thumbnail linking to the full screenshot; images below the fold are only fetched when scrolled into view
 def pytest_html_results_table_row(report, cells):
-    if hasattr(report, "extra"):
-        for extra in report.extra:
-            if isinstance(extra, dict) and extra.get("name") == "Image":
-                img_html = f'<a href="{extra["content"]}" target="_blank"><img src="{extra["content"]}" width="200"/></a>'
-                cells.insert(2, img_html)
+    properties = dict(getattr(report, "user_properties", []))
+    screenshot = properties.get("screenshot")
+    if not screenshot:
+        cells.insert(2, "<td></td>")  # Keeps the column aligned for tests without a screenshot
+        return
+    thumbnail = properties.get("thumbnail") or screenshot  # Full image, scaled by the browser, without Pillow
+    cells.insert(2, f'<td><a href="{screenshot}" target="_blank">'
+                    f'<img src="{thumbnail}" width="200" loading="lazy" decoding="async"/></a></td>')
+
+# Pages the results table client-side when --html-page-size is set
+def pytest_html_results_summary(prefix, summary, postfix):
+    script = pager_html(html_page_size)
+    if script:
+        postfix.append(script)
 
 
-# Log to plain text file
+# Records every test outcome in the SQLite result store (batched, see utils/result_store.py)
 def pytest_runtest_logreport(report):
-    if report.when == "call":
-        status = "PASSED" if report.passed else "FAILED"
+    if result_store is None or not (report.when == "call" or (report.when == "setup" and not report.passed)):
+        return
 
-        # Ensure the directory exists
-        os.makedirs("tests", exist_ok=True)
+    worker = getattr(getattr(report, "node", None), "workerinput", {}).get("workerid")
+    error = report.longreprtext.strip().splitlines()[-1] if report.failed and report.longreprtext else None
+    result_store.add(
+        report.nodeid, report.outcome, report.duration,
+        worker=worker,
+        screenshot=dict(report.user_properties).get("screenshot"),
+        error=error,
+    )
 
-        with open("tests/test_execution.log", "a") as f:
-            f.write(f"{report.nodeid} - {status}\n")
 
+# Prints per-browser driver startup times and the slowest waits so they can be compared on CI runners
+def pytest_terminal_summary(terminalreporter):
+    if STARTUP_TIMES:
+        terminalreporter.section("driver startup")
+        for browser, times in STARTUP_TIMES.items():
+            terminalreporter.write_line(
+                f"{browser}: {len(times)} start(s), avg {sum(times) / len(times):.2f}s, max {max(times):.2f}s"
+            )
 
+    # Session startup and command latency per Grid node, and time spent waiting for free slots
+    if NODE_LATENCY:
+        terminalreporter.section("selenium grid")
+        for node, latency in sorted(NODE_LATENCY.items()):
+            sessions, commands = latency["sessions"], latency["commands"]
+            line = f"{node}: {len(sessions)} session(s)"
+            if sessions:
+                line += f", startup avg {sum(sessions) / len(sessions):.2f}s max {max(sessions):.2f}s"
+            if commands:
+                line += f", command avg {sum(commands) / len(commands) * 1000:.0f} ms"
+            terminalreporter.write_line(line)
+        if BACKPRESSURE["waits"]:
+            terminalreporter.write_line(
+                f"Waited for a free slot {BACKPRESSURE['waits']} time(s), {BACKPRESSURE['seconds']:.1f}s in total"
+            )
 
+    # Requests the replay archive could not answer - these were NOT fetched from the live site
+    missing = getattr(terminalreporter.config, "_replay_missing", [])
+    if missing:
+        terminalreporter.section("replay misses")
+        for method, url in missing:
+            terminalreporter.write_line(f"{method} {url}")
+        terminalreporter.write_line(f"{len(missing)} request(s) not recorded - rerun with --replay-mode=record")
 
+    # Requests and bytes the third-party block list saved
+    blocked = [dict(r.user_properties)["third_party_blocked"]
+               for r in terminalreporter.getreports("") + terminalreporter.getreports("error")
+               if r.when == "teardown" and "third_party_blocked" in dict(r.user_properties)]
+    if blocked:
+        terminalreporter.section("third-party blocking")
+        terminalreporter.write_line(
+            f"{len(blocked)} test(s): {sum(b['requests'] for b in blocked)} requests blocked, "
+            f"~{sum(b['bytes'] for b in blocked) / 1024:.0f} KB saved"
+        )
 
+    # Retries per failure class, and the tests that only passed after a retry
+    reruns = [(report, dict(report.user_properties)["reruns"])
+              for report in terminalreporter.getreports("passed") + terminalreporter.getreports("failed")
+              if report.when == "call" and "reruns" in dict(report.user_properties)]
+    if reruns:
+        terminalreporter.section("reruns")
+        by_class = {}
+        for _, info in reruns:
+            for failure_class in info["classes"]:
+                by_class[failure_class] = by_class.get(failure_class, 0) + 1
+        terminalreporter.write_line(
+            f"{len(reruns)} test(s) retried {sum(i['count'] for _, i in reruns)} time(s), "
+            f"{sum(i['seconds'] for _, i in reruns):.1f}s spent retrying "
+            f"({', '.join(f'{c}: {n}' for c, n in sorted(by_class.items()))})"
+        )
+        for report, info in reruns:
+            verdict = "passed on retry" if report.passed else "still failed"
+            terminalreporter.write_line(f"{report.nodeid}: {info['count']} retry(s), {verdict}")
 
+    # Element lookups the page-object cache saved, and the elements slowest to resolve
+    lookups = {}
+    for report in terminalreporter.getreports("passed") + terminalreporter.getreports("failed"):
+        for key, stats in report.user_properties:
+            if key == "elements":
+                for name, s in stats.items():
+                    total = lookups.setdefault(name, {"resolutions": 0, "seconds": 0.0, "hits": 0})
+                    for field in total:
+                        total[field] += s[field]
+    if lookups:
+        terminalreporter.section("element lookups")
+        terminalreporter.write_line(
+            f"{sum(s['resolutions'] for s in lookups.values())} find_element calls, "
+            f"{sum(s['hits'] for s in lookups.values())} served from the page cache"
+        )
+        for name, s in sorted(lookups.items(), key=lambda item: item[1]["seconds"], reverse=True)[:5]:
+            terminalreporter.write_line(
+                f"{s['seconds'] / max(s['resolutions'], 1) * 1000:.0f} ms avg  {name} "
+                f"({s['resolutions']} lookup(s), {s['hits']} cache hit(s))"
+            )
 
+    waits = []
+    for report in terminalreporter.getreports("passed") + terminalreporter.getreports("failed"):
+        for key, records in report.user_properties:
+            if key == "waits":
+                waits += [(record["elapsed"], report.nodeid, record) for record in records]
+    if waits:
+        terminalreporter.section("slowest waits")
+        for elapsed, nodeid, record in sorted(waits, key=lambda w: w[0], reverse=True)[:10]:
+            terminalreporter.write_line(
+                f"{elapsed:.2f}s / {record['timeout']}s  {record['name']}  {nodeid}"
+                + ("" if record["satisfied"] else "  (timed out)")
+            )
@@ -2,56 +2,231 @@
 Initializes WebDriver instances for supported browsers: Chrome, Firefox, Edge, and Safari.
 Includes browser-specific options and platform checks to ensure compatibility.
 Used by test runner scripts to abstract browser setup logic.
+Supports named performance profiles ("default" and "fast") and records driver startup time per browser.
+Driver binaries are resolved once and cached (see driver_resolver.py); Chrome and Edge can share one driver service.
+With a Selenium Grid URL configured, the same options start remote sessions instead (see grid_backend.py).
 """
 import platform
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.webdriver.edge.options import Options as EdgeOptions
-
-def create_driver(browser_name):
+import time
+from guvi_automation.utils.network_blocker import firefox_pac
+from guvi_automation.drivers.driver_resolver import make_service, start_shared_session
+from guvi_automation.drivers.grid_backend import start_remote_session
+from guvi_automation.utils.lazy_import import lazy_import
+
+webdriver = lazy_import("selenium.webdriver")   # Imported by the first create_driver call, not at collection
+
+# Named performance profiles selectable with --browser-profile.
+# "fast" trades visual fidelity for speed: headless, eager page loads, no images/extensions, fixed window size.
+PROFILES = {
+    "default": {
+        "headless": False,
+        "page_load_strategy": "normal",
+        "disable_images": False,
+        "disable_extensions": False,
+        "window_size": None,           # None -> maximize_window()
+        "reduce_throttling": False,
+    },
+    "fast": {
+        "headless": True,
+        "page_load_strategy": "eager",
+        "disable_images": True,
+        "disable_extensions": True,
+        "window_size": (1920, 1080),
+        "reduce_throttling": True,
+    },
+}
+
+# Driver startup durations in seconds, keyed by browser name. Reported at the end of the session.
+STARTUP_TIMES = {}
+
+# How driver services are started. Set from the command line by conftest.
+#   cached_resolution: reuse driver paths from the shared cache instead of running Selenium Manager every time
+#   shared_service: Chrome/Edge sessions attach to one long-lived driver process instead of starting their own
+#   grid_url: start sessions on this Selenium Grid instead of locally (see grid_backend.py)
+SERVICE_SETTINGS = {"cached_resolution": True, "shared_service": False, "grid_url": None}
+
+
+def get_profile(profile_name):
+    if profile_name not in PROFILES:
+        raise ValueError(f"Unsupported browser profile: {profile_name}")
+    return PROFILES[profile_name]
+
+
+# Applies the Chromium switches shared by Chrome and Edge
+def _apply_chromium_profile(options, profile):
+    options.page_load_strategy = profile["page_load_strategy"]
+    if profile["headless"]:
+        options.add_argument("--headless=new")
+    if profile["disable_images"]:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if profile["disable_extensions"]:
+        options.add_argument("--disable-extensions")
+    if profile["window_size"]:
+        options.add_argument("--window-size={},{}".format(*profile["window_size"]))
+    if profile["reduce_throttling"]:
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        options.add_argument("--disable-renderer-backgrounding")
+    return options
+
+
+def _apply_firefox_profile(options, profile):
+    options.page_load_strategy = profile["page_load_strategy"]
+    if profile["headless"]:
+        options.add_argument("-headless")
+    if profile["disable_images"]:
+        options.set_preference("permissions.default.image", 2)
+    if profile["disable_extensions"]:
+        options.set_preference("extensions.enabledScopes", 0)
+    if profile["window_size"]:
+        options.add_argument("--width={}".format(profile["window_size"][0]))
+        options.add_argument("--height={}".format(profile["window_size"][1]))
+    if profile["reduce_throttling"]:
+        options.set_preference("dom.min_background_timeout_value", 4)
+        options.set_preference("dom.timeout.enable_budget_throttling", False)
+    return options
+
+
+# Routes all traffic through a local proxy (see utils/replay_proxy.py) that terminates HTTPS itself
+def _apply_chromium_proxy(options, proxy):
+    options.add_argument(f"--proxy-server=http://{proxy}")
+    options.add_argument("--proxy-bypass-list=<-loopback>")
+    options.add_argument("--ignore-certificate-errors")
+    options.accept_insecure_certs = True
+    return options
+
+
+def _apply_firefox_proxy(options, proxy):
+    host, port = proxy.rsplit(":", 1)
+    options.set_preference("network.proxy.type", 1)
+    options.set_preference("network.proxy.http", host)
+    options.set_preference("network.proxy.http_port", int(port))
+    options.set_preference("network.proxy.ssl", host)
+    options.set_preference("network.proxy.ssl_port", int(port))
+    options.set_preference("network.proxy.no_proxies_on", "")
+    options.set_preference("network.proxy.allow_hijacking_localhost", True)
+    options.accept_insecure_certs = True
+    return options
+
+
+def prepare_window(driver, profile_name="default"):
+    """
+        Sizes the browser window for the given profile.
+        Profiles with a fixed window size already set it at launch, everything else is maximized.
+    """
+    if not get_profile(profile_name)["window_size"]:
+        driver.maximize_window()
+
+
+def create_driver(browser_name, profile_name="default", proxy=None, block_list=None):
     """
         Creates and returns a WebDriver instance based on the specified browser name.
 
         Args:
             browser_name (str): Name of the browser to initialize ("chrome", "firefox", "edge", "safari")
+            profile_name (str): Performance profile from PROFILES ("default" or "fast")
+            proxy (str): Optional "host:port" of the record/replay proxy
+            block_list (list): Third-party URL patterns. Firefox blocks them for the whole session; Chrome and Edge
+                only enable the performance log here (also for an empty list), the patterns themselves are applied
+                per test over CDP. None when no test blocks anything.
 
         Returns:
             WebDriver: Initialized browser driver instance
 
         Raises:
-            ValueError: If an unsupported browser name is provided
+            ValueError: If an unsupported browser or profile name is provided
             Exception: If Safari is requested on a non-macOS system
     """
+    profile = get_profile(profile_name)
+    started = time.perf_counter()
+    driver = _launch(browser_name, profile, proxy, block_list)
+
+    # Records how long the driver took to come up, so profiles can be compared on CI runners
+    elapsed = time.perf_counter() - started
+    STARTUP_TIMES.setdefault(browser_name.lower(), []).append(elapsed)
+    mode = "grid" if SERVICE_SETTINGS["grid_url"] else "shared service" if SERVICE_SETTINGS["shared_service"] else (
+        "cached driver" if SERVICE_SETTINGS["cached_resolution"] else "selenium manager")
+    print(f"{browser_name} driver started in {elapsed:.2f}s (profile: {profile_name}, {mode})")
+    return driver
 
+
+def _launch(browser_name, profile, proxy=None, block_list=None):
     browser = browser_name.lower()   # Normalize input for case-insensitive matching
 
     if browser == "chrome":
         # Configure Chrome options
-        options = ChromeOptions()
-        # Headed by default
-        return webdriver.Chrome(service=ChromeService(), options=options)
+        options = _apply_chromium_profile(webdriver.ChromeOptions(), profile)
+        if proxy:
+            _apply_chromium_proxy(options, proxy)
+        if block_list is not None:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})  # Counts blocked requests
+        # Headed unless the profile says otherwise
+        return _start("chrome", webdriver.Chrome, options)
 
     elif browser == "firefox":
         # Configure Firefox options
-        options = FirefoxOptions()
+        options = _apply_firefox_profile(webdriver.FirefoxOptions(), profile)
+        if block_list:
+            # No CDP in Firefox - a PAC file blocks the patterns and still routes the rest through the proxy
+            options.set_preference("network.proxy.type", 2)
+            options.set_preference("network.proxy.autoconfig_url", firefox_pac(block_list, proxy))
+            if proxy:
+                options.accept_insecure_certs = True
+        elif proxy:
+            _apply_firefox_proxy(options, proxy)
 
-        # Headed by default
-        return webdriver.Firefox(service=FirefoxService(), options=options)
+        # Headed unless the profile says otherwise
+        return _start("firefox", webdriver.Firefox, options)
 
     elif browser == "edge":
         # Configure Edge options
-        options = EdgeOptions()
-        return webdriver.Edge(service=EdgeService(), options=options)
+        options = _apply_chromium_profile(webdriver.EdgeOptions(), profile)
+        if proxy:
+            _apply_chromium_proxy(options, proxy)
+        if block_list is not None:
+            options.set_capability("ms:loggingPrefs", {"performance": "ALL"})  # Counts blocked requests
+        return _start("edge", webdriver.Edge, options)
 
     elif browser == "safari":
         # Safari is only supported on macOS
         if platform.system() != "Darwin":
             raise Exception("Safari is only supported on macOS")
-        return webdriver.Safari()  # Headed by default
+        if proxy:
+            raise ValueError("Record/replay is not supported on Safari")
+        if SERVICE_SETTINGS["grid_url"]:
+            raise ValueError("Selenium Grid is not supported for Safari")
+        return webdriver.Safari()  # Headed by default, profiles do not apply
 
     else:
-        raise ValueError(f"Unsupported browser: {browser_name}")
\ No newline at end of file
+        raise ValueError(f"Unsupported browser: {browser_name}")
+
+
+# Starts a session using the strategy from SERVICE_SETTINGS: remote on the Grid, or a local driver service
+def _start(browser, driver_class, options):
+    if SERVICE_SETTINGS["grid_url"]:
+        return start_remote_session(SERVICE_SETTINGS["grid_url"], browser, options)
+    if SERVICE_SETTINGS["shared_service"] and browser in ("chrome", "edge"):
+        return start_shared_session(browser, options)
+    if SERVICE_SETTINGS["cached_resolution"]:
+        return driver_class(service=make_service(browser, options), options=options)
+    return driver_class(options=options)   # Selenium Manager resolves the driver on every start
+
+
+def execute_cdp(driver, cmd, params=None):
+    """
+        Runs a Chrome DevTools Protocol command on Chromium-based drivers.
+
+        Returns:
+            dict: The command result, or None when the driver does not support CDP (Firefox, Safari)
+    """
+    try:
+        if hasattr(driver, "execute_cdp_cmd"):
+            return driver.execute_cdp_cmd(cmd, params or {})
+        # Sessions on a shared service are Remote drivers, but their Chromium connection still knows the command
+        if "executeCdpCommand" in getattr(driver.command_executor, "_commands", {}):
+            return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}})["value"]
+        return None
+    except Exception as e:
+        print(f"CDP command {cmd} failed: {e}")
+        return None
@@ -0,0 +1,125 @@
+"""
+Keeps warm WebDriver instances alive across tests instead of starting a new browser per test.
+Between tests the browser state is reset (cookies, web storage, extra windows) and parked on about:blank,
+and a browser is recycled only after a configurable number of tests or when it looks unhealthy.
+"""
+import time
+
+from guvi_automation.drivers.driver_factory import create_driver, prepare_window
+from guvi_automation.drivers.grid_backend import record_command_latency
+
+BASE_URL = "https://www.guvi.in/"
+
+
+class DriverPool:
+    # Initializes an empty pool for one browser. Sized per xdist worker, since each worker owns its own session.
+    def __init__(self, browser_name, size=1, max_uses=25, base_url=BASE_URL, profile_name="default", proxy=None, block_list=None):
+        self.browser_name = browser_name
+        self.profile_name = profile_name
+        self.proxy = proxy
+        self.block_list = block_list
+        self.size = size
+        self.max_uses = max_uses
+        self.base_url = base_url
+        self._idle = []      # Warm drivers ready to be handed out
+        self._uses = {}      # Number of tests each driver has served, keyed by id(driver)
+        self._all = []       # Every live driver owned by the pool, for shutdown
+
+    # Hands out a warm driver, starting a new browser only when none is idle
+    def acquire(self):
+        while self._idle:
+            driver = self._idle.pop()
+            if self.is_healthy(driver):
+                return driver
+            self._discard(driver)   # Unhealthy browser - replace it with a fresh one
+
+        driver = create_driver(self.browser_name, self.profile_name, self.proxy, self.block_list)
+        prepare_window(driver, self.profile_name)
+        remember_home_window(driver)
+        self._all.append(driver)
+        self._uses[id(driver)] = 0
+        return driver
+
+    # Returns a driver to the pool after a test. Recycles it once it has served max_uses tests.
+    def release(self, driver):
+        self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+
+        if self._uses[id(driver)] >= self.max_uses or len(self._idle) >= self.size:
+            self._discard(driver)
+            return
+
+        try:
+            self.reset_state(driver)
+        except Exception as e:
+            print(f"Driver state reset failed, recycling browser: {e}")
+            self._discard(driver)
+            return
+        self._idle.append(driver)
+
+    # Clears everything a previous test may have left behind. The driver fixture opens the base URL
+    # once per-test settings (such as blocked URLs) are in place, so the browser is parked on a blank page.
+    def reset_state(self, driver):
+        reset_driver_state(driver, "about:blank")
+
+    # Cheap liveness probe - a dead session raises on any command. Timed per node for Grid sessions.
+    def is_healthy(self, driver):
+        try:
+            started = time.perf_counter()
+            driver.execute_script("return document.readyState")
+            record_command_latency(driver, time.perf_counter() - started)
+            return len(driver.window_handles) >= 1
+        except Exception:
+            return False
+
+    # Quits every browser the pool still owns. Called once at session end.
+    def shutdown(self):
+        for driver in list(self._all):
+            self._discard(driver)
+        self._idle.clear()
+
+    def _discard(self, driver):
+        if driver in self._idle:
+            self._idle.remove(driver)
+        if driver in self._all:
+            self._all.remove(driver)
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"Driver quit failed: {e}")
+
+
+# Records the window a new browser opened with, which reset_driver_state keeps while closing every other one
+def remember_home_window(driver):
+    driver.home_window = driver.current_window_handle
+    return driver
+
+
+def reset_driver_state(driver, base_url=BASE_URL):
+    """
+        Resets a live browser to a clean state without restarting it.
+
+        Args:
+            driver (WebDriver): Browser to reset
+            base_url (str): URL the browser is left on after the reset
+    """
+    # Close every extra tab/window opened by the previous test. window_handles has no defined order, so the
+    # original window is the one remember_home_window recorded, not the first handle.
+    handles = driver.window_handles
+    home = getattr(driver, "home_window", None)
+    if home not in handles:
+        home = driver.home_window = handles[0]   # Never recorded, or the test closed it: keep any survivor
+    for handle in handles:
+        if handle != home:
+            driver.switch_to.window(handle)
+            driver.close()
+    driver.switch_to.window(home)
+
+    # Web storage is per origin, so clear it while still on the site the test used
+    try:
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+    except Exception:
+        pass  # about:blank and some error pages have no storage
+
+    driver.delete_all_cookies()
+    driver.get(base_url)
@@ -0,0 +1,129 @@
+"""
+Resolves driver binaries once and reuses them.
+Selenium Manager is asked for the driver and browser paths only on a cache miss; the result is stored in a JSON
+cache shared by every xdist worker on the machine. Chrome and Edge can also share one long-lived driver service
+process across browser sessions (geckodriver only serves one session per process, so Firefox cannot).
+"""
+import atexit
+import contextlib
+import json
+import os
+import subprocess
+import time
+
+from guvi_automation.utils.file_lock import file_lock
+from guvi_automation.utils.lazy_import import lazy_import
+
+# Loaded when the first driver is resolved, not when conftest is imported
+webdriver = lazy_import("selenium.webdriver")
+remote_connection = lazy_import("selenium.webdriver.chromium.remote_connection")
+selenium_manager = lazy_import("selenium.webdriver.common.selenium_manager")
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".driver_cache")
+CACHE_FILE = os.path.join(CACHE_DIR, "drivers.json")
+CACHE_TTL = 24 * 3600   # Re-resolve daily so browser auto-updates are picked up
+
+SERVICE_CLASSES = {"chrome": "ChromeService", "edge": "EdgeService", "firefox": "FirefoxService"}   # In selenium.webdriver
+
+# Vendor prefix and browser name used by the Chromium remote connection for shared services
+_SHARED_VENDORS = {"chrome": ("goog", "chrome"), "edge": ("ms", "MicrosoftEdge")}
+
+_shared_services = {}   # browser -> running Service shared by every session in this process
+
+
+def _read_cache():
+    if not os.path.exists(CACHE_FILE):
+        return {}
+    try:
+        with open(CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _version_of(binary):
+    # "--version" works for every driver and for browsers on Linux/macOS; Windows browsers just report None
+    if not binary:
+        return None
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+        return output.strip() or None
+    except Exception:
+        return None
+
+
+def _is_usable(entry):
+    return (entry and time.time() - entry["resolved_at"] < CACHE_TTL and os.path.exists(entry["driver_path"])
+            and (not entry.get("browser_path") or os.path.exists(entry["browser_path"])))
+
+
+def resolve_driver(browser, options):
+    """
+        Returns the cached {"driver_path", "browser_path", "driver_version", "browser_version"} for a browser,
+        resolving it with Selenium Manager on a miss. Sets options.binary_location to the resolved browser.
+    """
+    started = time.perf_counter()
+    entry = _read_cache().get(browser)
+    source = "cache"
+
+    if not _is_usable(entry):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with file_lock(CACHE_FILE + ".lock"):   # Whoever locks first resolves, the other workers wait for the cache
+            cache = _read_cache()   # Another worker may have resolved it while this one waited
+            entry = cache.get(browser)
+            if not _is_usable(entry):
+                source = "selenium-manager"
+                driver_path = selenium_manager.SeleniumManager().driver_location(options)
+                browser_path = getattr(options, "binary_location", None) or None
+                entry = {
+                    "driver_path": driver_path,
+                    "browser_path": browser_path,
+                    "driver_version": _version_of(driver_path),
+                    "browser_version": _version_of(browser_path),
+                    "resolved_at": time.time(),
+                }
+                cache[browser] = entry
+                with open(CACHE_FILE + f".{os.getpid()}.tmp", "w") as f:
+                    json.dump(cache, f, indent=2)
+                os.replace(CACHE_FILE + f".{os.getpid()}.tmp", CACHE_FILE)
+
+    if entry.get("browser_path") and not getattr(options, "binary_location", None):
+        options.binary_location = entry["browser_path"]
+    print(f"{browser} driver resolved from {source} in {time.perf_counter() - started:.2f}s: {entry['driver_path']}")
+    return entry
+
+
+def make_service(browser, options):
+    # Service with an explicit executable path, so Selenium Manager is not invoked again for this session
+    service_class = getattr(webdriver, SERVICE_CLASSES[browser])
+    return service_class(executable_path=resolve_driver(browser, options)["driver_path"])
+
+
+def start_shared_session(browser, options):
+    """
+        Starts a browser session on this process's long-lived driver service, starting the service on first use.
+        Quitting the session leaves the service running for the next one; services stop at interpreter exit.
+    """
+    if browser not in _SHARED_VENDORS:
+        raise ValueError(f"Shared driver service is not supported for {browser}")
+
+    service = _shared_services.get(browser)
+    if service is None or not service.is_connectable():
+        service = make_service(browser, options)
+        service.start()
+        _shared_services[browser] = service
+
+    vendor_prefix, browser_name = _SHARED_VENDORS[browser]
+    executor = remote_connection.ChromiumRemoteConnection(
+        remote_server_addr=service.service_url, vendor_prefix=vendor_prefix, browser_name=browser_name,
+        ignore_proxy=options._ignore_local_proxy,
+    )
+    return webdriver.Remote(command_executor=executor, options=options)
+
+
+@atexit.register
+def stop_shared_services():
+    for service in _shared_services.values():
+        with contextlib.suppress(Exception):
+            service.stop()
+    _shared_services.clear()
@@ -0,0 +1,142 @@
+"""
+Remote WebDriver backend for Selenium Grid 4 (hub/node or a single standalone server).
+create_driver builds the same browser options as for a local run, then driver_factory hands them to
+start_remote_session when --grid-url is set. Before a session is requested, the Grid /status endpoint is polled
+until a slot for the browser is free, so workers back off instead of piling requests into a saturated grid.
+Session startup and command round trips are tracked per Grid node and reported at the end of the run.
+"""
+import json
+import time
+import urllib.error
+import urllib.request
+
+from guvi_automation.utils.lazy_import import lazy_import
+
+webdriver = lazy_import("selenium.webdriver")
+
+# Capabilities merged into the browser options for every remote session, per browser.
+# Containerised Grid nodes run Chromium without a sandbox and with a small /dev/shm.
+GRID_CAPABILITIES = {
+    "chrome": {"arguments": ["--no-sandbox", "--disable-dev-shm-usage"], "capabilities": {}},
+    "edge": {"arguments": ["--no-sandbox", "--disable-dev-shm-usage"], "capabilities": {}},
+    "firefox": {"arguments": [], "capabilities": {}},
+}
+
+# browserName a Grid slot advertises in its stereotype
+GRID_BROWSER_NAMES = {"chrome": "chrome", "edge": "MicrosoftEdge", "firefox": "firefox"}
+
+# Grid settings, set from the command line by conftest
+GRID_SETTINGS = {"capacity_timeout": 300, "extra_capabilities": {}}
+
+# Per node URI: session startup times, command round trips and seconds spent waiting for a free slot
+NODE_LATENCY = {}
+BACKPRESSURE = {"waits": 0, "seconds": 0.0}
+
+
+class GridSaturatedError(RuntimeError):
+    pass
+
+
+class GridClient:
+    def __init__(self, grid_url, timeout=10):
+        self.grid_url = grid_url.rstrip("/")
+        self.timeout = timeout
+
+    def status(self):
+        """
+            Returns the "value" object of GET /status.
+
+            Raises:
+                RuntimeError: If the Grid cannot be reached or answers with something other than JSON
+        """
+        try:
+            with urllib.request.urlopen(f"{self.grid_url}/status", timeout=self.timeout) as response:
+                return json.load(response)["value"]
+        except (urllib.error.URLError, OSError, ValueError, KeyError) as e:
+            raise RuntimeError(f"Selenium Grid at {self.grid_url} is not reachable: {e}")
+
+    # Free slots for a browser across every node that is up
+    def free_slots(self, browser, status=None):
+        status = status or self.status()
+        wanted = GRID_BROWSER_NAMES[browser]
+        return sum(
+            1
+            for node in status.get("nodes", []) if node.get("availability", "UP") == "UP"
+            for slot in node.get("slots", [])
+            if slot.get("session") is None and slot.get("stereotype", {}).get("browserName") == wanted
+        )
+
+    # Node URI currently running a session, or None when the Grid no longer lists it
+    def node_for_session(self, session_id, status=None):
+        status = status or self.status()
+        for node in status.get("nodes", []):
+            for slot in node.get("slots", []):
+                if (slot.get("session") or {}).get("sessionId") == session_id:
+                    return node.get("uri")
+        return None
+
+    def wait_for_slot(self, browser, timeout=300, initial_poll=0.5, max_poll=5.0):
+        """
+            Blocks until the Grid has a free slot for the browser (backpressure).
+
+            Raises:
+                GridSaturatedError: If no slot frees up within timeout seconds
+        """
+        started = time.perf_counter()
+        poll = initial_poll
+        while True:
+            status = self.status()
+            if status.get("ready", True) and self.free_slots(browser, status) > 0:
+                waited = time.perf_counter() - started
+                if waited > initial_poll:
+                    BACKPRESSURE["waits"] += 1
+                    BACKPRESSURE["seconds"] += waited
+                return
+            if time.perf_counter() - started > timeout:
+                raise GridSaturatedError(f"No free {browser} slot on {self.grid_url} after {timeout}s")
+            time.sleep(poll)
+            poll = min(poll * 1.5, max_poll)
+
+
+def apply_grid_capabilities(browser, options):
+    preset = GRID_CAPABILITIES.get(browser, {"arguments": [], "capabilities": {}})
+    for argument in preset["arguments"]:
+        if argument not in options.arguments:
+            options.add_argument(argument)
+    for name, value in {**preset["capabilities"], **GRID_SETTINGS["extra_capabilities"]}.items():
+        options.set_capability(name, value)
+    return options
+
+
+def start_remote_session(grid_url, browser, options):
+    """
+        Starts a browser session on the Grid once it has capacity, and records which node serves it.
+
+        Raises:
+            ValueError: If the browser has no Grid preset
+            GridSaturatedError: If the Grid stays full for GRID_SETTINGS["capacity_timeout"] seconds
+    """
+    if browser not in GRID_BROWSER_NAMES:
+        raise ValueError(f"Selenium Grid is not supported for {browser}")
+
+    client = GridClient(grid_url)
+    client.wait_for_slot(browser, timeout=GRID_SETTINGS["capacity_timeout"])
+
+    started = time.perf_counter()
+    driver = webdriver.Remote(command_executor=client.grid_url, options=apply_grid_capabilities(browser, options))
+    elapsed = time.perf_counter() - started
+
+    try:
+        node = client.node_for_session(driver.session_id) or client.grid_url
+    except RuntimeError:
+        node = client.grid_url
+    driver._grid_node = node
+    NODE_LATENCY.setdefault(node, {"sessions": [], "commands": []})["sessions"].append(elapsed)
+    return driver
+
+
+def record_command_latency(driver, seconds):
+    # Called with the duration of a cheap command (the pool's health probe); ignored for local drivers
+    node = getattr(driver, "_grid_node", None)
+    if node:
+        NODE_LATENCY.setdefault(node, {"sessions": [], "commands": []})["commands"].append(seconds)
@@ -1,18 +1,80 @@
+import time
+
 from guvi_automation.drivers.error_handler import capture_error
 from guvi_automation.utils.locators import LOCATORS
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from guvi_automation.utils.wait_engine import AdaptiveWait
+from guvi_automation.utils.dom_scripts import ELEMENT_STATES_JS, FILL_FIELDS_JS, TAB_STATE_JS, locator_to_js
+from guvi_automation.utils.page_metrics import cdp_metrics, record_navigation, check_budget
+from guvi_automation.utils.lazy_import import lazy_import
+from guvi_automation.pages.elements import Element, record_lookup
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
+
+# selenium.webdriver is only imported once a page object actually waits on something
+ui = lazy_import("selenium.webdriver.support.ui")
+EC = lazy_import("selenium.webdriver.support.expected_conditions")
 
 class BasePage:
+    # Elements resolved lazily on first use and memoized until the page navigates (see pages/elements.py)
+    signup_button = Element("BasePage", "signup_button")
+    base_login_button = Element("BasePage", "base_login_button")
+    dobby_welcome = Element("BasePage", "dobby_welcome")
+
     # Initializes the page object with a WebDriver instance and loads locator dictionary for BasePage
     def __init__(self, driver):
         self.driver = driver
         self.locators = LOCATORS["BasePage"]  #  Centralized locator mapping for modularity
+        self.waits = AdaptiveWait(driver)  # Adaptive waits replace static sleeps and are timed per condition
+        self._element_cache = {}  # Resolved WebElements keyed by locator tuple, valid until the next navigation
+
+    # Returns the element for a locator, resolving it only on the first use. Lookups are timed per element name.
+    def find(self, locator, name=None):
+        name = name or f"{type(self).__name__}{locator}"
+        element = self._element_cache.get(locator)
+        if element is not None:
+            record_lookup(name)
+            return element
+        started = time.perf_counter()
+        element = self.driver.find_element(*locator)
+        record_lookup(name, time.perf_counter() - started)
+        self._element_cache[locator] = element
+        return element
+
+    # Runs an action on a cached element. A stale element is dropped, re-resolved and the action retried once.
+    def interact(self, locator, action, name=None):
+        try:
+            return action(self.find(locator, name))
+        except StaleElementReferenceException:
+            self._element_cache.pop(locator, None)
+            return action(self.find(locator, name))
+
+    def fill(self, **values):
+        """
+            Types into several fields with a single execute_script call instead of one send_keys per field.
+
+            Args:
+                values: Element attribute name -> text, e.g. fill(email_textbox="a@b.c", password_textbox="...")
+
+            Returns:
+                list: Names of fields that were not found on the page (empty when everything was filled)
+        """
+        fields = {}
+        for name, text in values.items():
+            fields[name] = dict(locator_to_js(getattr(type(self), name).locator), text=text)
+        return self.driver.execute_script(FILL_FIELDS_JS, fields)
+
+    # Stores an element already resolved by a wait, so the next action does not look it up again
+    def remember(self, locator, element):
+        self._element_cache[locator] = element
+        return element
 
-    # Navigates to a given URL
+    # Drops every cached element. Called whenever the page navigates away.
+    def clear_element_cache(self):
+        self._element_cache.clear()
+
+    # Navigates to a given URL and records its page-load timing
     def navigate_to(self, url):
+        self.clear_element_cache()
+        cdp_before = cdp_metrics(self.driver)  # Baseline, so DevTools durations cover this navigation only
         try:
             self.driver.get(url)   #  Direct navigation
         except Exception as e:
@@ -20,17 +82,19 @@ class BasePage:
 
             raise Exception(f"Navigation failed: {e}")
 
+        metrics = record_navigation(self.driver, url, cdp_before)
+        check_budget(metrics)   # Fails the test if it declared a page_load_budget that this load exceeded
+        return metrics
+
     # Checks visibility of login button
     def is_base_login_button_visible(self):
-        return self.driver.find_element(*self.locators["base_login_button"]).is_displayed()
+        return self.base_login_button.is_displayed()
 
     #  Verifies login button is interactable - uses explicit wait and exception
     def is_base_login_button_clickable(self):
         try:
-            element = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.locators["base_login_button"])
-            )
-            return element.is_displayed() and element.is_enabled()
+            self.base_login_button.wait(EC.element_to_be_clickable, "base_login_clickable", timeout=10)
+            return True  # element_to_be_clickable already checked that it is displayed and enabled
         except Exception as e:
             print(f"Login button not clickable: {e}")
             capture_error(self.driver, "base_login_button_clickable_error")
@@ -39,7 +103,8 @@ class BasePage:
     # Clicks login button only if safe. Raises exception on failure
     def click_base_login_button(self):
         if self.is_base_login_button_clickable():
-            self.driver.find_element(*self.locators["base_login_button"]).click()
+            self.base_login_button.click()
+            self.clear_element_cache()  # The click navigates to the sign-in page
         else:
             capture_error(self.driver, "base_login_button_not_clickable")
             raise Exception("Login button is not clickable")
@@ -47,7 +112,7 @@ class BasePage:
     # Signup button methods - Checks visibility of signup button. Gracefully handles missing element.
     def is_signup_button_visible(self):
         try:
-            return self.driver.find_element(*self.locators["signup_button"]).is_displayed()
+            return self.signup_button.is_displayed()
         except Exception as e:
             print(f"Sign-Up button not found: {e}")
             return False
@@ -55,9 +120,7 @@ class BasePage:
     # Waits for signup button to be clickable
     def is_signup_button_clickable(self):
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.locators["signup_button"])
-            )
+            self.signup_button.wait(EC.element_to_be_clickable, "signup_clickable", timeout=10)
             return True
         except:
             return False
@@ -65,7 +128,8 @@ class BasePage:
     # Attempts to click signup button.
     def click_signup_button(self):
         try:
-            self.driver.find_element(*self.locators["signup_button"]).click()
+            self.signup_button.click()
+            self.clear_element_cache()  # The click navigates to the register page
             return True
         except Exception as e:
             print(f"Sign-Up button not found: {e}")
@@ -78,19 +142,124 @@ class BasePage:
             raise ValueError(f"No locator defined for menu item: {item_name}")
 
         try:
-            element = WebDriverWait(self.driver, 10).until(
+            element = self.remember(locator, ui.WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located(locator)
-            )
+            ))
             return element.is_displayed() and element.is_enabled() # Validates menu item visibility and interactivity
         except Exception as e:
             print(f"Error checking menu item '{item_name}': {e}")
             return False
 
-    # Dobby Assistant methods
+    def check_menu_items(self, menu_items=None, timeout=10):
+        """
+            Checks every menu item in one execute_script call per poll instead of one wait per item.
+
+            Args:
+                menu_items (dict): Name -> locator mapping, defaults to LOCATORS["BasePage"]["menu_items"]
+                timeout (float): How long to keep polling for items that are not rendered yet
+
+            Returns:
+                dict: Name -> {"present", "count", "visible", "enabled", "clickable", "rect", "error"}
+        """
+        menu_items = menu_items if menu_items is not None else self.locators["menu_items"]
+        payload = {name: locator_to_js(locator) for name, locator in menu_items.items()}
+
+        # One round trip per poll. Usually the first poll already finds every item on a loaded page.
+        def all_present(driver):
+            states = driver.execute_script(ELEMENT_STATES_JS, payload)
+            return states if all(state["present"] for state in states.values()) else None
+
+        try:
+            return self.waits.until(all_present, "menu_items", timeout=timeout)
+        except TimeoutException:
+            states = self.driver.execute_script(ELEMENT_STATES_JS, payload)
+            missing = [name for name, state in states.items() if not state["present"]]
+            print(f"Menu items not found: {missing}")
+            return states
+
+    # Waits until the current URL contains the given fragment. Returns False instead of raising on timeout.
+    def wait_for_url_contains(self, fragment, name):
+        try:
+            return self.waits.until(EC.url_contains(fragment), name)
+        except TimeoutException:
+            print(f"URL did not contain '{fragment}': {self.driver.current_url}")
+            return False
+
+    def open_in_tabs(self, targets, timeout=30, poll=0.25):
+        """
+            Opens every target in its own tab of this driver, lets them load side by side and checks each one.
+            Navigation is started with window.location instead of driver.get, which would block until each load
+            finishes, so N pages take about as long as the slowest of them. The tabs are closed again afterwards
+            and the driver is back on the window it started from, with this page's element cache still valid.
+
+            Args:
+                targets (dict): Name -> {"url", "url_contains" (optional), "title_contains" (optional,
+                                case-insensitive), "elements" (optional name -> locator map that must be present)}
+                timeout (float): Budget shared by all tabs, counted from the moment the last one was opened
+                poll (float): Pause between two rounds over the tabs that are still loading
+
+            Returns:
+                dict: Name -> {"ok", "problems", "seconds", "url", "title", "elements"}, "elements" holding the
+                      same states check_menu_items returns
+        """
+        original = self.driver.current_window_handle
+        tabs = {}
+        results = {}
+        try:
+            started = time.perf_counter()
+            for name, target in targets.items():
+                self.driver.switch_to.new_window("tab")
+                self.driver.execute_script("window.location.href = arguments[0];", target["url"])
+                payload = {el: locator_to_js(loc) for el, loc in target.get("elements", {}).items()}
+                tabs[name] = (self.driver.current_window_handle, payload)
+
+            # One execute_script per tab per round; a tab leaves the loop once everything it expects is there
+            pending = dict(tabs)
+            deadline = time.perf_counter() + timeout
+            while True:
+                for name, (handle, payload) in list(pending.items()):
+                    self.driver.switch_to.window(handle)
+                    state = self.driver.execute_script(TAB_STATE_JS, payload)
+                    problems = _tab_problems(targets[name], state)
+                    results[name] = {
+                        "ok": not problems,
+                        "problems": problems,
+                        "seconds": round(time.perf_counter() - started, 3),
+                        "url": state["url"],
+                        "title": state["title"],
+                        "elements": state["elements"],
+                    }
+                    if not problems:
+                        del pending[name]
+                if not pending or time.perf_counter() >= deadline:
+                    break
+                time.sleep(poll)
+
+            for name in pending:
+                print(f"Tab '{name}' failed its checks: {results[name]['problems']}")
+            return results
+        finally:
+            for handle, _ in tabs.values():
+                try:
+                    self.driver.switch_to.window(handle)
+                    self.driver.close()
+                except Exception as e:
+                    print(f"Could not close tab: {e}")
+            self.driver.switch_to.window(original)
+
+    # Dobby Assistant methods - waits only as long as the widget needs to load, within its budget
+    def wait_for_dobby_widget(self):
+        try:
+            self.dobby_welcome.wait(EC.presence_of_element_located, "dobby_widget")
+            return True
+        except TimeoutException:
+            print("Dobby widget did not load in time")
+            return False
+
     def click_dobby_assistant_widget_chatbot(self):
         try:
-            elements = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_all_elements_located(self.locators["dobby_welcome"])
+            elements = ui.WebDriverWait(self.driver, 15).until(
+                EC.presence_of_all_elements_located(self.dobby_welcome.locator)
             )
             for el in elements:
                 if el.is_displayed() and el.is_enabled(): #  Iterates through multiple Dobby elements to find a clickable one.
@@ -106,8 +275,22 @@ class BasePage:
     #  Checks visibility of Dobby widget.
     def is_dobby_welcome_visible(self):
         try:
-            element = self.driver.find_element(*self.locators["dobby_welcome"])
-            return element.is_displayed()
+            return self.dobby_welcome.is_displayed()
         except Exception as e:
             print(f"Dobby welcome message not found: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+# Lists what a loaded tab still lacks compared with its open_in_tabs target; an empty list means it passed
+def _tab_problems(target, state):
+    problems = []
+    if state["readyState"] != "complete":
+        problems.append(f"still loading ({state['readyState']})")
+    if target.get("url_contains") and target["url_contains"] not in state["url"]:
+        problems.append(f"URL '{state['url']}' does not contain '{target['url_contains']}'")
+    if target.get("title_contains") and target["title_contains"].lower() not in (state["title"] or "").lower():
+        problems.append(f"title '{state['title']}' does not contain '{target['title_contains']}'")
+    missing = [name for name, element in state["elements"].items() if not element["present"]]
+    if missing:
+        problems.append(f"elements not found: {missing}")
+    return problems
@@ -1,56 +1,49 @@
 from guvi_automation.pages.login_page import LoginPage
 from guvi_automation.pages.base_page import BasePage
+from guvi_automation.pages.elements import Element
 from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from guvi_automation.utils.locators import LOCATORS
+from guvi_automation.utils.lazy_import import lazy_import
 
+ui = lazy_import("selenium.webdriver.support.ui")
+EC = lazy_import("selenium.webdriver.support.expected_conditions")
+
+
+class DashboardPage(BasePage):  # Inherits the element cache, waits and declared elements from BasePage
+    profile_menu = Element("DashboardPage", "profile_menu")
+    logout_button = Element("DashboardPage", "logout_button")
 
-class DashboardPage:
     #  Initializes the page object with WebDriver and scoped locators.
     def __init__(self, driver):
-        self.driver = driver
+        super().__init__(driver)
         self.locators = LOCATORS["DashboardPage"]
 
     #  Waits for the profile menu to be clickable before initiating logout flow.
     def logout(self):
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.locators["profile_menu"])
-            ).click() #  Ensures profile menu is interactable before clicking
+            self.profile_menu.wait(EC.element_to_be_clickable, "profile_menu_ready", timeout=10)
+            self.profile_menu.click() #  Ensures profile menu is interactable before clicking
 
-            WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable(self.locators["logout_button"])
-            ).click()  #  Explicit wait for logout button
+            self.logout_button.wait(EC.element_to_be_clickable, "logout_ready", timeout=10)
+            self.logout_button.click()  #  Explicit wait for logout button
 
             # Wait for redirect to complete
-            WebDriverWait(self.driver, 10).until(EC.url_changes(self.driver.current_url))
+            url = self.driver.current_url
+            self.clear_element_cache()
+            ui.WebDriverWait(self.driver, 10).until(EC.url_changes(url))
             return True
         # Exception arises when logout got failed
         except Exception as e:
             print(f"Logout failed: {e}")
             return False
 
-    # Validates the logout by checking URL.
+    # Validates the logout by checking URL, then that the login button is back on the page.
     def is_logged_out(self):
-        def is_logged_out(self):
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.url_to_be("https://www.guvi.in/")
-                )
-                # Optional DOM check for login button
-                return self.driver.find_element(*self.locators["login_button"]).is_displayed()
-            except TimeoutException:
-                print(f"Post-logout URL mismatch: {self.driver.current_url}")
-                return False
-
-
-
-
-
-
-
-
-
-
+        try:
+            ui.WebDriverWait(self.driver, 10).until(
+                EC.url_to_be("https://www.guvi.in/")
+            )
+            return self.base_login_button.is_displayed()
+        except TimeoutException:
+            print(f"Post-logout URL mismatch: {self.driver.current_url}")
+            return False
@@ -0,0 +1,80 @@
+"""
+Declarative elements for the page objects.
+A page class declares `email_textbox = Element("LoginPage", "email_textbox")`; reading `page.email_textbox` returns
+a lazy proxy, and the element is only looked up when the proxy is first used. Lookups are memoized in the page's
+element cache until the page navigates, a stale element is re-resolved once, and every lookup is timed per element.
+Every locator read is also reported to the test impact map, which cannot see names passed around as strings.
+"""
+
+from guvi_automation.utils.locators import LOCATORS
+from guvi_automation.utils.test_impact import record_locator
+
+# Lookups per element for the current test: "Page.name" -> {"resolutions", "seconds", "hits"}. Reset by conftest.
+ELEMENT_STATS = {}
+
+
+def record_lookup(name, seconds=None):
+    # seconds=None counts a cache hit, anything else a find_element round trip
+    stats = ELEMENT_STATS.setdefault(name, {"resolutions": 0, "seconds": 0.0, "hits": 0})
+    if seconds is None:
+        stats["hits"] += 1
+    else:
+        stats["resolutions"] += 1
+        stats["seconds"] = round(stats["seconds"] + seconds, 4)
+
+
+class Element:
+    # Descriptor bound to one entry of LOCATORS, so a method inherited by another page still finds its own element
+    def __init__(self, group, key):
+        self.group = group
+        self.key = key
+        self.name = f"{group}.{key}"
+
+    # Read by the proxy and by BasePage.fill alike, so fields named by string are recorded too
+    @property
+    def locator(self):
+        record_locator(f"LOCATORS.{self.group}.{self.key}")
+        return LOCATORS[self.group][self.key]
+
+    def __get__(self, page, owner=None):
+        if page is None:
+            return self
+        return ElementProxy(page, self.locator, self.name)
+
+
+class ElementProxy:
+    # Stands in for a WebElement; attribute access resolves it through the page cache with stale-element retry
+    def __init__(self, page, locator, name):
+        self.page = page
+        self.locator = locator
+        self.name = name
+
+    # The WebElement itself, from the cache when this page state already resolved it
+    def resolve(self):
+        return self.page.find(self.locator, self.name)
+
+    def __getattr__(self, attr):
+        value = self.page.interact(self.locator, lambda el: getattr(el, attr), self.name)
+        if not callable(value):
+            return value  # Properties such as text or tag_name
+        # Methods are re-bound on every call, so a retry after a stale element uses the fresh element
+        return lambda *args, **kwargs: self.page.interact(
+            self.locator, lambda el: getattr(el, attr)(*args, **kwargs), self.name)
+
+    def wait(self, condition, name, timeout=None):
+        """
+            Waits for an expected condition on this element and keeps the element it returns.
+
+            Args:
+                condition (callable): Expected-condition factory taking a locator, e.g. EC.element_to_be_clickable
+                name (str): Wait name for the budget and the wait report
+                timeout (float): Overrides the budget for this call
+
+            Returns:
+                WebElement: The element the condition returned
+        """
+        element = self.page.waits.until(condition(self.locator), name, timeout=timeout)
+        return self.page.remember(self.locator, element)
+
+    def __repr__(self):
+        return f"<element {self.name} {self.locator}>"
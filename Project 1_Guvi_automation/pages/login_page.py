@@ -1,12 +1,20 @@
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-import time
 from guvi_automation.pages.base_page import BasePage
+from guvi_automation.pages.elements import Element
 from guvi_automation.utils.locators import LOCATORS
+from guvi_automation.utils.lazy_import import lazy_import
+
+ui = lazy_import("selenium.webdriver.support.ui")
+EC = lazy_import("selenium.webdriver.support.expected_conditions")
 
 # Initializes the login page object with driver and locator dictionary.
 class LoginPage(BasePage): # Inherits reusable methods from BasePage
+    email_textbox = Element("LoginPage", "email_textbox")
+    password_textbox = Element("LoginPage", "password_textbox")
+    login_submit_button = Element("LoginPage", "login_submit_button")
+    my_courses_element = Element("LoginPage", "my_courses_element")
+    invalid_feedback = Element("LoginPage", "invalid_feedback")
+
     def __init__(self, driver):
         super().__init__(driver)
         self.driver = driver
@@ -14,40 +22,44 @@ class LoginPage(BasePage): # Inherits reusable methods from BasePage
 
     #  Navigates to login page via homepage.
     def open_login_page(self):
-        self.driver.get("https://www.guvi.in")
-        WebDriverWait(self.driver, 20).until(
-            EC.element_to_be_clickable(self.locators["login_submit_button"])
+        self.navigate_to("https://www.guvi.in")  # Clears the element cache and records the page load
+        ui.WebDriverWait(self.driver, 20).until(
+            EC.element_to_be_clickable(self.login_submit_button.locator)
         ).click()
-        WebDriverWait(self.driver, 10).until(
+        ui.WebDriverWait(self.driver, 10).until(
             EC.url_to_be("https://www.guvi.in/sign-in/")
         )
 
     #  Inputs email into textbox
     def enter_email(self, email):
-        self.driver.find_element(*self.locators["email_textbox"]).send_keys(email)
+        self.email_textbox.send_keys(email)
 
     # Inputs password to the textbox
     def enter_password(self, password):
-        self.driver.find_element(*self.locators["password_textbox"]).send_keys(password)
+        self.password_textbox.send_keys(password)
 
     #  Submits login form
     def click_login_submit(self):
-        self.driver.find_element(*self.locators["login_submit_button"]).click()
+        self.login_submit_button.click()
+        self.clear_element_cache()  # Submitting the form navigates away
 
     #  Executes full login flow for valid credentials
     def login_functionality_valid_user(self, email, password):
-        self.enter_email(email)
-        self.enter_password(password)
-        time.sleep(10)  # Static wait
+        # Both fields in one script call; only fields the script did not find are typed, so none is filled twice
+        missing = self.fill(email_textbox=email, password_textbox=password)
+        if "email_textbox" in missing:
+            self.enter_email(email)
+        if "password_textbox" in missing:
+            self.enter_password(password)
+        # Waits until the submit button is ready instead of a fixed sleep
+        self.login_submit_button.wait(EC.element_to_be_clickable, "login_submit_ready")
         self.click_login_submit()
         return self.is_login_successful()
 
     # Verifies login success by checking for dashboard element.
     def is_login_successful(self):
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located(self.locators["my_courses_element"])
-            )
+            self.my_courses_element.wait(EC.presence_of_element_located, "login_success")
             return True
         except TimeoutException:
             self.driver.save_screenshot("login_failure.png") #  Screenshot on failure
@@ -56,9 +68,7 @@ class LoginPage(BasePage): # Inherits reusable methods from BasePage
     # Validates error message for failed login
     def assert_login_failed_with_error(self):
         try:
-            error_element = WebDriverWait(self.driver, 10).until(
-                EC.visibility_of_element_located(self.locators["invalid_feedback"])
-            )
+            error_element = self.invalid_feedback.wait(EC.visibility_of_element_located, "login_error", timeout=10)
             assert error_element.is_displayed(), "Error message not displayed" #  Raises assertion if error message is missing
             print(f"Login failed as expected. Message: {error_element.text}")
         except Exception as e:
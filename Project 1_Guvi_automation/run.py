@@ -1,38 +1,145 @@
-import pytest
+import argparse
+import html
+import os
+import subprocess
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
 from datetime import datetime
 
 # Entry point for executing smoke tests across multiple browsers.
-# Encapsulates logic for looping through configurations
-
-def run_smoke_browser_tests():
-    # Defines a list of tuples mapping Pytest markers to browser names.
-    configs = [
-        ("chrome", "chrome"),
-        ("edge", "edge"),
-        ("firefox", "firefox")
+# Each browser runs in its own pytest process at the same time, so the total time is roughly the slowest browser.
+
+# Defines a list of tuples mapping Pytest markers to browser names.
+CONFIGS = [
+    ("chrome", "chrome"),
+    ("edge", "edge"),
+    ("firefox", "firefox")
+]
+
+_print_lock = threading.Lock()
+
+
+# Builds the pytest command line for one browser. Workers > 1 fans the browser out with pytest-xdist.
+def build_command(marker, browser, workers, junit_path, report_name):
+    command = [
+        sys.executable, "-m", "pytest",
+        "guvi_automation/tests/",   #  Path to test directory
+
+        "-m", f"smoke and {marker}", # Marker-based filtering for smoke + browser
+
+        f"--browser={browser}", # Custom CLI option to select browser
+
+        f"--junitxml={junit_path}",  # Machine-readable results merged into the consolidated report
+
+        f"--html={report_name}", # Output HTML report with dynamic name
+
+        "--self-contained-html"  # Embeds CSS/JS only - screenshots are linked from screenshots/, not inlined
     ]
+    if workers > 1:
+        command += ["-n", str(workers)]
+    return command
+
+
+# Streams one browser's output line by line, prefixed with the browser name so interleaved output stays readable.
+# Stores the moment the process exits in finished[browser], so each browser gets its own wall time.
+def _stream_output(browser, process, finished):
+    for line in process.stdout:
+        with _print_lock:
+            print(f"[{browser.upper()}] {line.rstrip()}", flush=True)
+    process.wait()
+    finished[browser] = time.perf_counter()
 
-    #  Iterates through each browser configuration and prints a status message.
+
+# Reads a junit xml file into {test id: (outcome, duration)}
+def parse_junit(junit_path):
+    results = {}
+    if not os.path.exists(junit_path):
+        return results
+
+    for case in ET.parse(junit_path).getroot().iter("testcase"):
+        test_id = f"{case.get('classname')}::{case.get('name')}"
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error"):
+                outcome = "failed"
+            elif child.tag == "skipped":
+                outcome = "skipped"
+        results[test_id] = (outcome, float(case.get("time", 0)))
+    return results
+
+
+# Writes one HTML table with a row per test and a column per browser
+def write_consolidated_report(per_browser, wall_times, report_path):
+    browsers = list(per_browser)
+    test_ids = sorted({test_id for results in per_browser.values() for test_id in results})
+    colours = {"passed": "#c8f7c5", "failed": "#f7c5c5", "skipped": "#f7efc5"}
+
+    header = "".join(f"<th>{html.escape(b)} ({wall_times[b]:.1f}s)</th>" for b in browsers)
+    rows = []
+    for test_id in test_ids:
+        cells = []
+        for browser in browsers:
+            outcome, duration = per_browser[browser].get(test_id, ("not run", 0.0))
+            colour = colours.get(outcome, "#eeeeee")
+            cells.append(f'<td style="background:{colour}">{outcome} ({duration:.2f}s)</td>')
+        rows.append(f"<tr><td>{html.escape(test_id)}</td>{''.join(cells)}</tr>")
+
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(
+            "<html><head><meta charset='utf-8'><title>Consolidated Smoke Report</title></head><body>"
+            f"<h1>Consolidated Smoke Report</h1><p>Generated {datetime.now().isoformat(timespec='seconds')}</p>"
+            "<table border='1' cellpadding='4' cellspacing='0'>"
+            f"<tr><th>Test</th>{header}</tr>{''.join(rows)}</table></body></html>"
+        )
+
+
+def run_smoke_browser_tests(configs=CONFIGS, workers=1):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    os.makedirs("reports", exist_ok=True)
+
+    # Starts every browser at once, each in its own pytest process
+    processes, finished = {}, {}
     for marker, browser in configs:
-        print(f"\nRunning SMOKE tests on {browser.upper()}...")
+        print(f"\nStarting SMOKE tests on {browser.upper()} with {workers} worker(s)...")
 
         # Generates a unique timestamped report filename per browser.
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_name = f"report_smoke_{browser}_{timestamp}.html"
+        junit_path = os.path.join("reports", f"junit_smoke_{browser}_{timestamp}.xml")
 
-        pytest.main([
-            "guvi_automation/tests/",   #  Path to test directory
+        process = subprocess.Popen(
+            build_command(marker, browser, workers, junit_path, report_name),
+            stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1
+        )
+        reader = threading.Thread(target=_stream_output, args=(browser, process, finished), daemon=True)
+        reader.start()
+        processes[browser] = (process, reader, junit_path, time.perf_counter())
 
-            "-m", f"smoke and {marker}", # Marker-based filtering for smoke + browser
+    # Waits for all browsers and collects their results
+    per_browser, wall_times, exit_codes = {}, {}, {}
+    for browser, (process, reader, junit_path, started) in processes.items():
+        exit_codes[browser] = process.wait()
+        reader.join()
+        wall_times[browser] = finished[browser] - started
+        per_browser[browser] = parse_junit(junit_path)
 
-            f"--browser={browser}", # Custom CLI option to select browser
+    for browser in sorted(wall_times, key=wall_times.get):
+        print(f"{browser.upper()} finished in {wall_times[browser]:.1f}s (exit code {exit_codes[browser]})")
 
-            f"--html={report_name}", # Output HTML report with dynamic name
-
-            "--self-contained-html"  # Ensures report is standalone with embedded assets
-        ])
+    report_path = os.path.join("reports", f"report_smoke_consolidated_{timestamp}.html")
+    write_consolidated_report(per_browser, wall_times, report_path)
+    print(f"\nConsolidated report: {report_path}")
 
+    return 0 if all(code in (0, 5) for code in exit_codes.values()) else 1  # 5 = no tests collected
 
 
 if __name__ == "__main__":
-    run_smoke_browser_tests()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Run GUVI smoke tests on all browsers in parallel")
+    parser.add_argument("--browsers", nargs="+", default=[browser for _, browser in CONFIGS],
+                        help="Browsers to include in the matrix")
+    parser.add_argument("--workers", type=int, default=1, help="pytest-xdist workers per browser")
+    args = parser.parse_args()
+
+    selected = [(marker, browser) for marker, browser in CONFIGS if browser in args.browsers]
+    sys.exit(run_smoke_browser_tests(selected, workers=args.workers))
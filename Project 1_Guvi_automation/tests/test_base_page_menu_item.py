@@ -6,6 +6,7 @@ import pytest
 def test_menu_items_display(driver):  # Assumes a fixture is injecting the WebDriver instance
     page = BasePage(driver) # Instantiates the page object using the shared driver.
 
-    # Iterates through key menu items and validates both visibility and clickability.
+    # Checks every menu item in a single browser round trip, then validates both visibility and clickability.
+    states = page.check_menu_items()
     for item in ["Courses", "LIVE Classes", "Practice", "Resources", "Products"]:
-        assert page.is_menu_item_visible_and_clickable(item), f"{item} is not visible or clickable"
\ No newline at end of file
+        assert states[item]["visible"] and states[item]["clickable"], f"{item} is not visible or clickable: {states[item]}"
\ No newline at end of file
@@ -1,17 +1,13 @@
 from guvi_automation.pages.base_page import BasePage
 from guvi_automation.pages.dashboard_page import DashboardPage
 from guvi_automation.pages.login_page import LoginPage
-from guvi_automation.utils.data_loader import load_test_data
 import pytest
 
-test_data = load_test_data("C:\\Users\\Rajesh C\\PycharmProjects\\Guvi_Projects\\guvi_automation\\tests\\test_data.json")
-# Load the valid credential from the json file
-
 @pytest.mark.edge
 # Tags the test for Edge browser execution — great for cross-browser filtering.
 
 # Method is for Login-logout flow and its validation
-def test_login_logout_flow(driver):
+def test_login_logout_flow(driver, test_data):
     # Assumes a fixture is injecting the WebDriver instance
 
     base= BasePage(driver)  # Instantiates the page object using the shared driver.
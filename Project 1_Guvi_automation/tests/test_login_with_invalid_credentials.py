@@ -1,14 +1,10 @@
 from guvi_automation.pages.login_page import LoginPage
 from guvi_automation.pages.base_page import BasePage
-from guvi_automation.utils.data_loader import load_test_data
 import pytest
 
-# Load the valid credential from the json file
-test_data = load_test_data("C:\\Users\\Rajesh C\\PycharmProjects\\Guvi_Projects\\guvi_automation\\tests\\test_data.json")
-
 # Tags the test for firefox browser execution — great for cross-browser filtering.
 @pytest.mark.firefox
-def test_login_with_invalid_credentials(driver):
+def test_login_with_invalid_credentials(driver, test_data):
     # Assumes a fixture is injecting the WebDriver instance
 
     base = BasePage(driver)  # Instantiates the page object using the shared driver.
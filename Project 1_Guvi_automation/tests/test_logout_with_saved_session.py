@@ -0,0 +1,19 @@
+from guvi_automation.pages.dashboard_page import DashboardPage
+import pytest
+
+@pytest.mark.edge
+# Tags the test for Edge browser execution — great for cross-browser filtering.
+
+# Logout only needs a logged-in user, so it starts from the saved session instead of the UI login flow
+def test_logout_with_saved_session(authenticated_driver, auth_session):
+    dashboard = DashboardPage(authenticated_driver) # Instantiates the page object using the shared driver.
+
+    logged_out = dashboard.logout()
+    auth_session.clear()  # Logging out ends the saved session on the server too, so the next test logs in afresh
+    assert logged_out, "Logout failed" # Perform Logout
+
+    expected_logout_url = "https://www.guvi.in/"
+    actual_url = authenticated_driver.current_url
+
+    assert actual_url == expected_logout_url, f"Expected logout URL: {expected_logout_url}, but got: {actual_url}"
+    # Validates URL after logout and navigate to the base page
@@ -0,0 +1,42 @@
+import pytest
+from guvi_automation.pages.base_page import BasePage
+from guvi_automation.utils.locators import LOCATORS
+
+# Pages reached from the homepage header, each checked in its own tab of the same browser
+NAVIGATION_TARGETS = {
+    "sign_in": {
+        "url": "https://www.guvi.in/sign-in/",
+        "url_contains": "sign-in",
+        "title_contains": "GUVI",
+        "elements": {
+            "email_textbox": LOCATORS["LoginPage"]["email_textbox"],
+            "password_textbox": LOCATORS["LoginPage"]["password_textbox"],
+        },
+    },
+    "register": {
+        "url": "https://www.guvi.in/register/",
+        "url_contains": "register",
+        "title_contains": "GUVI",
+    },
+    "courses": {
+        "url": "https://www.guvi.in/courses/",
+        "url_contains": "courses",
+        "title_contains": "GUVI",
+    },
+}
+
+# Smoke test - the three pages load side by side, so this takes about one page load instead of three
+@pytest.mark.smoke
+@pytest.mark.chrome
+def test_navigation_targets_load_in_tabs(driver):
+    base = BasePage(driver)
+    original = driver.current_window_handle
+
+    results = base.open_in_tabs(NAVIGATION_TARGETS, timeout=30)
+
+    failed = {name: result["problems"] for name, result in results.items() if not result["ok"]}
+    assert not failed, f"Tabs failed their checks: {failed}"
+
+    # The helper closes its tabs and leaves the driver on the window it started from
+    assert driver.window_handles == [original]
+    assert driver.current_window_handle == original
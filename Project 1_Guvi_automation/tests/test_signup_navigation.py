@@ -1,12 +1,10 @@
 import pytest
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
 from guvi_automation.pages.base_page import BasePage
 
 # Tags the test for firefox browser execution — great for cross-browser filtering.
 @pytest.mark.firefox
 def test_signup_redirect(driver):
+    from selenium.webdriver.support.ui import WebDriverWait  # Imported here so collection stays selenium-free
     base = BasePage(driver) # Instantiates the page object using the shared driver.
 
     try:
@@ -1,13 +1,14 @@
 from guvi_automation.pages.base_page import BasePage
-import time
 import pytest
 
 # Tags the test for chrome browser execution — great for cross-browser filtering.
 @pytest.mark.chrome
+@pytest.mark.allow_third_party
+# The Dobby widget is a third-party script, so this test opts out of --block-third-party
 def test_dobby_assistant_presence(driver):  # Assumes a fixture is injecting the WebDriver instance
     base = BasePage(driver)  # Initializes the page object model with the shared driver instance.
 
-    time.sleep(25)
+    base.wait_for_dobby_widget()  # Waits for the widget to load instead of a fixed 25 s sleep
 
     base.click_dobby_assistant_widget_chatbot() # Triggers the chatbot widget via encapsulated page method.
 
@@ -5,6 +5,8 @@ from guvi_automation.pages.base_page import BasePage
 @pytest.mark.smoke
 @pytest.mark.chrome
 # Tags the test for chrome browser execution — great for cross-browser filtering.
+@pytest.mark.page_load_budget(15000)
+# Fails the test if the homepage takes longer than 15 s to load
 
 def test_url_is_valid(driver):  # Assumes a fixture is injecting the WebDriver instance
 
@@ -0,0 +1,42 @@
+import json
+import os
+import subprocess
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# -p plugin that writes the selenium.webdriver modules loaded once collection has finished
+PROBE = """
+import json, os, sys
+
+def pytest_collection_finish(session):
+    with open(os.environ["COLLECTION_PROBE_OUTPUT"], "w") as f:
+        json.dump(sorted(name for name in sys.modules if name.startswith("selenium.webdriver")), f)
+"""
+
+
+# Collecting the UI suite must not load selenium.webdriver (see utils/lazy_import.py)
+def test_collection_does_not_import_selenium_webdriver(tmp_path):
+    (tmp_path / "collection_probe.py").write_text(PROBE)
+    output = tmp_path / "modules.json"
+    env = dict(os.environ, COLLECTION_PROBE_OUTPUT=str(output),
+               PYTHONPATH=os.pathsep.join([str(tmp_path)] + [path for path in sys.path if path]))
+
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", TESTS_DIR, "--collect-only", "-q", "--ignore", os.path.join(TESTS_DIR, "unit"),
+         "-p", "collection_probe", "-p", "no:cacheprovider", "--no-impact-record"],
+        capture_output=True, text=True, env=env, timeout=120,
+    )
+
+    assert result.returncode == 0, result.stdout[-2000:]
+    assert json.loads(output.read_text()) == []
+
+
+# The probe behind the regression: pytest's fixture scan looks up _pytestfixturefunction on every conftest global
+def test_private_attribute_lookup_does_not_import():
+    from guvi_automation.utils.lazy_import import lazy_import
+    module = lazy_import("json.decoder")
+    assert getattr(module, "_pytestfixturefunction", None) is None
+    assert "not loaded" in repr(module)
+    assert module.JSONDecodeError.__name__ == "JSONDecodeError"
+    assert "(loaded)" in repr(module)
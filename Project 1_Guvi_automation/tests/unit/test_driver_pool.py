@@ -0,0 +1,52 @@
+from guvi_automation.drivers.driver_pool import remember_home_window, reset_driver_state
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+
+class FakeDriver:
+    # Just enough of a WebDriver for reset_driver_state, with window_handles in an order the test picks
+    def __init__(self):
+        self.handles = ["home"]
+        self.current_window_handle = "home"
+        self.switch_to = FakeSwitch(self)
+        self.url = None
+
+    @property
+    def window_handles(self):
+        return list(self.handles)
+
+    def close(self):
+        self.handles.remove(self.current_window_handle)
+
+    def execute_script(self, script):
+        pass
+
+    def delete_all_cookies(self):
+        pass
+
+    def get(self, url):
+        self.url = url
+
+
+def test_reset_keeps_the_original_window_whatever_the_handle_order():
+    driver = remember_home_window(FakeDriver())
+    driver.handles = ["popup", "home", "tab"]   # The order browsers report is not the order the windows opened in
+    driver.current_window_handle = "popup"
+    reset_driver_state(driver, "about:blank")
+    assert driver.handles == ["home"]
+    assert driver.current_window_handle == "home"
+    assert driver.url == "about:blank"
+
+
+def test_reset_keeps_a_survivor_when_the_original_window_was_closed():
+    driver = remember_home_window(FakeDriver())
+    driver.handles = ["tab", "popup"]
+    reset_driver_state(driver, "about:blank")
+    assert driver.handles == ["tab"]
+    assert driver.home_window == "tab"
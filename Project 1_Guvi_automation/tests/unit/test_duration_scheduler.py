@@ -0,0 +1,35 @@
+import json
+import os
+import sys
+
+import pytest
+
+pytest_plugins = ["pytester"]
+
+# Six tests of different lengths, with a history that ranks them longest-first
+SCRATCH_SUITE = """
+import time
+import pytest
+
+@pytest.mark.parametrize("seconds", [0.05, 0.3, 0.1, 0.2, 0.0, 0.15])
+def test_sleep(seconds):
+    time.sleep(seconds)
+"""
+
+
+# Regression test: with one test in flight per worker, xdist workers waited forever for their next item
+def test_longest_first_schedule_completes_under_xdist(pytester, monkeypatch):
+    pytest.importorskip("xdist")
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(path for path in sys.path if path))
+    pytester.makepyfile(test_scratch=SCRATCH_SUITE)
+    pytester.path.joinpath(".test_durations.json").write_text(json.dumps(
+        {f"test_scratch.py::test_sleep[{s}]": s for s in (0.05, 0.3, 0.1, 0.2, 0.0, 0.15)}
+    ))
+
+    result = pytester.runpytest_subprocess("-p", "guvi_automation.utils.duration_scheduler", "-n", "2",
+                                           "--duration-schedule", "-p", "no:cacheprovider", timeout=60)
+
+    result.assert_outcomes(passed=6)
+    result.stdout.fnmatch_lines(["*duration schedule*", "workers: 2, tests: 6 (0 without history)"])
+    history = json.loads(pytester.path.joinpath(".test_durations.json").read_text())
+    assert len(history) == 6
@@ -0,0 +1,169 @@
+import subprocess
+
+import pytest
+from guvi_automation.utils.test_impact import SuiteIndex, diff_ranges, changed_entities, affected
+
+LOCATORS_PY = '''\
+class By:
+    XPATH = "xpath"
+
+
+LOCATORS = {
+    "BasePage": {
+        "signup_button": (By.XPATH, "//a[text()='Sign up']"),
+        "login_button": (By.XPATH, "//a[text()='Login']"),
+    },
+}
+'''
+
+BASE_PAGE_PY = '''\
+from suite.utils.locators import LOCATORS
+
+
+class BasePage:
+    def __init__(self, driver):
+        self.driver = driver
+        self.locators = LOCATORS["BasePage"]
+
+    def click_signup(self):
+        self.driver.find_element(*self.locators["signup_button"]).click()
+
+    def click_login(self):
+        self.driver.find_element(*self.locators["login_button"]).click()
+'''
+
+TEST_PY = '''\
+def test_signup(driver):
+    assert driver
+
+
+def test_login(driver):
+    assert driver
+'''
+
+# What a recorded run would have stored for the two tests
+IMPACT_MAP = {
+    "tests/test_home.py::test_signup": {"methods": ["pages/base_page.py::BasePage.__init__",
+                                                    "pages/base_page.py::BasePage.click_signup"], "locators": []},
+    "tests/test_home.py::test_login": {"methods": ["pages/base_page.py::BasePage.__init__",
+                                                   "pages/base_page.py::BasePage.click_login"], "locators": []},
+}
+
+
+def _git(root, *args):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+# A committed two-test suite; each test edits the working tree and diffs it against HEAD
+@pytest.fixture
+def suite(tmp_path):
+    for relpath, source in {"utils/locators.py": LOCATORS_PY, "pages/base_page.py": BASE_PAGE_PY,
+                            "tests/test_home.py": TEST_PY, "README.md": "# Suite\n"}.items():
+        path = tmp_path / relpath
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "baseline")
+    return tmp_path
+
+
+def _edit(root, relpath, old, new):
+    path = root / relpath
+    source = path.read_text()
+    assert old in source
+    path.write_text(source.replace(old, new))
+
+
+def _selected(root):
+    changes = changed_entities(SuiteIndex(str(root)), diff_ranges(str(root)))
+    return {nodeid for nodeid, entry in IMPACT_MAP.items() if affected(nodeid, entry, changes, SuiteIndex(str(root)))}
+
+
+def test_diff_ranges_reports_changed_lines(suite):
+    _edit(suite, "pages/base_page.py", "find_element(*self.locators[\"login_button\"])",
+          "find_element(*self.locators[\"login_button\"], )")
+    assert diff_ranges(str(suite)) == {"pages/base_page.py": [(13, 13)]}
+
+
+def test_diff_ranges_marks_pure_deletions_and_deleted_files(suite):
+    _edit(suite, "tests/test_home.py", "def test_login(driver):\n    assert driver\n", "")
+    (suite / "README.md").unlink()
+    ranges = diff_ranges(str(suite))
+    assert ranges["tests/test_home.py"] == [(4, 5)]   # Between the kept line 4 and the line after it
+    assert ranges["README.md"] == [(0, float("inf"))]
+
+
+def test_diff_ranges_skips_comment_only_hunks(suite):
+    _edit(suite, "pages/base_page.py", "    def click_login(self):\n",
+          "    # Opens the login form\n    def click_login(self):\n")
+    assert diff_ranges(str(suite)) == {}
+
+
+def test_diff_ranges_rejects_unknown_base(suite):
+    with pytest.raises(RuntimeError, match="no-such-branch"):
+        diff_ranges(str(suite), "no-such-branch")
+
+
+def test_changed_entities_maps_hunks_to_methods_locators_and_tests(suite):
+    _edit(suite, "pages/base_page.py", "[\"signup_button\"]).click()", "[\"signup_button\"]).submit()")
+    _edit(suite, "utils/locators.py", "text()='Login'", "normalize-space()='Login'")
+    _edit(suite, "tests/test_home.py", "def test_login(driver):\n    assert driver",
+          "def test_login(driver):\n    assert driver.title")
+    changes = changed_entities(SuiteIndex(str(suite)), diff_ranges(str(suite)))
+    assert changes["methods"] == {"pages/base_page.py::BasePage.click_signup"}
+    assert changes["locators"] == {"LOCATORS.BasePage.login_button"}
+    assert changes["tests"] == {"tests/test_home.py::test_login"}
+    assert changes["run_all"] == []
+
+
+def test_changed_entities_runs_everything_for_shared_code(suite):
+    (suite / "conftest.py").write_text("import pytest\n")
+    _git(suite, "add", "conftest.py")
+    changes = changed_entities(SuiteIndex(str(suite)), diff_ranges(str(suite)))
+    assert changes["run_all"] == ["conftest.py"]
+
+
+def test_affected_selects_tests_using_a_changed_method(suite):
+    _edit(suite, "pages/base_page.py", "[\"signup_button\"]).click()", "[\"signup_button\"]).submit()")
+    assert _selected(suite) == {"tests/test_home.py::test_signup"}
+
+
+def test_affected_selects_tests_using_a_changed_locator(suite):
+    _edit(suite, "utils/locators.py", "text()='Login'", "normalize-space()='Login'")
+    assert _selected(suite) == {"tests/test_home.py::test_login"}
+
+
+def test_affected_ignores_documentation(suite):
+    _edit(suite, "README.md", "# Suite", "# Suite\n\nHow to run it.")
+    assert _selected(suite) == set()
+
+
+def test_affected_runs_tests_missing_from_the_map(suite):
+    changes = changed_entities(SuiteIndex(str(suite)), {"pages/base_page.py": [(10, 10)]})
+    assert affected("tests/test_new.py::test_new", None, changes, SuiteIndex(str(suite))) == "not in the impact map"
+
+
+def test_element_locators_are_recorded_when_named_by_string():
+    from guvi_automation.pages.login_page import LoginPage
+    from guvi_automation.utils.test_impact import LOCATORS_USED
+
+    class Driver:
+        def execute_script(self, script, fields):
+            return []
+
+    LOCATORS_USED.clear()
+    page = LoginPage.__new__(LoginPage)   # No browser: only fill's execute_script call is needed
+    page.driver = Driver()
+    page.fill(**{"email_textbox": "a@b.c", "password_textbox": "secret"})
+    assert LOCATORS_USED == {"LOCATORS.LoginPage.email_textbox", "LOCATORS.LoginPage.password_textbox"}
+
+
+def test_affected_selects_tests_using_a_recorded_locator(suite):
+    # The entry's locator was recorded at runtime; no page method in the suite references it statically
+    _edit(suite, "utils/locators.py", "text()='Sign up'", "normalize-space()='Sign up'")
+    changes = changed_entities(SuiteIndex(str(suite)), diff_ranges(str(suite)))
+    entry = {"methods": ["pages/base_page.py::BasePage.__init__"], "locators": ["LOCATORS.BasePage.signup_button"]}
+    assert affected("tests/test_home.py::test_login", entry, changes, SuiteIndex(str(suite))) \
+        == "uses LOCATORS.BasePage.signup_button"
@@ -0,0 +1,33 @@
+from guvi_automation.utils.locator_optimizer import By, best_candidate, print_report
+
+
+def _result(*candidates, offline_ms=1.0):
+    return {"name": "LOCATORS.LoginPage.email_textbox", "strategy": By.XPATH, "value": "//input[@id='email']",
+            "offline_ms": offline_ms, "candidates": list(candidates)}
+
+
+def _candidate(strategy, kind, agreeing=1, offline_ms=0.5, verified=True):
+    return {"strategy": strategy, "value": "email", "kind": kind, "agreeing": agreeing,
+            "offline_ms": offline_ms, "verified": verified}
+
+
+def test_exact_rewrites_rank_before_observed_ones():
+    exact = _candidate(By.CSS_SELECTOR, "exact", agreeing=3)
+    result = _result(_candidate(By.ID, "observed", agreeing=3), exact)
+    assert best_candidate(result) == (exact, "offline_ms")
+
+
+def test_observed_rewrite_needs_enough_snapshots_or_a_live_check():
+    observed = _candidate(By.ID, "observed", agreeing=1)
+    assert best_candidate(_result(observed))[0] is None
+    assert best_candidate(_result(observed), min_snapshots=1)[0] is observed
+    live = dict(observed, browser_ms=0.1)
+    assert best_candidate(dict(_result(live), browser_ms=0.2))[0] is live
+
+
+def test_report_lists_only_faster_rewrites(capsys):
+    slower = _result(_candidate(By.CSS_SELECTOR, "exact", offline_ms=1.25), offline_ms=1.0)
+    faster = dict(_result(_candidate(By.CSS_SELECTOR, "exact", offline_ms=0.5)), name="LOCATORS.BasePage.x")
+    print_report([slower, faster], snapshot_count=1)
+    rewrites = capsys.readouterr().out.split("Verified rewrites")[1]
+    assert "BasePage" in rewrites and "LoginPage" not in rewrites
@@ -0,0 +1,26 @@
+from guvi_automation.utils.logger import merge_worker_logs, worker_log_file
+
+
+def _write(path, *lines):
+    path.write_text("".join(f"2026-01-01 10:00:0{second},000 - INFO - {text}\n" for second, text in lines))
+
+
+# run.py starts Chrome and Firefox in the same directory: each controller merges only its own run's files
+def test_merge_keeps_other_runs_files(tmp_path):
+    log_file = str(tmp_path / "test_execution.log")
+    chrome = [tmp_path / worker_log_file(w, "chrome-1", "test_execution.log") for w in ("master", "gw0", "gw1")]
+    firefox = tmp_path / worker_log_file("gw0", "firefox-2", "test_execution.log")
+    _write(chrome[0], (0, "session start"), (5, "session end"))
+    _write(chrome[1], (1, "gw0 first"), (3, "gw0 second"))
+    _write(chrome[2], (2, "gw1 first"))
+    _write(firefox, (4, "firefox"))
+
+    assert merge_worker_logs("chrome-1", log_file) == 3
+
+    merged = (tmp_path / "test_execution.log").read_text().splitlines()
+    assert [line.split(" - ")[-1] for line in merged] == \
+        ["session start", "gw0 first", "gw1 first", "gw0 second", "session end"]
+    assert not any(path.exists() for path in chrome)
+    assert firefox.exists()
+    assert merge_worker_logs("firefox-2", log_file) == 1
+    assert (tmp_path / "test_execution.log").read_text().count("\n") == 6
@@ -0,0 +1,27 @@
+import contextlib
+import sqlite3
+
+from guvi_automation.utils.result_store import ResultStore
+
+
+def _count(db_path, table):
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+# A --collect-only session opens a store but runs no test
+def test_run_without_results_is_not_registered(tmp_path):
+    db_path = tmp_path / "reports" / "results.db"
+    ResultStore(db_path=str(db_path), browser="chrome").close()
+    assert not db_path.exists()
+
+
+def test_run_is_registered_with_its_first_result(tmp_path):
+    db_path = str(tmp_path / "results.db")
+    store = ResultStore(db_path=db_path, browser="chrome", batch_size=2)
+    store.add("tests/test_a.py::test_a", "passed", 0.5)
+    store.add("tests/test_a.py::test_b", "failed", 1.25, error="boom")
+    store.add("tests/test_a.py::test_c", "passed", 0.1)
+    store.close()
+    assert _count(db_path, "runs") == 1
+    assert _count(db_path, "results") == 3
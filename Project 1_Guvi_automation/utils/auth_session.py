@@ -0,0 +1,102 @@
+"""
+Reuses one authenticated GUVI session across tests.
+Logs in through the UI once, saves cookies and web storage to disk, and injects them into fresh or pooled
+drivers. Expired or rejected sessions are detected and replaced by a new UI login automatically.
+"""
+import json
+import os
+import time
+
+BASE_URL = "https://www.guvi.in/"
+
+# Cookie fields WebDriver accepts back through add_cookie
+_COOKIE_FIELDS = ("name", "value", "path", "domain", "secure", "httpOnly", "expiry", "sameSite")
+
+
+class AuthSession:
+    def __init__(self, state_path, login, is_authenticated, max_age=3600, base_url=BASE_URL):
+        """
+            Args:
+                state_path (str): JSON file holding the saved session, one per browser and xdist worker
+                login (callable): Takes a driver and performs the full UI login
+                is_authenticated (callable): Takes a driver and returns True when the session is logged in
+                max_age (int): Seconds before a saved session is considered stale and replaced
+                base_url (str): Page the state is captured on and injected into
+        """
+        self.state_path = state_path
+        self.login = login
+        self.is_authenticated = is_authenticated
+        self.max_age = max_age
+        self.base_url = base_url
+        self.ui_logins = 0   # Number of times the session had to log in through the UI
+
+    # Leaves the driver logged in, through saved state when possible and the UI otherwise
+    def ensure(self, driver):
+        state = self.load()
+        if state and not self.is_expired(state):
+            self.inject(driver, state)
+            if self.is_authenticated(driver):
+                return driver
+            print("Saved GUVI session was rejected, logging in again")
+
+        self.login(driver)
+        self.ui_logins += 1
+        if not self.is_authenticated(driver):
+            raise AssertionError("UI login did not produce an authenticated session")
+        self.save(driver)
+        return driver
+
+    # Captures cookies, localStorage and sessionStorage of the current GUVI page
+    def save(self, driver):
+        storage = driver.execute_script(
+            "return {local: Object.assign({}, window.localStorage), session: Object.assign({}, window.sessionStorage)};"
+        )
+        state = {
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": storage["local"],
+            "session_storage": storage["session"],
+        }
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        with open(self.state_path, "w") as f:
+            json.dump(state, f)
+
+    def load(self):
+        if not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Ignoring unreadable session file {self.state_path}: {e}")
+            return None
+
+    # A session is stale once it is older than max_age or any saved cookie has passed its expiry
+    def is_expired(self, state):
+        now = time.time()
+        if now - state.get("saved_at", 0) > self.max_age:
+            return True
+        return any(cookie.get("expiry") and cookie["expiry"] <= now for cookie in state.get("cookies", []))
+
+    # Cookies can only be set for the domain currently loaded, so the base URL is opened first
+    def inject(self, driver, state):
+        if not driver.current_url.startswith(self.base_url):
+            driver.get(self.base_url)
+
+        for cookie in state.get("cookies", []):
+            try:
+                driver.add_cookie({k: v for k, v in cookie.items() if k in _COOKIE_FIELDS})
+            except Exception as e:
+                print(f"Could not restore cookie {cookie.get('name')}: {e}")
+
+        driver.execute_script(
+            "var local = arguments[0], session = arguments[1];"
+            "Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });"
+            "Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });",
+            state.get("local_storage", {}), state.get("session_storage", {}),
+        )
+        driver.refresh()   # Reloads so the site picks up the restored session
+
+    def clear(self):
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
@@ -1,12 +1,69 @@
+"""
+Loads test data for data-driven tests.
+Paths are resolved relative to the project root, parsed JSON documents are cached by path and modification time,
+and schema validation runs once per file version.
+"""
+import copy
 import json
 import os
 
-def load_test_data(file_name): # Loads test data from a JSON file located in the same directory
-    file_path = os.path.join(os.path.dirname(__file__), file_name)
-    # Dynamically constructs the absolute path to the JSON file
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    with open(file_path, "r") as f:
-    # Opens the file in read mode
+# Shape of tests/test_data.json, checked once per file version
+TEST_DATA_SCHEMA = {
+    "valid_login": {"email": str, "password": str},
+    "invalid_login": {"email": str, "password": str},
+}
 
-        return json.load(f)
-        #  Parses the JSON content and returns it as a Python dictionary.
\ No newline at end of file
+_documents = {}     # Absolute path -> (mtime, parsed JSON document)
+_validated = set()  # (absolute path, mtime, schema id) already checked against a schema
+
+
+def resolve_path(file_name):
+    # Relative paths are anchored at the project root, so tests do not depend on the working directory
+    if os.path.isabs(file_name):
+        return file_name
+    return os.path.join(PROJECT_ROOT, file_name)
+
+
+# Loads and caches a JSON document, e.g. "tests/test_data.json". Each caller gets its own copy, so a test that
+# changes its data cannot change what later tests see.
+def load_test_data(file_name, schema=None):
+    path = resolve_path(file_name)
+    mtime = os.path.getmtime(path)
+
+    cached = _documents.get(path)
+    if cached and cached[0] == mtime:
+        data = cached[1]   # Unchanged since the last parse
+    else:
+        with open(path, "r") as f:
+            data = json.load(f)
+        _documents[path] = (mtime, data)
+
+    if schema is not None:
+        _validate_once(path, mtime, schema, [data])
+    return copy.deepcopy(data)   # Still far cheaper than reading and parsing the file again
+
+
+def _validate_once(path, mtime, schema, rows):
+    key = (path, mtime, _schema_id(schema))
+    if key in _validated:
+        return
+    for row in rows:
+        _check_fields(row, schema, path)
+    _validated.add(key)
+
+
+def _check_fields(data, schema, where):
+    # Schema values are either a type or a nested schema for a sub-document
+    for field, expected in schema.items():
+        if field not in data:
+            raise ValueError(f"{where}: missing field '{field}'")
+        if isinstance(expected, dict):
+            _check_fields(data[field], expected, f"{where}.{field}")
+        elif not isinstance(data[field], expected):
+            raise ValueError(f"{where}: field '{field}' should be {expected.__name__}")
+
+
+def _schema_id(schema):
+    return json.dumps(schema, sort_keys=True, default=lambda t: t.__name__) if schema is not None else None
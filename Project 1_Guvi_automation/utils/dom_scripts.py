@@ -0,0 +1,133 @@
+"""
+JavaScript snippets that inspect many elements in a single execute_script round trip.
+Locators from utils/locators.py are passed in as plain {"by", "value"} objects and resolved in the browser.
+"""
+from guvi_automation.utils.locators import By
+
+# Resolves one {"by", "value"} locator to a list of elements inside the browser
+RESOLVE_LOCATOR_JS = """
+function resolveLocator(loc) {
+    if (loc.by === 'id') {
+        var el = document.getElementById(loc.value);
+        return el ? [el] : [];
+    }
+    if (loc.by === 'css selector') {
+        return Array.prototype.slice.call(document.querySelectorAll(loc.value));
+    }
+    if (loc.by === 'xpath') {
+        var snapshot = document.evaluate(loc.value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var found = [];
+        for (var i = 0; i < snapshot.snapshotLength; i++) { found.push(snapshot.snapshotItem(i)); }
+        return found;
+    }
+    if (loc.by === 'name') {
+        return Array.prototype.slice.call(document.getElementsByName(loc.value));
+    }
+    if (loc.by === 'class name') {
+        return Array.prototype.slice.call(document.getElementsByClassName(loc.value));
+    }
+    if (loc.by === 'tag name') {
+        return Array.prototype.slice.call(document.getElementsByTagName(loc.value));
+    }
+    throw new Error('Unsupported locator strategy: ' + loc.by);
+}
+"""
+
+# Reports presence, visibility, enabled state and bounding box for every named locator
+ELEMENT_STATES_JS = RESOLVE_LOCATOR_JS + """
+var locators = arguments[0];
+var states = {};
+Object.keys(locators).forEach(function (name) {
+    var found;
+    try {
+        found = resolveLocator(locators[name]);
+    } catch (e) {
+        states[name] = {present: false, count: 0, visible: false, enabled: false, clickable: false, rect: null, error: String(e)};
+        return;
+    }
+    if (!found.length) {
+        states[name] = {present: false, count: 0, visible: false, enabled: false, clickable: false, rect: null, error: null};
+        return;
+    }
+    var el = found[0];
+    var style = window.getComputedStyle(el);
+    var box = el.getBoundingClientRect();
+    var visible = style.display !== 'none' && style.visibility !== 'hidden' && box.width > 0 && box.height > 0;
+    var enabled = !el.disabled && el.getAttribute('aria-disabled') !== 'true';
+    states[name] = {
+        present: true,
+        count: found.length,
+        visible: visible,
+        enabled: enabled,
+        clickable: visible && enabled && style.pointerEvents !== 'none',
+        rect: {x: box.x, y: box.y, width: box.width, height: box.height},
+        error: null
+    };
+});
+return states;
+"""
+
+# Fills many form fields in one round trip: arguments[0] maps name -> {"by", "value", "text"}.
+# The native value setter plus input/change events is what framework-controlled inputs (React) listen to.
+FILL_FIELDS_JS = RESOLVE_LOCATOR_JS + """
+var fields = arguments[0];
+var missing = [];
+Object.keys(fields).forEach(function (name) {
+    var el = resolveLocator(fields[name])[0];
+    if (!el) { missing.push(name); return; }
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    var setter = Object.getOwnPropertyDescriptor(proto, 'value').set;
+    el.focus();
+    setter.call(el, fields[name].text);
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.blur();
+});
+return missing;
+"""
+
+# Load state, URL, title and element states of the current tab in one round trip: arguments[0] is the same
+# name -> locator map ELEMENT_STATES_JS takes. BasePage.open_in_tabs polls it while the tabs load.
+TAB_STATE_JS = """
+var states = (function () {
+""" + ELEMENT_STATES_JS + """
+}).apply(null, arguments);
+return {readyState: document.readyState, url: window.location.href, title: document.title, elements: states};
+"""
+
+# Times several equivalent locators in the page: arguments[0] is a list of {"by", "value"}, the first being the
+# current locator, arguments[1] the number of lookups per locator. "same" tells whether a locator found exactly the
+# elements of the first one, in the same order.
+LOCATOR_TIMING_JS = RESOLVE_LOCATOR_JS + """
+var locators = arguments[0];
+var iterations = arguments[1];
+var reference = null;
+return locators.map(function (loc) {
+    var found;
+    try {
+        found = resolveLocator(loc);
+    } catch (e) {
+        return {count: 0, same: false, ms: null, error: String(e)};
+    }
+    if (reference === null) { reference = found; }
+    var same = found.length === reference.length && found.every(function (el, i) { return el === reference[i]; });
+    var started = performance.now();
+    for (var i = 0; i < iterations; i++) { resolveLocator(loc); }
+    return {count: found.length, same: same, ms: (performance.now() - started) / iterations, error: null};
+});
+"""
+
+_SUPPORTED = {By.ID, By.CSS_SELECTOR, By.XPATH, By.NAME, By.CLASS_NAME, By.TAG_NAME}
+
+
+def locator_to_js(locator):
+    """
+        Converts a (By, value) locator tuple into the object the scripts above expect.
+
+        Raises:
+            ValueError: If the locator strategy cannot be resolved in JavaScript
+    """
+    by, value = locator
+    if by not in _SUPPORTED:
+        raise ValueError(f"Locator strategy not supported in batch scripts: {by}")
+    return {"by": by, "value": value}
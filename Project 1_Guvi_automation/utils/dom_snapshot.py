@@ -0,0 +1,51 @@
+"""
+Saves the rendered DOM of a page for offline checks (see utils/locator_health.py).
+conftest writes one on failure (or after every test with --dom-snapshots=always) and the dom_snapshot fixture writes
+one on demand. The OrangeHRM conftest saves Playwright's page.content() the same way. Each file starts with a
+comment naming the suite and URL, so the health check knows which locators apply to it.
+"""
+import os
+import re
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SNAPSHOT_DIR = os.path.join(PROJECT_ROOT, "snapshots")
+SNAPSHOT_POLICIES = ("failures", "always", "off")
+
+# <!-- dom-snapshot suite=guvi url=https://www.guvi.in/ captured=2025-01-01T10:00:00 -->
+HEADER = "<!-- dom-snapshot suite={suite} url={url} captured={captured} -->\n"
+_HEADER = re.compile(r"<!-- dom-snapshot suite=(\S+) url=(\S*) captured=(\S+) -->")
+
+
+def save_dom_snapshot(html, name, suite="guvi", url="", snapshot_dir=SNAPSHOT_DIR):
+    """
+        Writes the page HTML to <snapshot_dir>/<suite>/<name>_<timestamp>.html.
+
+        Args:
+            html (str): driver.page_source or page.content() - the DOM as rendered, not the server response
+            name (str): Usually the test name; sanitised for the file system
+            suite (str): "guvi" or "orangehrm", selects the locator modules checked against the file
+            url (str): Page URL at capture time
+
+        Returns:
+            str: Path of the saved file
+    """
+    folder = os.path.join(snapshot_dir, suite)
+    os.makedirs(folder, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    safe_name = re.sub(r"[^\w.-]", "_", name)
+    path = os.path.join(folder, f"{safe_name}_{timestamp}.html")
+    header = HEADER.format(suite=suite, url=(url or "").replace(" ", "%20"),
+                           captured=datetime.now().isoformat(timespec="seconds"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header + html)
+    return path
+
+
+def read_header(path):
+    # {"suite", "url", "captured"} from the first line, or None for HTML saved some other way
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        match = _HEADER.match(f.readline())
+    if not match:
+        return None
+    return {"suite": match.group(1), "url": match.group(2), "captured": match.group(3)}
@@ -0,0 +1,188 @@
+"""
+Pytest plugin that schedules tests longest-first from historical durations.
+With pytest-xdist, tests are handed to workers in that order as they free up (LPT scheduling), so long
+browser flows start early and no worker sits idle while another finishes a 25 s test at the end.
+
+Only uses the standard library and pytest, so both the GUVI and the OrangeHRM suites can load it:
+    pytest_plugins = ["guvi_automation.utils.duration_scheduler"]
+    pytest -n 3 --duration-schedule
+"""
+import contextlib
+import heapq
+import json
+import os
+import sqlite3
+import statistics
+import time
+
+import pytest
+
+DURATIONS_FILE = ".test_durations.json"
+DEFAULT_ESTIMATE = 10.0     # Seconds assumed for a test with no history and nothing to compare it to
+SMOOTHING = 0.5             # Weight of the latest run when updating the stored duration
+# Tests queued per xdist worker. A worker only starts an item once it holds the next one (or its shutdown),
+# so with a single item in flight every worker would wait forever.
+IN_FLIGHT = 2
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("duration-schedule", "duration-aware scheduling")
+    group.addoption("--duration-schedule", action="store_true",
+                    help="Run tests longest-first using historical durations")
+    group.addoption("--duration-source", action="store", default=None,
+                    help="Extra history: a result store .db, a {nodeid: seconds} .json, or JSON lines with "
+                         "test_name/duration (default: only the plugin's own .test_durations.json)")
+
+
+def load_durations(rootdir, source=None):
+    """
+        Reads per-test durations in seconds, keyed by nodeid.
+        The plugin's own file wins over the extra source when both know a test.
+    """
+    durations = {}
+    if source:
+        durations.update(_read_source(source))
+
+    own_file = os.path.join(str(rootdir), DURATIONS_FILE)
+    if os.path.exists(own_file):
+        with open(own_file, "r") as f:
+            durations.update(json.load(f))
+    return durations
+
+
+def _read_source(source):
+    if not os.path.exists(source):
+        return {}
+
+    if source.endswith(".db"):
+        with contextlib.closing(sqlite3.connect(source)) as conn:   # The connection's own with block does not close it
+            return {nodeid: avg for nodeid, avg in conn.execute(
+                "SELECT nodeid, AVG(duration) FROM results GROUP BY nodeid")}
+
+    with open(source, "r") as f:
+        text = f.read().strip()
+    try:
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return {k: float(v) for k, v in data.items()}
+        rows = data if isinstance(data, list) else [data]
+    except json.JSONDecodeError:
+        rows = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return {row["test_name"]: float(row["duration"]) for row in rows if "duration" in row}
+
+
+def estimate(nodeid, durations):
+    # Known tests use their history; new tests get the median of the suite, or the default on a first run
+    if nodeid in durations:
+        return durations[nodeid]
+    return statistics.median(durations.values()) if durations else DEFAULT_ESTIMATE
+
+
+def predict_makespan(estimates, workers):
+    # Greedy longest-first assignment: each test goes to the worker that frees up first
+    loads = [0.0] * max(1, workers)
+    for duration in sorted(estimates, reverse=True):
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+
+def pytest_configure(config):
+    if config.getoption("--duration-schedule"):
+        config.pluginmanager.register(DurationSchedule(config), "duration-schedule")
+
+
+class DurationSchedule:
+    def __init__(self, config):
+        self.config = config
+        self.durations = load_durations(config.rootpath, config.getoption("--duration-source"))
+        self.observed = {}
+        self.session_started = None
+        self.last_report = None
+
+    # Runs on every worker (and plain runs): sorts the collection longest-first
+    def pytest_collection_modifyitems(self, items):
+        items.sort(key=lambda item: estimate(item.nodeid, self.durations), reverse=True)
+
+    # Replaces xdist's batch scheduling with dispatch in collection order, IN_FLIGHT tests per worker
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        return _longest_first_scheduler(config, log)
+
+    def pytest_sessionstart(self):
+        self.session_started = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" and not hasattr(self.config, "workerinput"):
+            self.observed[report.nodeid] = report.duration
+            self.last_report = time.perf_counter()
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.observed or hasattr(self.config, "workerinput"):
+            return
+        workers = self.config.getoption("numprocesses", default=None)
+        workers = workers if isinstance(workers, int) and workers > 0 else 1
+
+        predicted = predict_makespan([estimate(n, self.durations) for n in self.observed], workers)
+        actual = (self.last_report or time.perf_counter()) - self.session_started
+        new_tests = sum(1 for nodeid in self.observed if nodeid not in self.durations)
+
+        terminalreporter.section("duration schedule")
+        terminalreporter.write_line(f"workers: {workers}, tests: {len(self.observed)} ({new_tests} without history)")
+        terminalreporter.write_line(f"predicted makespan: {predicted:.1f}s, actual: {actual:.1f}s")
+
+    # Folds this run's durations into the history file, smoothing out one-off slow runs
+    def pytest_sessionfinish(self):
+        if not self.observed or hasattr(self.config, "workerinput"):
+            return
+        own_file = os.path.join(str(self.config.rootpath), DURATIONS_FILE)
+        history = {}
+        if os.path.exists(own_file):
+            with open(own_file, "r") as f:
+                history = json.load(f)
+        for nodeid, duration in self.observed.items():
+            previous = history.get(nodeid)
+            history[nodeid] = duration if previous is None else SMOOTHING * duration + (1 - SMOOTHING) * previous
+        with open(own_file, "w") as f:
+            json.dump({k: round(v, 3) for k, v in sorted(history.items())}, f, indent=2)
+
+
+def _longest_first_scheduler(config, log):
+    from xdist.scheduler import LoadScheduling   # Only reached when pytest-xdist is installed and active
+
+    class LongestFirstScheduling(LoadScheduling):
+        """Keeps IN_FLIGHT tests queued per worker, topping up with the next longest test as each one finishes."""
+
+        def schedule(self):
+            assert self.collection_is_completed
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+
+            # Workers collected the tests already sorted longest-first
+            self.collection = list(self.node2collection.values())[0]
+            self.pending[:] = range(len(self.collection))
+            # Round-robin, so the longest tests start on different workers before any worker gets a second one
+            for _ in range(IN_FLIGHT):
+                for node in self.nodes:
+                    if self.pending:
+                        self._send_tests(node, 1)
+            if not self.pending:
+                for node in self.nodes:
+                    node.shutdown()   # Everything was sent; workers run their queue, then stop
+
+        def check_schedule(self, node, duration=0):
+            if node.shutting_down:
+                return
+            if self.pending:
+                missing = IN_FLIGHT - len(self.node2pending[node])
+                if missing > 0:
+                    self._send_tests(node, min(missing, len(self.pending)))
+            else:
+                node.shutdown()
+
+    return LongestFirstScheduling(config, log)
@@ -0,0 +1,37 @@
+"""
+Lock file shared by the processes of one run (xdist workers, parallel browsers from run.py).
+Whoever creates <path> with O_EXCL holds the lock; the others poll until it is removed. A lock file older than
+stale_after seconds is taken to be left behind by a crashed process and removed.
+"""
+import contextlib
+import os
+import time
+
+
+@contextlib.contextmanager
+def file_lock(path, timeout=60, stale_after=120):
+    """
+        Holds a cross-process lock for the duration of the with block.
+
+        Raises:
+            TimeoutError: If another process holds the lock for longer than timeout seconds
+    """
+    deadline = time.time() + timeout
+    while True:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            with contextlib.suppress(FileNotFoundError):
+                if time.time() - os.path.getmtime(path) > stale_after:
+                    os.remove(path)   # Left behind by a crashed worker
+                    continue
+            if time.time() > deadline:
+                raise TimeoutError(f"Timed out waiting for lock {path}")
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.close(fd)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
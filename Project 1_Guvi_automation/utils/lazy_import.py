@@ -0,0 +1,39 @@
+"""
+Deferred imports for modules that are only needed once a browser is running.
+Any import below selenium.webdriver runs selenium/webdriver/__init__.py, which loads every browser binding, so
+page objects and conftest hold lazy module references instead and collection (--collect-only, -m filtering)
+never pays for it. importlib.util.LazyLoader cannot be used here: finding a submodule's spec imports its parent
+packages, which is exactly the cost being avoided.
+"""
+import importlib
+
+
+class LazyModule:
+    # Stands in for a module; the real import happens on the first attribute access
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        # Private and dunder names are probed by tooling, e.g. pytest's fixture scan of conftest globals looks up
+        # _pytestfixturefunction on every one. Modules are never used through such names here, so they do not import.
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    """
+        Returns a reference to the module that is imported on first use.
+
+        Usage:
+            EC = lazy_import("selenium.webdriver.support.expected_conditions")
+            EC.url_contains("courses")   # selenium.webdriver is imported here, not at module load
+    """
+    return LazyModule(name)
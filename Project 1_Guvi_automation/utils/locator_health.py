@@ -0,0 +1,357 @@
+"""
+Offline locator health check: evaluates every locator of the GUVI and OrangeHRM suites against DOM snapshots saved
+during runs (utils/dom_snapshot.py) with lxml, without starting a browser. Locators that match nothing in any
+snapshot, or more than one element, are listed, so broken or ambiguous locators show up in seconds instead of after
+a timed-out UI run. Run it from the same directory as run.py:
+    python -m guvi_automation.utils.locator_health
+    python -m guvi_automation.utils.locator_health --snapshots snapshots/ --suite orangehrm --verbose
+
+Needs lxml, and cssselect for CSS locators (pip install lxml cssselect); neither is used by the test run itself.
+Playwright selectors are translated to XPath: CSS with :has-text() and :has(), text=, xpath=, nth= chains,
+get_by_placeholder and get_by_role locators (roles from the ARIA attribute plus the common implicit roles).
+Locators built by lambdas at run time are listed as dynamic and skipped.
+"""
+import argparse
+import glob
+import importlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+
+from guvi_automation.utils.dom_snapshot import SNAPSHOT_DIR, read_header
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+try:
+    from cssselect import HTMLTranslator, SelectorError
+except ImportError:
+    HTMLTranslator = None
+
+STATUSES = ("ok", "missing", "multiple", "dynamic", "unsupported")
+
+# Locator modules per suite: a module attribute name, or None for every dict defined in the module
+LOCATOR_SOURCES = {
+    "guvi": ("guvi_automation.utils.locators", "LOCATORS"),
+    "orangehrm": ("project_orangehrm_playwright.utils.locators", None),
+}
+
+_LOWER = "translate({}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+_SKIPPED_TEXT = "not(self::script or self::style or self::head or self::title)"
+
+# Elements that carry an ARIA role without a role attribute (the subset the suites use)
+_IMPLICIT_ROLES = {
+    "button": "self::button or (self::input and (@type='button' or @type='submit' or @type='reset'))",
+    "link": "(self::a or self::area) and @href",
+    "textbox": "self::textarea or (self::input and (not(@type) or @type='text' or @type='email'))",
+    "heading": "self::h1 or self::h2 or self::h3 or self::h4 or self::h5 or self::h6",
+    "listbox": "self::select",
+    "option": "self::option",
+    "table": "self::table",
+}
+
+
+def xpath_literal(text):
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+
+def _contains_text(text, value="normalize-space(string(.))"):
+    # Playwright's default text matching: case-insensitive substring after collapsing whitespace
+    return f"contains({_LOWER.format(value)}, {xpath_literal(' '.join(text.lower().split()))})"
+
+
+def _unquote(text):
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in "'\"":
+        return text[1:-1], True
+    return text, False
+
+
+if HTMLTranslator is not None:
+    class PlaywrightTranslator(HTMLTranslator):
+        # Adds Playwright's :has-text("...") to cssselect (cssselect maps the pseudo-class to this method name)
+        def xpath_has_text_function(self, xpath, function):
+            text = "".join(token.value for token in function.arguments if token.type != "S")
+            return xpath.add_condition(f"{_SKIPPED_TEXT} and {_contains_text(text)}")
+
+    _TRANSLATOR = PlaywrightTranslator()
+
+
+def _css(selector, prefix):
+    if HTMLTranslator is None:
+        raise ValueError("CSS locators need cssselect (pip install cssselect)")
+    try:
+        return _TRANSLATOR.css_to_xpath(selector, prefix=prefix)
+    except SelectorError as e:
+        raise ValueError(f"Unsupported CSS: {e}")
+
+
+def _text(selector, prefix):
+    # text=Foo matches the innermost elements containing "foo"; text='Foo' the innermost whose whole text is Foo
+    text, quoted = _unquote(selector)
+    condition = (f"normalize-space(string(.))={xpath_literal(' '.join(text.split()))}" if quoted
+                 else _contains_text(text))
+    return f"{prefix}*[{_SKIPPED_TEXT}][{condition}][not(*[{condition}])]"
+
+
+def _playwright_steps(selector):
+    # "css >> nth=1 >> xpath=../.." -> [("xpath", ...), ("nth", 1), ("xpath", ...)]
+    steps = []
+    for index, part in enumerate(re.split(r"\s*>>\s*", selector.strip())):
+        prefix = "descendant-or-self::" if index == 0 else "descendant::"
+        engine, _, body = part.partition("=")
+        if engine == "nth":
+            steps.append(("nth", int(body)))
+        elif engine == "text":
+            steps.append(("xpath", _text(body, prefix)))
+        elif engine == "xpath":
+            steps.append(("xpath", body))
+        elif engine == "css":
+            steps.append(("xpath", _css(body, prefix)))
+        elif part.startswith(("//", "..")):
+            steps.append(("xpath", part))
+        elif part[:1] in "'\"":
+            steps.append(("xpath", _text(part, prefix)))
+        else:
+            steps.append(("xpath", _css(part, prefix)))
+    return steps
+
+
+def _role(role, name):
+    roles = [role] if role else ["button", "link", "menuitem"]   # {"type": "role"} entries leave the role to the page
+    matches = " or ".join(f"@role={xpath_literal(r)}" + (f" or ({_IMPLICIT_ROLES[r]})" if r in _IMPLICIT_ROLES else "")
+                          for r in roles)
+    accessible_name = "concat(@aria-label, ' ', normalize-space(string(.)), ' ', @value)"
+    return f"descendant-or-self::*[{matches}][{_contains_text(name, accessible_name)}]"
+
+
+def compile_locator(strategy, value):
+    """
+        Turns one locator into steps evaluated by select().
+
+        Args:
+            strategy (str): A Selenium By strategy, "playwright", "placeholder" or "role"
+            value: The locator value; (role, name) for "role"
+
+        Returns:
+            list: ("xpath", expression) and ("nth", index) steps
+
+        Raises:
+            ValueError: If the locator cannot be translated
+    """
+    if strategy == "xpath":
+        return [("xpath", value)]
+    if strategy == "css selector":
+        return [("xpath", _css(value, "descendant-or-self::"))]
+    if strategy == "id":
+        return [("xpath", f"descendant-or-self::*[@id={xpath_literal(value)}]")]
+    if strategy == "name":
+        return [("xpath", f"descendant-or-self::*[@name={xpath_literal(value)}]")]
+    if strategy == "class name":
+        return [("xpath", _css("." + value, "descendant-or-self::"))]
+    if strategy == "tag name":
+        return [("xpath", f"descendant-or-self::{value}")]
+    if strategy == "link text":
+        return [("xpath", f"descendant-or-self::a[normalize-space(string(.))={xpath_literal(value)}]")]
+    if strategy == "partial link text":
+        return [("xpath", f"descendant-or-self::a[contains(string(.), {xpath_literal(value)})]")]
+    if strategy == "playwright":
+        return _playwright_steps(value)
+    if strategy == "placeholder":
+        return [("xpath", f"descendant-or-self::*[{_contains_text(value, 'string(@placeholder)')}]")]
+    if strategy == "role":
+        return [("xpath", _role(*value))]
+    raise ValueError(f"Unsupported locator strategy: {strategy}")
+
+
+def _flatten(suite, name, value):
+    # Yields {"suite", "name", "strategy", "value"} for every locator in a (nested) locator dict
+    if callable(value):
+        yield {"suite": suite, "name": name, "strategy": "dynamic", "value": getattr(value, "__name__", "lambda")}
+    elif isinstance(value, tuple) and len(value) == 2:
+        yield {"suite": suite, "name": name, "strategy": value[0], "value": value[1]}
+    elif isinstance(value, str):
+        if not value.startswith(("http://", "https://")):   # Page URLs kept next to the locators
+            yield {"suite": suite, "name": name, "strategy": "playwright", "value": value}
+    elif isinstance(value, dict) and value.get("type") == "placeholder":
+        yield {"suite": suite, "name": name, "strategy": "placeholder", "value": value["value"]}
+    elif isinstance(value, dict) and (value.get("type") == "role" or set(value) == {"role", "name"}):
+        yield {"suite": suite, "name": name, "strategy": "role", "value": (value.get("role"), value["name"])}
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _flatten(suite, f"{name}.{key}", item)
+
+
+def collect_locators(suites=tuple(LOCATOR_SOURCES)):
+    # Every locator of the selected suites; a suite whose package is not importable is left out
+    locators = []
+    for suite in suites:
+        module_name, attribute = LOCATOR_SOURCES[suite]
+        if importlib.util.find_spec(module_name.split(".")[0]) is None:
+            continue
+        module = importlib.import_module(module_name)
+        if attribute:
+            groups = {attribute: getattr(module, attribute)}
+        else:
+            groups = {name: value for name, value in vars(module).items()
+                      if isinstance(value, dict) and not name.startswith("_")}
+        for name, value in groups.items():
+            locators.extend(_flatten(suite, name, value))
+    return locators
+
+
+def default_snapshot_dirs():
+    dirs = [SNAPSHOT_DIR]
+    spec = importlib.util.find_spec("project_orangehrm_playwright")
+    if spec and spec.submodule_search_locations:
+        dirs.append(os.path.join(list(spec.submodule_search_locations)[0], "snapshots"))
+    return dirs
+
+
+def parse_snapshot(html, path, suite, url=""):
+    # {"path", "suite", "url", "tree", "order"} for one page; order gives document order for nth= and chains
+    tree = lxml.html.fromstring(html)
+    return {"path": path, "suite": suite, "url": url, "tree": tree,
+            "order": {element: i for i, element in enumerate(tree.iter())}}
+
+
+def load_snapshots(dirs):
+    # Every snapshot under the folders; suite falls back to the folder name for files without a header
+    snapshots = []
+    for folder in dirs:
+        for path in sorted(glob.glob(os.path.join(folder, "**", "*.html"), recursive=True)):
+            header = read_header(path) or {"suite": os.path.basename(os.path.dirname(path)), "url": ""}
+            with open(path, "rb") as f:
+                snapshots.append(parse_snapshot(f.read(), path, header["suite"], header["url"]))
+    return snapshots
+
+
+def select(steps, snapshot, compiled):
+    # Elements the steps select in one snapshot, in document order; compiled caches etree.XPath objects
+    nodes = [snapshot["tree"]]
+    for kind, argument in steps:
+        if kind == "nth":
+            nodes = nodes[argument:argument + 1] if argument >= 0 else nodes[argument:][:1]
+            continue
+        xpath = compiled.get(argument)
+        if xpath is None:
+            xpath = compiled[argument] = etree.XPath(argument)
+        found = {}
+        for node in nodes:
+            for element in xpath(node):
+                if isinstance(element, etree._Element):
+                    found[element] = None
+        nodes = sorted(found, key=lambda element: snapshot["order"].get(element, 0))
+    return nodes
+
+
+def count_matches(steps, snapshot, compiled):
+    return len(select(steps, snapshot, compiled))
+
+
+def check(locators, snapshots):
+    """
+        Evaluates every locator against the snapshots of its suite.
+
+        Returns:
+            list: One result per locator: the locator keys plus "status" (one of STATUSES), "counts"
+            ({snapshot path: matches}) and "error" for unsupported locators
+    """
+    compiled = {}
+    steps_cache = {}
+    results = []
+    for locator in locators:
+        result = dict(locator, counts={}, error=None)
+        results.append(result)
+        if locator["strategy"] == "dynamic":
+            result["status"] = "dynamic"
+            continue
+        key = (locator["strategy"], locator["value"])
+        try:
+            if key not in steps_cache:
+                steps_cache[key] = compile_locator(*key)
+            for snapshot in snapshots:
+                if snapshot["suite"] == locator["suite"]:
+                    result["counts"][snapshot["path"]] = count_matches(steps_cache[key], snapshot, compiled)
+        except (ValueError, etree.XPathError) as e:
+            result["status"], result["error"] = "unsupported", str(e)
+            continue
+        counts = result["counts"].values()
+        if not any(counts):
+            result["status"] = "missing"
+        elif any(count > 1 for count in counts):
+            result["status"] = "multiple"
+        else:
+            result["status"] = "ok"
+    return results
+
+
+def _describe(result):
+    counts = result["counts"]
+    if result["status"] == "missing":
+        return f"no match in {len(counts)} snapshot(s)"
+    if result["status"] == "multiple":
+        path, count = max(counts.items(), key=lambda item: item[1])
+        return f"{count} matches in {os.path.basename(path)}"
+    if result["status"] == "ok":
+        return f"unique in {sum(1 for c in counts.values() if c)} of {len(counts)} snapshot(s)"
+    return result["error"] or "built at run time, not checked"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check locators against saved DOM snapshots, without a browser")
+    parser.add_argument("--snapshots", nargs="+", default=None,
+                        help="Snapshot folders (default: snapshots/ of both projects)")
+    parser.add_argument("--suite", choices=sorted(LOCATOR_SOURCES), action="append",
+                        help="Only check this suite (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="Also list unique, dynamic and unsupported locators")
+    parser.add_argument("--json", dest="json_path", help="Write every result to this file")
+    parser.add_argument("--strict", action="store_true", help="Exit with 1 when a locator is missing or ambiguous")
+    args = parser.parse_args(argv)
+
+    if lxml is None:
+        print("The locator health check needs lxml: pip install lxml cssselect")
+        return 2
+
+    started = time.perf_counter()
+    snapshots = load_snapshots(args.snapshots or default_snapshot_dirs())
+    if not snapshots:
+        print("No DOM snapshots found. Run tests with --dom-snapshots=always or use the dom_snapshot fixture.")
+        return 2
+    suites = args.suite or sorted({snapshot["suite"] for snapshot in snapshots} & set(LOCATOR_SOURCES))
+    results = check(collect_locators(suites), snapshots)
+    elapsed = time.perf_counter() - started
+
+    shown = STATUSES if args.verbose else ("missing", "multiple")
+    for suite in suites:
+        suite_results = [r for r in results if r["suite"] == suite]
+        totals = {status: sum(1 for r in suite_results if r["status"] == status) for status in STATUSES}
+        print(f"{suite}: {len(suite_results)} locators, "
+              f"{sum(1 for s in snapshots if s['suite'] == suite)} snapshot(s) - "
+              + ", ".join(f"{count} {status}" for status, count in totals.items() if count))
+        for result in suite_results:
+            if result["status"] in shown:
+                print(f"  {result['status'].upper():<11} {result['name']:<50} {_describe(result)}")
+                print(f"  {'':<11} {result['strategy']}: {result['value']}")
+    print(f"\nChecked in {elapsed:.2f}s")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([{**r, "value": list(r["value"]) if isinstance(r["value"], tuple) else r["value"]}
+                       for r in results], f, indent=2)
+        print(f"Results written to {args.json_path}")
+    if args.strict and any(r["status"] in ("missing", "multiple") for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
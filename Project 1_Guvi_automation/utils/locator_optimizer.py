@@ -0,0 +1,302 @@
+"""
+Proposes faster forms of the XPath locators in utils/locators.py and checks that they find the same elements.
+Simple XPaths such as //input[@id='email'] become By.ID or CSS; XPaths that match on text, which CSS cannot express,
+get a scoped form id('anchor')//... anchored at the nearest ancestor with a unique id, so the browser searches one
+subtree instead of the whole document. Each proposal is compared node for node with the current locator on the
+saved DOM snapshots (utils/dom_snapshot.py) and, with --url, in a live browser, and timed side by side:
+    python -m guvi_automation.utils.locator_optimizer
+    python -m guvi_automation.utils.locator_optimizer --url https://www.guvi.in/ --browser chrome
+
+"exact" proposals are equivalent by construction and preferred; "observed" ones drop or add a condition and are
+only recommended when every snapshot agrees and either at least --min-snapshots snapshots (default 2) or a live
+--url page confirmed them. Only rewrites that are actually faster are recommended. Offline times are lxml's and only compare XPath forms, so without --url the suggested
+rewrite follows the browser's fast paths (ID, then CSS, then scoped XPath); with --url the fastest measured wins.
+Needs lxml and cssselect, like the health check.
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+from guvi_automation.utils import locator_health
+from guvi_automation.utils.dom_snapshot import SNAPSHOT_DIR
+from guvi_automation.utils.locators import By
+
+# Constant names used when printing a LOCATORS entry to paste
+_BY_NAMES = {By.ID: "By.ID", By.CSS_SELECTOR: "By.CSS_SELECTOR", By.XPATH: "By.XPATH"}
+
+# //tag[term and term] where every term is @attr='value' or text()='value'
+_SIMPLE_XPATH = re.compile(r"^//([\w-]+|\*)\[(.+)\]$")
+_TERM = re.compile(r"^(?:@([\w-]+)|(text\(\)))\s*=\s*'([^']*)'$")
+_CSS_IDENT = re.compile(r"^-?[_a-zA-Z][\w-]*$")
+# Ids a framework generates per render make poor anchors
+_GENERATED_ID = re.compile(r"\d{3,}|:")
+# Offline preference when no browser timing is available: equivalent rewrites before ones that drop a condition
+_PREFERENCE = [(By.ID, "exact"), (By.CSS_SELECTOR, "exact"), (By.ID, "observed"), (By.CSS_SELECTOR, "observed"),
+               (By.XPATH, "observed")]
+# Agreeing snapshots an "observed" rewrite needs before it is recommended without a --url check
+MIN_SNAPSHOTS = 2
+
+
+def parse_simple_xpath(xpath):
+    # "//a[@href='/x' and text()='X']" -> ("a", {"href": "/x"}, "X"); None for anything else
+    match = _SIMPLE_XPATH.match(xpath.strip())
+    if not match:
+        return None
+    tag, attributes, text = match.group(1), {}, None
+    for term in re.split(r"\s+and\s+", match.group(2)):
+        parsed = _TERM.match(term.strip())
+        if not parsed:
+            return None
+        if parsed.group(2):
+            text = parsed.group(3)
+        else:
+            attributes[parsed.group(1)] = parsed.group(3)
+    return tag, attributes, text
+
+
+def _css(tag, attributes):
+    css = "" if tag == "*" else tag
+    for name, value in attributes.items():
+        if name == "id" and _CSS_IDENT.match(value):
+            css += f"#{value}"
+        else:
+            css += f"[{name}={json.dumps(value)}]"
+    return css or "*"
+
+
+def propose(strategy, value):
+    """
+        Rewrites of one locator that need no snapshot to derive.
+
+        Returns:
+            list: {"strategy", "value", "kind"} candidates; empty for locators that are not simple XPaths
+    """
+    if strategy != By.XPATH:
+        return []   # ID and CSS locators are already the fast forms
+    parsed = parse_simple_xpath(value)
+    if parsed is None:
+        return []
+    tag, attributes, text = parsed
+    candidates = []
+    if text is None and attributes:
+        if set(attributes) == {"id"}:
+            candidates.append({"strategy": By.ID, "value": attributes["id"],
+                               "kind": "exact" if tag == "*" else "observed"})
+        candidates.append({"strategy": By.CSS_SELECTOR, "value": _css(tag, attributes), "kind": "exact"})
+        if set(attributes) == {"class"} and _CSS_IDENT.match(attributes["class"]):
+            # @class='x' compares the whole attribute, .x matches one class token among several
+            candidates.append({"strategy": By.CSS_SELECTOR, "value": f"{'' if tag == '*' else tag}.{attributes['class']}",
+                               "kind": "observed"})
+    elif attributes:
+        # CSS cannot match on text; dropping the text condition is only kept where the snapshots agree
+        candidates.append({"strategy": By.CSS_SELECTOR, "value": _css(tag, attributes), "kind": "observed"})
+    return candidates
+
+
+def scoped_xpath(xpath, snapshots, compiled):
+    """
+        Anchors an absolute XPath at the nearest ancestor with a unique, stable id shared by all its matches.
+
+        Returns:
+            dict: An "observed" xpath candidate, or None when no snapshot has a match or no common anchor exists
+    """
+    if not xpath.startswith("//"):
+        return None
+    anchors = None
+    for snapshot in snapshots:
+        nodes = locator_health.select([("xpath", xpath)], snapshot, compiled)
+        for node in nodes:
+            ids = [a.get("id") for a in node.iterancestors() if a.get("id") and not _GENERATED_ID.search(a.get("id"))]
+            ids = [i for i in ids if len(snapshot["tree"].xpath("//*[@id=$id]", id=i)) == 1]
+            # Nearest first; the order of the first match decides which common anchor is closest
+            anchors = ids if anchors is None else [i for i in anchors if i in ids]
+    if not anchors:
+        return None
+    return {"strategy": By.XPATH, "value": f"id({locator_health.xpath_literal(anchors[0])}){xpath}", "kind": "observed"}
+
+
+def verify(locator_steps, candidate_steps, snapshots, compiled):
+    # (snapshots where both select the same elements, snapshots where the current locator matches at all)
+    agreeing, matched = 0, 0
+    for snapshot in snapshots:
+        current = locator_health.select(locator_steps, snapshot, compiled)
+        matched += bool(current)
+        agreeing += current == locator_health.select(candidate_steps, snapshot, compiled)
+    return agreeing, matched
+
+
+def _timing_steps(strategy, value):
+    # By.ID is timed through lxml's id index, as getElementById is in the browser; the match check scans for duplicates
+    if strategy == By.ID:
+        return [("xpath", f"id({locator_health.xpath_literal(value)})")]
+    return locator_health.compile_locator(strategy, value)
+
+
+def time_offline(steps, snapshots, compiled, loops=200):
+    # Milliseconds for one pass over all snapshots, best of three runs of `loops` passes
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(loops):
+            for snapshot in snapshots:
+                locator_health.select(steps, snapshot, compiled)
+        elapsed = (time.perf_counter() - started) * 1000 / loops
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def analyse(locators, snapshots, loops=200):
+    """
+        Proposes, verifies and times rewrites for every locator.
+
+        Returns:
+            list: Per locator {"name", "strategy", "value", "offline_ms", "candidates"}; each candidate carries
+            "offline_ms", "agreeing" and "verified" (same elements in every snapshot, and at least one match)
+    """
+    compiled = {}
+    results = []
+    for locator in locators:
+        steps = locator_health.compile_locator(locator["strategy"], locator["value"])
+        candidates = propose(locator["strategy"], locator["value"])
+        if locator["strategy"] == By.XPATH:
+            scoped = scoped_xpath(locator["value"], snapshots, compiled)
+            if scoped:
+                candidates.append(scoped)
+        for candidate in candidates:
+            candidate_steps = locator_health.compile_locator(candidate["strategy"], candidate["value"])
+            agreeing, matched = verify(steps, candidate_steps, snapshots, compiled)
+            candidate.update(agreeing=agreeing, verified=matched > 0 and agreeing == len(snapshots),
+                             offline_ms=time_offline(_timing_steps(candidate["strategy"], candidate["value"]),
+                                                     snapshots, compiled, loops))
+        timing_steps = _timing_steps(locator["strategy"], locator["value"])
+        results.append({"name": locator["name"], "strategy": locator["strategy"], "value": locator["value"],
+                        "offline_ms": time_offline(timing_steps, snapshots, compiled, loops) if candidates else None,
+                        "candidates": candidates})
+    return results
+
+
+def capture_live(driver, urls):
+    # Snapshots of the rendered pages, so proposals can be derived and checked for sites without saved snapshots
+    snapshots = []
+    for url in urls:
+        driver.get(url)
+        snapshots.append(locator_health.parse_snapshot(driver.page_source, url, "guvi", driver.current_url))
+    return snapshots
+
+
+def time_live(driver, urls, results, iterations=50):
+    # Adds "browser_ms" to each locator and candidate, and clears "verified" where the browser disagrees
+    from guvi_automation.utils.dom_scripts import LOCATOR_TIMING_JS
+
+    for url in urls:
+        driver.get(url)
+        for result in results:
+            if not result["candidates"]:
+                continue
+            entries = [result] + result["candidates"]
+            timings = driver.execute_script(LOCATOR_TIMING_JS, [{"by": e["strategy"], "value": e["value"]}
+                                                                for e in entries], iterations)
+            for entry, timing in zip(entries, timings):
+                if timing["ms"] is not None:
+                    entry["browser_ms"] = entry.get("browser_ms", 0.0) + timing["ms"] / len(urls)
+                if entry is not result and timing["count"] and not timing["same"]:
+                    entry["verified"] = False
+
+
+def _ms(value):
+    return f"{value:8.3f} ms" if value is not None else f"{'-':>11}"
+
+
+def _trusted(candidate, min_snapshots):
+    # An "observed" rewrite matching a single page proves little; it needs several snapshots or a live check
+    return candidate["verified"] and (candidate["kind"] == "exact" or candidate["agreeing"] >= min_snapshots
+                                      or "browser_ms" in candidate)
+
+
+def best_candidate(result, min_snapshots=MIN_SNAPSHOTS):
+    # Trusted candidate to adopt: the fastest in the browser when measured, else the first by _PREFERENCE
+    verified = [c for c in result["candidates"] if _trusted(c, min_snapshots)]
+    if "browser_ms" in result and verified and all("browser_ms" in c for c in verified):
+        faster = [c for c in verified if c["browser_ms"] < result["browser_ms"]]
+        return min(faster, key=lambda c: c["browser_ms"], default=None), "browser_ms"
+    ranked = sorted(verified, key=lambda c: _PREFERENCE.index((c["strategy"], c["kind"])))
+    return (ranked[0] if ranked else None), "offline_ms"
+
+
+def print_report(results, snapshot_count, min_snapshots=MIN_SNAPSHOTS):
+    print(f"{'':<10} {'strategy':<13} {'locator':<58} {'offline':>11} {'browser':>11}  verification")
+    adopt = []
+    for result in results:
+        if not result["candidates"]:
+            continue
+        print(f"\n{result['name']}")
+        print(f"  {'current':<8} {result['strategy']:<13} {result['value']:<58} {_ms(result['offline_ms'])} "
+              f"{_ms(result.get('browser_ms'))}")
+        for candidate in result["candidates"]:
+            check = (f"same elements in {candidate['agreeing']}/{snapshot_count} snapshots ({candidate['kind']})"
+                     if candidate["verified"] else f"REJECTED - differs ({candidate['agreeing']}/{snapshot_count})")
+            if candidate["verified"] and not _trusted(candidate, min_snapshots):
+                check += f" - needs {min_snapshots} snapshots or --url"
+            print(f"  {'proposed':<8} {candidate['strategy']:<13} {candidate['value']:<58} "
+                  f"{_ms(candidate['offline_ms'])} {_ms(candidate.get('browser_ms'))}  {check}")
+        best, key = best_candidate(result, min_snapshots)
+        if best:
+            speedup = result[key] / best[key] if best[key] else float("inf")
+            if speedup > 1:
+                adopt.append((result, best, speedup))
+
+    if adopt:
+        print("\nVerified rewrites (speed-up by browser time with --url, else lxml time):")
+        for result, best, speedup in adopt:
+            group, _, key = result["name"].partition(".")[2].rpartition(".")
+            print(f"  {speedup:5.1f}x  {group} -> \"{key}\": ({_BY_NAMES[best['strategy']]}, {json.dumps(best['value'])}),")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Propose and verify faster forms of the GUVI locators")
+    parser.add_argument("--snapshots", nargs="+", default=[SNAPSHOT_DIR], help="Snapshot folders")
+    parser.add_argument("--url", action="append", default=[],
+                        help="Also load this page in a browser, verify there and time find_element (repeatable)")
+    parser.add_argument("--browser", default="chrome", help="Browser for --url")
+    parser.add_argument("--loops", type=int, default=200, help="Offline passes per timing")
+    parser.add_argument("--iterations", type=int, default=50, help="In-browser lookups per timing")
+    parser.add_argument("--min-snapshots", type=int, default=MIN_SNAPSHOTS,
+                        help="Agreeing snapshots an \"observed\" rewrite needs when it is not checked with --url")
+    parser.add_argument("--json", dest="json_path", help="Write the full results to this file")
+    args = parser.parse_args(argv)
+
+    if locator_health.lxml is None:
+        print("The locator optimizer needs lxml: pip install lxml cssselect")
+        return 2
+
+    snapshots = [s for s in locator_health.load_snapshots(args.snapshots) if s["suite"] == "guvi"]
+    driver = None
+    try:
+        if args.url:
+            from guvi_automation.drivers.driver_factory import create_driver
+            driver = create_driver(args.browser, "fast")
+            snapshots += capture_live(driver, args.url)
+        if not snapshots:
+            print("No GUVI DOM snapshots found. Run tests with --dom-snapshots=always or pass --url.")
+            return 2
+
+        locators = [loc for loc in locator_health.collect_locators(["guvi"]) if loc["strategy"] != "dynamic"]
+        results = analyse(locators, snapshots, args.loops)
+        if driver:
+            time_live(driver, args.url, results, args.iterations)
+    finally:
+        if driver:
+            driver.quit()
+
+    print_report(results, len(snapshots), args.min_snapshots)
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
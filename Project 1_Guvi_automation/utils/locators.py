@@ -1,8 +1,20 @@
-from selenium.webdriver.common.by import By
-
 """Centralized locator repository for all pages like Basepage, LoginPage and DashboardPage
  and added nested dictionary for menu items """
 
+
+# W3C locator strategy names - the same strings as selenium.webdriver.common.by.By. Importing that module would
+# load all of selenium.webdriver while tests are only being collected (see utils/lazy_import.py).
+class By:
+    ID = "id"
+    XPATH = "xpath"
+    LINK_TEXT = "link text"
+    PARTIAL_LINK_TEXT = "partial link text"
+    NAME = "name"
+    TAG_NAME = "tag name"
+    CLASS_NAME = "class name"
+    CSS_SELECTOR = "css selector"
+
+
 LOCATORS = {
     "BasePage": {
         "signup_button": (By.XPATH, "//a[text()='Sign up']"),
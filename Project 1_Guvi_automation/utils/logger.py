@@ -1,32 +1,150 @@
+"""
+Queue-based logging for the test run.
+Test code only puts records on an in-memory queue; one QueueListener thread per process does the file I/O.
+Every process writes its own file named after its run (browser and controller pid) and xdist worker, and each
+controller merges the files of its own run into test_execution.log under a lock at the end of the session, so
+neither xdist workers nor the parallel browser runs of run.py ever share or rotate the same open file. Nothing is
+configured at import time - conftest calls configure_logging from pytest_configure.
+"""
+import glob
+import heapq
 import logging
-from datetime import datetime
-import json
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+import re
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from guvi_automation.utils.file_lock import file_lock
+
+LOG_FILE = "test_execution.log"
+MAX_BYTES = 5*1024*1024
+BACKUP_COUNT = 3
+LOG_FORMAT = "%(asctime)s - %(levelname)s - [%(worker)s|%(browser)s|%(nodeid)s] - %(message)s"
+
+# Per-test context stamped on every record; updated by conftest as tests start and finish
+TEST_CONTEXT = {"nodeid": "-", "browser": "-", "worker": "master"}
+
+_RECORD_START = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3} - ")
 
-# Setup rotating log for human-readable output
-log_handler = RotatingFileHandler("test_execution.log", maxBytes=5*1024*1024, backupCount=3)
-log_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
-logger.addHandler(log_handler)
-
-def log_result(test_name, status, screenshot_path=None, error=None):
-    if screenshot_path and not os.path.exists(screenshot_path):
-        screenshot_path = None
-
-    result = {
-        "test_name": test_name,
-        "status": status,
-        "screenshot": screenshot_path,
-        "error": str(error) if error else None,
-        "timestamp": datetime.now().isoformat()
-    }
-
-    # Write structured log to JSON
-    log_file = os.path.join(os.getcwd(), "results.json")
-    with open(log_file, "a") as f:
-        f.write(json.dumps(result) + "\n")
-
-    # Also log to rotating log file
-    logger.info(f"{test_name} - {status} - Screenshot: {screenshot_path} - Error: {error}")
\ No newline at end of file
+_queue_handler = None
+_listener = None
+_run_id = None
+
+
+class ContextFilter(logging.Filter):
+    # Runs on the logging thread before the record is queued, so it sees the context of the test that logged it
+    def filter(self, record):
+        for key, value in TEST_CONTEXT.items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+def worker_log_file(worker, run_id, log_file=LOG_FILE):
+    # test_execution.log -> test_execution.chrome-4242.gw0.log
+    root, ext = os.path.splitext(log_file)
+    return f"{root}.{run_id}.{worker}{ext}"
+
+
+# Run id of this process's log files; xdist workers are handed the one of their controller
+def log_run_id():
+    return _run_id
+
+
+def configure_logging(worker="master", browser="-", run_id=None, log_file=LOG_FILE):
+    """
+        Routes the root logger through a queue to a file written by a background listener. Safe to call twice.
+
+        Args:
+            worker (str): xdist worker id ("gw0", ...) or "master" for the controller and plain runs
+            browser (str): Browser under test, added to every record
+            run_id (str): Controller's run id for xdist workers; a controller makes its own from browser and pid
+            log_file (str): Merged log file; every process writes next to it and is merged in by merge_worker_logs
+    """
+    global _queue_handler, _listener, _run_id
+    TEST_CONTEXT.update(worker=worker, browser=browser)
+    if _listener is not None:
+        return
+
+    _run_id = run_id or f"{browser}-{os.getpid()}"
+    file_handler = logging.FileHandler(worker_log_file(worker, _run_id, log_file), mode="w")
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _queue_handler.addFilter(ContextFilter())
+    _listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    _listener.start()
+
+    logger.setLevel(logging.INFO)
+    logger.addHandler(_queue_handler)
+
+
+def set_test_context(nodeid="-"):
+    TEST_CONTEXT["nodeid"] = nodeid
+
+
+# Flushes the queue and closes the file; called once at the end of the session
+def stop_logging():
+    global _queue_handler, _listener
+    if _listener is None:
+        return
+    logger.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _queue_handler = _listener = None
+_run_id = None
+
+
+def _records(path):
+    # Groups lines into records, so multi-line messages (tracebacks) stay together when merging
+    record = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if _RECORD_START.match(line) and record:
+                yield "".join(record)
+                record = []
+            record.append(line)
+    if record:
+        yield "".join(record)
+
+
+# Rotates the main log like RotatingFileHandler would, but only between whole merges
+def _rotate(log_file):
+    if os.path.exists(log_file) and os.path.getsize(log_file) >= MAX_BYTES:
+        handler = RotatingFileHandler(log_file, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, delay=True)
+        handler.doRollover()
+        handler.close()
+
+
+def merge_worker_logs(run_id=None, log_file=LOG_FILE):
+    """
+        Appends the log files of one run (controller and its workers) to the main log in timestamp order and
+        removes them. Files of another run, such as a second browser started by run.py, are left alone.
+
+        Args:
+            run_id (str): Run to merge, by default the one configure_logging set up in this process
+
+        Returns:
+            int: Number of files merged
+    """
+    run_id = run_id or _run_id
+    if run_id is None:
+        return 0
+    root, ext = os.path.splitext(log_file)
+    worker_files = sorted(glob.glob(f"{glob.escape(root)}.{glob.escape(run_id)}.*{ext}"))
+    if not worker_files:
+        return 0
+
+    # Each file is already in time order, so a k-way merge on the timestamp prefix is enough. The lock keeps two
+    # controllers from interleaving their merges or rotating the main log under each other.
+    with file_lock(log_file + ".lock"):
+        _rotate(log_file)
+        with open(log_file, "a", encoding="utf-8") as out:
+            for record in heapq.merge(*(_records(p) for p in worker_files), key=lambda r: r[:23]):
+                out.write(record)
+    for path in worker_files:
+        os.remove(path)
+    return len(worker_files)
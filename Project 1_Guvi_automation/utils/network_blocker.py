@@ -0,0 +1,138 @@
+"""
+Blocks third-party requests (chat widget, analytics, ads) that most GUVI tests never touch.
+Chrome and Edge block per test through CDP Network.setBlockedURLs; Firefox has no CDP, so its block list is
+applied for the whole browser session through a PAC file that sends blocked hosts to a dead proxy.
+Blocked requests are counted from the Chromium performance log, and bytes saved are estimated from the sizes
+the same URLs had in unblocked runs.
+"""
+import base64
+import fnmatch
+import json
+import os
+
+from guvi_automation.utils.file_lock import file_lock
+
+DEFAULT_BLOCK_LIST = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*googlesyndication.com*",
+    "*connect.facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*yellowmessenger.com*",   # Dobby assistant widget
+    "*yellow.ai*",
+]
+
+SIZES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reports", "third_party_sizes.json")
+_sizes = None   # URL -> transfer size in bytes seen when the URL was not blocked
+
+
+def block_list_for(node, enabled):
+    """
+        Returns the URL patterns to block for a test, or an empty list.
+
+        --block-third-party enables DEFAULT_BLOCK_LIST for every test, @pytest.mark.block_urls("*x*") adds patterns,
+        and @pytest.mark.allow_third_party opts a test out completely.
+    """
+    if node.get_closest_marker("allow_third_party"):
+        return []
+    patterns = list(DEFAULT_BLOCK_LIST) if enabled else []
+    for marker in node.iter_markers("block_urls"):
+        patterns += [p for p in marker.args if p not in patterns]
+    return patterns
+
+
+def apply_blocking(driver, patterns, execute_cdp):
+    # Returns True when the browser accepted the block list (Chromium only)
+    if execute_cdp(driver, "Network.enable", {}) is None:
+        return False
+    return execute_cdp(driver, "Network.setBlockedURLs", {"urls": patterns}) is not None
+
+
+def clear_blocking(driver, execute_cdp):
+    execute_cdp(driver, "Network.setBlockedURLs", {"urls": []})
+
+
+def blocked_requests(driver):
+    # Reads (and drains) the performance log, returning URLs the browser refused because of the block list
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return []
+
+    urls, blocked = {}, []
+    for entry in entries:
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent":
+            urls[params["requestId"]] = params["request"]["url"]
+        elif message.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked.append(urls.get(params["requestId"], "unknown"))
+    return blocked
+
+
+def learn_sizes(driver, patterns=DEFAULT_BLOCK_LIST):
+    # On unblocked runs, remembers how big the third-party resources were so savings can be estimated later
+    try:
+        resources = driver.execute_script(
+            "return performance.getEntriesByType('resource').map(function (r) { return [r.name, r.transferSize || 0]; });"
+        )
+    except Exception:
+        return
+    sizes = _load_sizes()
+    for url, size in resources:
+        if size and any(fnmatch.fnmatch(url, p) for p in patterns):
+            sizes[url] = size
+
+
+def estimate_saved_bytes(urls):
+    sizes = _load_sizes()
+    return sum(sizes.get(url, 0) for url in urls)
+
+
+def firefox_pac(patterns, upstream_proxy=None):
+    """
+        Builds a data: URL PAC script for Firefox's network.proxy.autoconfig_url.
+        Blocked URLs go to a closed local port and fail immediately; everything else goes direct,
+        or through the record/replay proxy when one is given.
+    """
+    fallback = f"PROXY {upstream_proxy}" if upstream_proxy else "DIRECT"
+    script = (
+        "function FindProxyForURL(url, host) {\n"
+        f"  var blocked = {json.dumps(patterns)};\n"
+        "  for (var i = 0; i < blocked.length; i++) {\n"
+        "    if (shExpMatch(url, blocked[i])) { return 'PROXY 127.0.0.1:9'; }\n"
+        "  }\n"
+        f"  return '{fallback}';\n"
+        "}\n"
+    )
+    return "data:application/x-ns-proxy-autoconfig;base64," + base64.b64encode(script.encode()).decode()
+
+
+def _load_sizes():
+    global _sizes
+    if _sizes is None:
+        _sizes = {}
+        if os.path.exists(SIZES_FILE):
+            with open(SIZES_FILE, "r") as f:
+                _sizes = json.load(f)
+    return _sizes
+
+
+# Written once at the end of the session rather than after every test. Merged with what other workers saved
+# meanwhile, under a lock file, since each xdist worker only knows the sizes its own tests saw.
+def save_sizes():
+    if not _sizes:
+        return
+    os.makedirs(os.path.dirname(SIZES_FILE), exist_ok=True)
+    with file_lock(SIZES_FILE + ".lock"):
+        merged = {}
+        if os.path.exists(SIZES_FILE):
+            with open(SIZES_FILE, "r") as f:
+                merged = json.load(f)
+        merged.update(_sizes)
+        tmp_path = SIZES_FILE + f".{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(merged, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, SIZES_FILE)
@@ -0,0 +1,106 @@
+"""
+Page-load performance capture for BasePage.navigate_to.
+Collects Navigation Timing, a Resource Timing summary and, on Chromium browsers, DevTools performance metrics,
+keeps them per test, and enforces the page-load budget declared with @pytest.mark.page_load_budget(ms).
+"""
+import html
+
+from guvi_automation.drivers.driver_factory import execute_cdp
+
+# Navigation Timing for the current document plus a summary of every resource it loaded
+TIMING_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var transferred = 0;
+resources.forEach(function (r) { transferred += r.transferSize || 0; });
+var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5)
+    .map(function (r) { return {name: r.name, duration: Math.round(r.duration), type: r.initiatorType}; });
+return {
+    navigation: nav ? {
+        ttfb: Math.round(nav.responseStart - nav.startTime),
+        dom_content_loaded: nav.domContentLoadedEventEnd ? Math.round(nav.domContentLoadedEventEnd - nav.startTime) : null,
+        load: nav.loadEventEnd ? Math.round(nav.loadEventEnd - nav.startTime) : null,
+        duration: Math.round(nav.duration),
+        transfer_size: nav.transferSize || 0
+    } : null,
+    resources: {count: resources.length, transfer_size: transferred, slowest: slowest}
+};
+"""
+
+# DevTools metrics worth keeping from Performance.getMetrics
+CDP_METRICS = ("ScriptDuration", "LayoutDuration", "RecalcStyleDuration", "TaskDuration", "JSHeapUsedSize", "Nodes")
+# The durations add up over the life of the renderer, which a pooled browser keeps across tests. They are reported
+# as the difference to a sample taken right before the navigation; heap size and node count are current values.
+CUMULATIVE_METRICS = ("ScriptDuration", "LayoutDuration", "RecalcStyleDuration", "TaskDuration")
+
+# Every navigation of the current test, and the budget it declared. Reset by conftest before each test.
+PAGE_METRICS = []
+PAGE_LOAD_BUDGET = {"ms": None}
+
+
+def cdp_metrics(driver):
+    # Current DevTools metrics, or None on browsers without CDP
+    if execute_cdp(driver, "Performance.enable", {}) is None:
+        return None
+    result = execute_cdp(driver, "Performance.getMetrics", {}) or {}
+    return {m["name"]: m["value"] for m in result.get("metrics", []) if m["name"] in CDP_METRICS}
+
+
+def record_navigation(driver, url, cdp_before=None):
+    """
+        Captures timing for the page that was just loaded and stores it for the current test.
+
+        Args:
+            cdp_before (dict): cdp_metrics() taken before the navigation. Without it the DevTools durations are
+                totals since the renderer started.
+
+        Returns:
+            dict: {"url", "navigation", "resources", "cdp"}; navigation is None if the browser exposes no entry
+    """
+    try:
+        timing = driver.execute_script(TIMING_JS)
+    except Exception as e:
+        print(f"Navigation timing unavailable for {url}: {e}")
+        timing = {"navigation": None, "resources": None}
+
+    cdp = cdp_metrics(driver)
+    if cdp and cdp_before:
+        for name in CUMULATIVE_METRICS:
+            before = cdp_before.get(name)
+            # A cross-site navigation can start a new renderer, whose totals are already this navigation's own
+            if name in cdp and before is not None and before <= cdp[name]:
+                cdp[name] = round(cdp[name] - before, 6)
+
+    metrics = {"url": url, "navigation": timing["navigation"], "resources": timing["resources"], "cdp": cdp}
+    PAGE_METRICS.append(metrics)
+    return metrics
+
+
+def check_budget(metrics):
+    # Fails the test when the page loaded later than the budget declared on the test.
+    # With the eager page-load strategy the load event may still be pending, so DOMContentLoaded is used instead.
+    budget = PAGE_LOAD_BUDGET["ms"]
+    navigation = metrics.get("navigation")
+    if budget is None or not navigation:
+        return
+    loaded = navigation["load"] if navigation["load"] is not None else navigation["dom_content_loaded"]
+    if loaded is not None and loaded > budget:
+        raise AssertionError(f"Page load budget exceeded for {metrics['url']}: {loaded} ms > {budget} ms")
+
+
+def summary_table(records):
+    # HTML table for the pytest-html report, one row per navigation
+    rows = []
+    for m in records:
+        nav = m.get("navigation") or {}
+        res = m.get("resources") or {}
+        rows.append(
+            f"<tr><td>{html.escape(m['url'])}</td><td>{nav.get('ttfb', '-')}</td><td>{nav.get('dom_content_loaded', '-')}</td>"
+            f"<td>{nav.get('load', '-')}</td><td>{res.get('count', '-')}</td>"
+            f"<td>{round((res.get('transfer_size') or 0) / 1024)}</td></tr>"
+        )
+    return (
+        "<table border='1' cellpadding='3' cellspacing='0'><tr><th>URL</th><th>TTFB (ms)</th>"
+        "<th>DOMContentLoaded (ms)</th><th>Load (ms)</th><th>Resources</th><th>Transferred (KB)</th></tr>"
+        + "".join(rows) + "</table>"
+    )
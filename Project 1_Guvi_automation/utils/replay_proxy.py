@@ -0,0 +1,214 @@
+"""
+Record/replay proxy that lets the GUVI suite run without the live site.
+Browsers are pointed at this local proxy by driver_factory. HTTPS is terminated with a self-signed certificate
+(browsers are started with certificate errors ignored), so tests keep using the real https://www.guvi.in/ URLs.
+
+record: every request is fetched from the real site and stored in the archive
+replay: requests are served from the archive only; anything not recorded gets a 504 and is reported
+"""
+import hashlib
+import http.client
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from guvi_automation.utils.file_lock import file_lock
+
+REPLAY_MODES = ("off", "record", "replay")
+
+# Headers that describe a single connection and must not be stored or forwarded
+_HOP_BY_HOP = {
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization", "proxy-connection",
+    "te", "trailer", "transfer-encoding", "upgrade", "content-length", "content-encoding",
+}
+
+
+class ReplayArchive:
+    # On-disk archive: index.json maps "METHOD url" to status, headers and a body file under bodies/
+    def __init__(self, directory):
+        self.directory = directory
+        self.index_path = os.path.join(directory, "index.json")
+        self.bodies_dir = os.path.join(directory, "bodies")
+        self._lock = threading.Lock()
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r") as f:
+                self.entries = json.load(f)
+
+    @staticmethod
+    def key(method, url):
+        return f"{method} {url.split('#', 1)[0]}"
+
+    def get(self, method, url):
+        entry = self.entries.get(self.key(method, url))
+        if not entry:
+            return None
+        with open(os.path.join(self.bodies_dir, entry["body"]), "rb") as f:
+            return entry["status"], entry["headers"], f.read()
+
+    def put(self, method, url, status, headers, body):
+        body_name = hashlib.sha1(body).hexdigest() + ".bin"   # Identical bodies are stored once
+        with self._lock:
+            os.makedirs(self.bodies_dir, exist_ok=True)
+            body_path = os.path.join(self.bodies_dir, body_name)
+            if not os.path.exists(body_path):
+                with open(body_path, "wb") as f:
+                    f.write(body)
+            self.entries[self.key(method, url)] = {"status": status, "headers": headers, "body": body_name}
+
+    # Merges with whatever other workers saved meanwhile, then writes the index. The lock file keeps xdist workers
+    # (separate processes) from reading the same index and overwriting each other's entries.
+    def save(self):
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock, file_lock(self.index_path + ".lock"):
+            merged = {}
+            if os.path.exists(self.index_path):
+                with open(self.index_path, "r") as f:
+                    merged = json.load(f)
+            merged.update(self.entries)
+            tmp_path = self.index_path + f".{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(merged, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.index_path)
+
+
+def ensure_certificate(directory):
+    """
+        Returns (cert_file, key_file) for the proxy, generating a self-signed pair with openssl on first use.
+
+        Raises:
+            RuntimeError: If no certificate exists and openssl is not available
+    """
+    cert_file = os.path.join(directory, "proxy_cert.pem")
+    key_file = os.path.join(directory, "proxy_key.pem")
+    if os.path.exists(cert_file) and os.path.exists(key_file):
+        return cert_file, key_file
+
+    if not shutil.which("openssl"):
+        raise RuntimeError(f"openssl not found - place proxy_cert.pem and proxy_key.pem in {directory}")
+    os.makedirs(directory, exist_ok=True)
+    with file_lock(os.path.join(directory, "proxy_cert.lock")):
+        if not (os.path.exists(cert_file) and os.path.exists(key_file)):   # Another worker may have generated it
+            subprocess.run(
+                ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "365",
+                 "-subj", "/CN=guvi-replay-proxy", "-keyout", key_file, "-out", cert_file],
+                check=True, capture_output=True,
+            )
+    return cert_file, key_file
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    tunnel_origin = None
+
+    def log_message(self, format, *args):
+        pass   # Keeps the test output clean; misses are reported at the end of the session
+
+    # HTTPS: acknowledge the tunnel, then speak TLS to the browser on the same socket
+    def do_CONNECT(self):
+        self.send_response(200, "Connection Established")
+        self.end_headers()
+        host, _, port = self.path.partition(":")
+        self.tunnel_origin = f"https://{host}" if port in ("", "443") else f"https://{self.path}"
+
+        tls = self.server.ssl_context.wrap_socket(self.connection, server_side=True)
+        self.connection = tls
+        self.rfile = tls.makefile("rb", self.rbufsize)
+        self.wfile = tls.makefile("wb", self.wbufsize)
+        self.close_connection = False
+
+    def _handle(self):
+        url = self.path if self.path.startswith("http") else f"{self.tunnel_origin}{self.path}"
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        proxy = self.server.replay_proxy
+
+        if proxy.mode == "replay":
+            recorded = proxy.archive.get(self.command, url)
+            if recorded is None:
+                proxy.record_miss(self.command, url)
+                self._respond(504, [("Content-Type", "text/plain")], b"Not recorded: " + url.encode())
+                return
+            self._respond(*recorded)
+            return
+
+        status, headers, payload = self._fetch(url, body)
+        proxy.archive.put(self.command, url, status, headers, payload)
+        self._respond(status, headers, payload)
+
+    do_GET = do_POST = do_HEAD = do_PUT = do_DELETE = do_OPTIONS = do_PATCH = _handle
+
+    # Fetches from the real site uncompressed, so the archive holds plain bodies
+    def _fetch(self, url, body):
+        parts = urlsplit(url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(parts.netloc, timeout=30)
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in _HOP_BY_HOP}
+        headers["Accept-Encoding"] = "identity"
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        try:
+            connection.request(self.command, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+            kept = [(k, v) for k, v in response.getheaders() if k.lower() not in _HOP_BY_HOP]
+            return response.status, kept, payload
+        except Exception as e:
+            return 502, [("Content-Type", "text/plain")], f"Upstream fetch failed: {e}".encode()
+        finally:
+            connection.close()
+
+    def _respond(self, status, headers, payload):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+
+class ReplayProxy:
+    def __init__(self, archive_dir, mode="replay", host="127.0.0.1", port=0):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unsupported replay mode: {mode}")
+        self.mode = mode
+        self.archive = ReplayArchive(archive_dir)
+        self.missing = []
+        self._missing_lock = threading.Lock()
+
+        cert_file, key_file = ensure_certificate(archive_dir)
+        self.server = ThreadingHTTPServer((host, port), _ProxyHandler)
+        self.server.daemon_threads = True
+        self.server.replay_proxy = self
+        self.server.ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.server.ssl_context.load_cert_chain(cert_file, key_file)
+        self._thread = threading.Thread(target=self.server.serve_forever, name="replay-proxy", daemon=True)
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def record_miss(self, method, url):
+        with self._missing_lock:
+            if (method, url) not in self.missing:
+                self.missing.append((method, url))
+
+    # Stops serving and, in record mode, writes the archive index
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self.mode == "record":
+            self.archive.save()
+        return list(self.missing)
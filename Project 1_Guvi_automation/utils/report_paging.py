@@ -0,0 +1,57 @@
+"""
+Client-side paging for large pytest-html reports.
+Only one page of result rows is displayed at a time, which keeps a report with thousands of
+tests responsive. Re-applies itself when pytest-html re-sorts or filters the table.
+"""
+
+PAGER_JS = """
+(function () {
+    var pageSize = %(page_size)d, page = 0, applying = false;
+
+    function rows() {
+        return Array.prototype.slice.call(document.querySelectorAll('#results-table tbody.results-table-row'))
+            .filter(function (row) { return !row.classList.contains('hidden'); });   // Skips rows filtered out
+    }
+
+    function render() {
+        var all = rows(), pages = Math.max(1, Math.ceil(all.length / pageSize));
+        page = Math.min(page, pages - 1);
+        applying = true;
+        all.forEach(function (row, i) {
+            var visible = Math.floor(i / pageSize) === page;
+            row.style.display = visible ? '' : 'none';
+        });
+        applying = false;
+        document.getElementById('pager-status').textContent =
+            'Page ' + (page + 1) + ' of ' + pages + ' (' + all.length + ' results)';
+    }
+
+    function init() {
+        var table = document.getElementById('results-table');
+        if (!table) { return; }
+        var bar = document.createElement('div');
+        bar.id = 'pager';
+        bar.innerHTML = '<button id="pager-prev">&laquo; Prev</button> <span id="pager-status"></span> ' +
+                        '<button id="pager-next">Next &raquo;</button>';
+        table.parentNode.insertBefore(bar, table);
+        document.getElementById('pager-prev').onclick = function () { page = Math.max(0, page - 1); render(); };
+        document.getElementById('pager-next').onclick = function () { page += 1; render(); };
+        new MutationObserver(function () { if (!applying) { render(); } })
+            .observe(table, {childList: true, subtree: true, attributes: true, attributeFilter: ['class']});
+        render();
+    }
+
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
+})();
+"""
+
+
+def pager_html(page_size):
+    # Markup appended to the report summary; page_size <= 0 disables paging
+    if page_size <= 0:
+        return ""
+    return "<script>" + PAGER_JS % {"page_size": page_size} + "</script>"
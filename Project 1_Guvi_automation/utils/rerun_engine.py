@@ -0,0 +1,121 @@
+"""
+Retries flaky GUVI tests inside the same browser.
+Each failure is classified (timeout, stale element, navigation error, assertion); only the retryable classes are run
+again, after the live browser has been reset, and only while the per-test and per-session budgets allow it.
+conftest drives this from pytest_pyfunc_call, so fixtures are not torn down and no new driver is started.
+"""
+import re
+import time
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+
+FAILURE_CLASSES = ("timeout", "stale_element", "navigation", "assertion", "other")
+RETRYABLE_CLASSES = ("timeout", "stale_element", "navigation")
+
+# Browser network errors (Chromium, Firefox) and the wrapper raised by BasePage.navigate_to
+_NAVIGATION_ERRORS = re.compile(r"net::ERR_|about:neterror|NS_ERROR_|Reached error page|Navigation failed")
+
+
+def _exception_chain(exc):
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        yield exc
+        exc = exc.__cause__ or exc.__context__
+
+
+def classify_failure(exc, wait_records=()):
+    """
+        Names the kind of failure a test attempt ended with.
+
+        Page objects often swallow a TimeoutException and return False, so an AssertionError raised while one of
+        the attempt's adaptive waits ran out of budget counts as a timeout, not as a genuine assertion failure.
+
+        Args:
+            exc (BaseException): Exception raised by the test function
+            wait_records (list): WAIT_RECORDS entries added during this attempt
+
+        Returns:
+            str: One of FAILURE_CLASSES
+    """
+    for error in _exception_chain(exc):
+        if isinstance(error, StaleElementReferenceException):
+            return "stale_element"
+        if isinstance(error, TimeoutException):
+            return "timeout"
+        if isinstance(error, WebDriverException) and _NAVIGATION_ERRORS.search(error.msg or ""):
+            return "navigation"
+    if _NAVIGATION_ERRORS.search(str(exc)):
+        return "navigation"
+    if isinstance(exc, AssertionError):
+        return "timeout" if any(not record["satisfied"] for record in wait_records) else "assertion"
+    return "other"
+
+
+class RerunBudget:
+    # Limits shared by every test of one pytest process (each xdist worker has its own)
+    def __init__(self, max_reruns=1, max_seconds=None, retry_on=RETRYABLE_CLASSES):
+        """
+            Args:
+                max_reruns (int): Extra attempts allowed per test
+                max_seconds (float): Total seconds this process may spend on retries; None for no limit
+                retry_on (iterable): Failure classes that are retried
+        """
+        unknown = set(retry_on) - set(FAILURE_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown failure classes: {', '.join(sorted(unknown))}")
+        self.max_reruns = max_reruns
+        self.max_seconds = max_seconds
+        self.retry_on = set(retry_on)
+        self.spent = 0.0
+
+    def allows(self, failure_class, rerun_number):
+        return (failure_class in self.retry_on and rerun_number <= self.max_reruns
+                and (self.max_seconds is None or self.spent < self.max_seconds))
+
+
+def run_with_reruns(test, budget, reset, retries, wait_records=()):
+    """
+        Calls test() and retries retryable failures after reset(), until it passes or the budget is used up.
+
+        Args:
+            test (callable): Runs one attempt of the test function
+            budget (RerunBudget): Shared limits; the time of every retry is charged to it
+            reset (callable): Puts the browser back into a clean state before the next attempt
+            retries (list): Receives {"class", "error", "seconds"} per retry, also when the test finally fails
+            wait_records (list): The live WAIT_RECORDS list, used to classify each attempt
+
+        Raises:
+            Exception: The failure of the last attempt
+    """
+    while True:
+        waits_before = len(wait_records)
+        started = time.perf_counter()
+        error = None
+        try:
+            test()
+        except Exception as e:
+            error = e
+
+        if retries:
+            # The attempt after a reset belongs to the retry that caused it
+            elapsed = time.perf_counter() - started
+            retries[-1]["seconds"] = round(retries[-1]["seconds"] + elapsed, 2)
+            budget.spent += elapsed
+        if error is None:
+            return
+
+        failure = classify_failure(error, list(wait_records)[waits_before:])
+        if not budget.allows(failure, len(retries) + 1):
+            raise error
+
+        reset_started = time.perf_counter()
+        try:
+            reset()
+        except Exception:
+            raise error   # A browser that cannot be reset will not pass on retry either
+        elapsed = time.perf_counter() - reset_started
+        budget.spent += elapsed
+        lines = str(error).strip().splitlines()
+        retries.append({"class": failure, "error": f"{type(error).__name__}: {lines[0] if lines else ''}",
+                        "seconds": round(elapsed, 2)})
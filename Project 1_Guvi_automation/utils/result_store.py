@@ -0,0 +1,181 @@
+"""
+SQLite-backed store for test results.
+Results are buffered and written in batched transactions; WAL mode and a busy timeout keep concurrent
+pytest sessions (one per browser in run.py) from corrupting or interleaving each other's writes.
+
+Query from the command line:
+    python -m guvi_automation.utils.result_store slowest --limit 10
+    python -m guvi_automation.utils.result_store pass-rate
+    python -m guvi_automation.utils.result_store history --test test_url_is_valid
+"""
+import argparse
+import contextlib
+import json
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(PROJECT_ROOT, "reports", "results.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    browser TEXT
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    nodeid TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    duration REAL NOT NULL,
+    browser TEXT,
+    worker TEXT,
+    screenshot TEXT,
+    error TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_nodeid ON results(nodeid);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+"""
+
+
+class ResultStore:
+    # The database is only opened, and the run registered, once the first result is written, so sessions that run
+    # no test (--collect-only, usage errors) leave no empty run behind
+    def __init__(self, db_path=DEFAULT_DB_PATH, run_id=None, browser=None, batch_size=20):
+        self.db_path = db_path
+        self.run_id = run_id or uuid.uuid4().hex
+        self.browser = browser
+        self.batch_size = batch_size
+        self.started_at = datetime.now().isoformat()
+        self._pending = []
+        self._conn = None
+
+    # Opens (or creates) the database and registers this run on first use
+    def _connection(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30)   # Waits up to 30 s for another writer's lock
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            with conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO runs (run_id, started_at, browser) VALUES (?, ?, ?)",
+                    (self.run_id, self.started_at, self.browser),
+                )
+            self._conn = conn
+        return self._conn
+
+    # Buffers one result. Written to disk once batch_size results are pending.
+    def add(self, nodeid, outcome, duration, browser=None, worker=None, screenshot=None, error=None):
+        self._pending.append((
+            self.run_id, nodeid, outcome, round(duration, 3), browser or self.browser, worker,
+            screenshot, str(error) if error else None, datetime.now().isoformat(),
+        ))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    # Writes every pending result in a single transaction
+    def flush(self):
+        if not self._pending:
+            return
+        conn = self._connection()
+        with conn:
+            conn.executemany(
+                "INSERT INTO results (run_id, nodeid, outcome, duration, browser, worker, screenshot, error, recorded_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+# Read-only connection for the queries below. Used with contextlib.closing: a connection's own context manager
+# only commits or rolls back, it does not close.
+def _connect(db_path):
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No result store at {db_path}")
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def slowest_tests(db_path=DEFAULT_DB_PATH, limit=10):
+    # Average and worst duration per test across every recorded run
+    with contextlib.closing(_connect(db_path)) as conn:
+        return [dict(row) for row in conn.execute(
+            "SELECT nodeid, COUNT(*) AS runs, ROUND(AVG(duration), 3) AS avg_duration, MAX(duration) AS max_duration "
+            "FROM results GROUP BY nodeid ORDER BY avg_duration DESC LIMIT ?", (limit,))]
+
+
+def pass_rate_per_browser(db_path=DEFAULT_DB_PATH):
+    with contextlib.closing(_connect(db_path)) as conn:
+        return [dict(row) for row in conn.execute(
+            "SELECT browser, COUNT(*) AS total, SUM(outcome = 'passed') AS passed, "
+            "ROUND(100.0 * SUM(outcome = 'passed') / COUNT(*), 1) AS pass_rate "
+            "FROM results GROUP BY browser ORDER BY browser")]
+
+
+def run_history(db_path=DEFAULT_DB_PATH, test=None, limit=20):
+    # Most recent runs first. With a test name, shows that test's outcome in each run.
+    with contextlib.closing(_connect(db_path)) as conn:
+        if test:
+            return [dict(row) for row in conn.execute(
+                "SELECT runs.started_at, results.browser, results.outcome, results.duration, results.error "
+                "FROM results JOIN runs USING (run_id) WHERE results.nodeid LIKE ? "
+                "ORDER BY runs.started_at DESC LIMIT ?", (f"%{test}%", limit))]
+        return [dict(row) for row in conn.execute(
+            "SELECT runs.run_id, runs.started_at, runs.browser, COUNT(results.id) AS total, "
+            "SUM(results.outcome = 'passed') AS passed, ROUND(SUM(results.duration), 1) AS total_duration "
+            "FROM runs LEFT JOIN results USING (run_id) GROUP BY runs.run_id "
+            "ORDER BY runs.started_at DESC LIMIT ?", (limit,))]
+
+
+def _print_rows(rows):
+    if not rows:
+        print("No results recorded")
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(column)), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  ".join(str(c).ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(w) for c, w in zip(columns, widths)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the GUVI test result store")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Path to the results database")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    slowest = commands.add_parser("slowest", help="Slowest tests by average duration")
+    slowest.add_argument("--limit", type=int, default=10)
+    commands.add_parser("pass-rate", help="Pass rate per browser")
+    history = commands.add_parser("history", help="Recent runs, or one test across runs")
+    history.add_argument("--test", help="Substring of the test node id")
+    history.add_argument("--limit", type=int, default=20)
+
+    args = parser.parse_args(argv)
+    if args.command == "slowest":
+        rows = slowest_tests(args.db, args.limit)
+    elif args.command == "pass-rate":
+        rows = pass_rate_per_browser(args.db)
+    else:
+        rows = run_history(args.db, args.test, args.limit)
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+    else:
+        _print_rows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Background screenshot writer used by the pytest_runtest_makereport hook.
+The hook only grabs PNG bytes in memory; disk writes and optional thumbnails happen on a worker thread,
+so teardown and the next test are not held up by encoding and file I/O.
+Thumbnails are small JPEGs the HTML report shows inline, linking to the full PNG.
+"""
+import io
+import os
+import queue
+import random
+import threading
+
+try:
+    from PIL import Image  # Optional - thumbnails are skipped when Pillow is not installed
+except ImportError:
+    Image = None
+
+CAPTURE_POLICIES = ("always", "failures", "sampled")
+THUMBNAIL_WIDTH = 200
+THUMBNAIL_QUALITY = 70
+
+
+def should_capture(policy, passed, sample_rate=0.1):
+    """
+        Decides whether a test gets a screenshot.
+
+        Args:
+            policy (str): "always", "failures" or "sampled"
+            passed (bool): Outcome of the test call
+            sample_rate (float): Share of passing tests captured under the "sampled" policy
+
+        Returns:
+            bool: True when a screenshot should be taken
+    """
+    if policy == "always":
+        return True
+    if policy == "failures":
+        return not passed
+    if policy == "sampled":
+        return not passed or random.random() < sample_rate   # Failures are always kept
+    raise ValueError(f"Unsupported screenshot policy: {policy}")
+
+
+def thumbnail_path_for(path):
+    # screenshots/name.png -> screenshots/thumbnails/name.jpg
+    name = os.path.splitext(os.path.basename(path))[0] + ".jpg"
+    return os.path.join(os.path.dirname(path), "thumbnails", name)
+
+
+class ScreenshotWriter:
+    # Starts the writer thread. One writer is shared by the whole session.
+    def __init__(self, make_thumbnails=True, max_pending=64):
+        self.make_thumbnails = make_thumbnails and Image is not None
+        self._queue = queue.Queue(maxsize=max_pending)   # Bounded so a slow disk applies backpressure
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    # Queues PNG bytes for writing. Returns the thumbnail path the writer will produce, or None.
+    def submit(self, png_bytes, path):
+        thumbnail = thumbnail_path_for(path) if self.make_thumbnails else None
+        self._queue.put((png_bytes, path, thumbnail))
+        return thumbnail
+
+    # Waits until every queued screenshot is on disk, then stops the thread
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            png_bytes, path, thumbnail = job
+            try:
+                os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+                with open(path, "wb") as f:
+                    f.write(png_bytes)
+                if thumbnail:
+                    self._write_thumbnail(png_bytes, thumbnail)
+            except Exception as e:
+                print(f"Screenshot write failed for {path}: {e}")
+
+    def _write_thumbnail(self, png_bytes, thumbnail):
+        os.makedirs(os.path.dirname(thumbnail), exist_ok=True)
+        with Image.open(io.BytesIO(png_bytes)) as image:
+            height = max(1, int(image.height * THUMBNAIL_WIDTH / image.width))
+            small = image.convert("RGB").resize((THUMBNAIL_WIDTH, height), Image.LANCZOS)
+            small.save(thumbnail, "JPEG", quality=THUMBNAIL_QUALITY, optimize=True)
@@ -0,0 +1,142 @@
+"""
+Tracks how long pytest takes to start and collect the GUVI suite.
+Runs `pytest --collect-only` under `python -X importtime`, reports process wall time, pytest's own collection
+time and the slowest imports, and appends the numbers to reports/startup_metrics.jsonl so regressions are visible
+run over run. Run it from the same directory as run.py:
+    python -m guvi_automation.utils.startup_benchmark --runs 5
+
+The benchmarked pytest also loads this module as a plugin (-p), which lists the selenium.webdriver modules in
+sys.modules once collection has finished; -X importtime output alone misses imports of already-loaded packages.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+METRICS_FILE = os.path.join(PROJECT_ROOT, "reports", "startup_metrics.jsonl")
+
+# "import time:       412 |      12345 |   selenium.webdriver"
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)")
+_COLLECTED = re.compile(r"in ([\d.]+)s")
+# Set by measure() for the pytest process it starts; the plugin hook below writes its JSON there
+OUTPUT_ENV = "STARTUP_BENCHMARK_OUTPUT"
+
+
+def pytest_collection_finish(session):
+    # Plugin side: which selenium.webdriver modules collection loaded
+    path = os.environ.get(OUTPUT_ENV)
+    if path:
+        with open(path, "w") as f:
+            json.dump(sorted(name for name in sys.modules if name.startswith("selenium.webdriver")), f)
+
+
+def parse_importtime(stderr):
+    # {module: (self_us, cumulative_us)} from -X importtime output
+    imports = {}
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            imports[match.group(3)] = (int(match.group(1)), int(match.group(2)))
+    return imports
+
+
+def measure(tests, extra_args=()):
+    """
+        Collects the suite once in a fresh interpreter.
+
+        Returns:
+            dict: wall_s, collect_s (as printed by pytest), import_s (sum of self times), imports and
+            webdriver_modules (selenium.webdriver modules loaded when collection finished)
+    """
+    # --capture=no: pytest's fd capture would swallow the -X importtime lines written during collection
+    command = [sys.executable, "-X", "importtime", "-m", "pytest", tests, "--collect-only", "-q", "--capture=no",
+               "-p", "no:cacheprovider", "-p", "guvi_automation.utils.startup_benchmark", *extra_args]
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "modules.json")
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True, env=dict(os.environ, **{OUTPUT_ENV: output}))
+        wall = time.perf_counter() - started
+        webdriver_modules = None
+        if os.path.exists(output):
+            with open(output, "r") as f:
+                webdriver_modules = json.load(f)
+    if result.returncode not in (0, 5):   # 5 = nothing collected, e.g. with a -m filter
+        raise RuntimeError(f"Collection failed (exit code {result.returncode}):\n{result.stdout[-2000:]}")
+
+    collected = _COLLECTED.findall(result.stdout)
+    imports = parse_importtime(result.stderr)
+    return {
+        "wall_s": wall,
+        "collect_s": float(collected[-1]) if collected else None,
+        "import_s": sum(own for own, _ in imports.values()) / 1e6,
+        "imports": imports,
+        "webdriver_modules": webdriver_modules,
+    }
+
+
+def run_benchmark(tests="guvi_automation/tests/", runs=3, top=15, extra_args=(), metrics_file=METRICS_FILE):
+    samples = [measure(tests, extra_args) for _ in range(runs)]
+    last = samples[-1]["imports"]
+    record = {
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "tests": tests,
+        "args": list(extra_args),
+        "runs": runs,
+        "wall_s": round(statistics.median(s["wall_s"] for s in samples), 3),
+        "collect_s": round(statistics.median(s["collect_s"] or 0 for s in samples), 3),
+        "import_s": round(statistics.median(s["import_s"] for s in samples), 3),
+        "selenium_webdriver_loaded": bool(samples[-1]["webdriver_modules"]),
+        "selenium_webdriver_modules": len(samples[-1]["webdriver_modules"] or []),
+        "slowest_imports": [
+            {"module": name, "cumulative_ms": round(cumulative / 1000, 1)}
+            for name, (_, cumulative) in sorted(last.items(), key=lambda item: -item[1][1])[:top]
+        ],
+    }
+
+    previous = None
+    if os.path.exists(metrics_file):
+        with open(metrics_file, "r") as f:
+            history = [json.loads(line) for line in f if line.strip()]
+        matching = [r for r in history if r["tests"] == tests and r["args"] == record["args"]]
+        previous = matching[-1] if matching else None
+
+    os.makedirs(os.path.dirname(metrics_file), exist_ok=True)
+    with open(metrics_file, "a") as f:
+        f.write(json.dumps(record) + "\n")
+    return record, previous
+
+
+def _delta(current, before):
+    return "" if before is None else f" ({current - before:+.3f}s vs last run)"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pytest startup and collection of the GUVI suite")
+    parser.add_argument("--tests", default="guvi_automation/tests/", help="Test path passed to pytest")
+    parser.add_argument("--runs", type=int, default=3, help="Collections to run; the median is reported")
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest imports to list")
+    parser.add_argument("pytest_args", nargs="*", help="Extra pytest arguments after --, e.g. -- -m smoke")
+    args = parser.parse_args(argv)
+
+    record, previous = run_benchmark(args.tests, args.runs, args.top, args.pytest_args)
+    previous = previous or {}
+    print(f"Wall time (median of {args.runs}): {record['wall_s']:.3f}s{_delta(record['wall_s'], previous.get('wall_s'))}")
+    print(f"pytest collection: {record['collect_s']:.3f}s{_delta(record['collect_s'], previous.get('collect_s'))}")
+    print(f"Import time:       {record['import_s']:.3f}s{_delta(record['import_s'], previous.get('import_s'))}")
+    loaded = f"yes ({record['selenium_webdriver_modules']} modules)" if record["selenium_webdriver_loaded"] else "no"
+    print(f"selenium.webdriver imported during collection: {loaded}")
+    print("\nSlowest imports (cumulative):")
+    for entry in record["slowest_imports"]:
+        print(f"  {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+    print(f"\nAppended to {METRICS_FILE}")
+
+
+if __name__ == "__main__":
+    main()
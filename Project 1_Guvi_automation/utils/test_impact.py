@@ -0,0 +1,573 @@
+"""
+Pytest plugin for test impact analysis: runs only the tests a change can affect.
+While tests run, every method of the suite's page objects (pages/*.py) is wrapped to record which methods each test
+exercises, fixtures included. The locator keys a test depends on are read from the AST of those methods and of the
+test function (LOCATORS["LoginPage"]["email_textbox"], Element("LoginPage", ...) attributes, self.locators aliases,
+OrangeHRM's module-level locator dicts). Both are kept per test in .test_impact.json, updated after every run.
+
+--impact-select maps a `git diff` onto page methods, locator entries and test functions by their line spans and
+deselects every test that touches none of them. Changes to conftest.py, utils/, drivers/ or config files run the
+whole suite, and so do tests the map has not seen yet. Both suites load it next to the duration scheduler:
+    pytest_plugins = ["guvi_automation.utils.test_impact"]
+    pytest tests/ --impact-select                 # changes in the working tree
+    pytest tests/ --impact-select=origin/main     # changes since a branch point
+    python -m guvi_automation.utils.test_impact --base origin/main
+"""
+import argparse
+import ast
+import functools
+import glob
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+
+IMPACT_FILE = ".test_impact.json"
+# Packages whose pages/ are instrumented; the one installed at the pytest rootdir is used
+IMPACT_PACKAGES = ("guvi_automation", "project_orangehrm_playwright")
+LOCATORS_FILE = "utils/locators.py"
+PAGES_DIR = "pages"
+TESTS_DIR = "tests"
+# Changes that never affect a test result
+IGNORED = re.compile(r"(\.md|\.png|\.jpe?g|\.gif|\.log|\.html)$|^(reports|screenshots|snapshots|recordings)/|^\.")
+
+# Page methods called since the current test started, as "pages/file.py::Class.method"
+EXERCISED = set()
+# Locator keys read at runtime since the current test started, as "LOCATORS.LoginPage.email_textbox"
+LOCATORS_USED = set()
+
+_HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+# -------------------- Static index --------------------
+
+def _is_trivial(lines):
+    # Blank and comment-only lines cannot change behaviour
+    return all(not line.strip() or line.strip().startswith("#") for line in lines)
+
+
+def _overlaps(span, start, end):
+    return span[0] <= end and start <= span[1]
+
+
+def _within(span, start, end):
+    return span[0] <= start and end <= span[1]
+
+
+def related(key, other):
+    # "LOCATORS.BasePage" and "LOCATORS.BasePage.menu_items.Courses" are related; "...Courses" and "...Practice" are not
+    return key == other or key.startswith(other + ".") or other.startswith(key + ".")
+
+
+class SuiteIndex:
+    """
+        Line spans and locator references of one suite's page objects, locators module and tests, from their AST.
+
+        Keys used throughout:
+            page methods: "pages/base_page.py::BasePage.click_signup_button"
+            locators:     "LOCATORS.BasePage.menu_items.Courses", "LOGIN_PAGE_LOCATORS.username_input"
+            tests:        pytest nodeids without parameters, "tests/test_login.py::test_login"
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.locator_entries = {}   # locator key -> (first line, last line) in the locators module
+        self.spreads = {}           # dict name -> names spread into it with **
+        self.classes = {}           # "pages/x.py::Class" -> {"span", "bases", "aliases", "elements"}
+        self.methods = {}           # page method key -> {"span", "node"}
+        self._index_locators()
+        for path in sorted(glob.glob(os.path.join(root, PAGES_DIR, "*.py"))):
+            self._index_pages(os.path.relpath(path, root).replace(os.sep, "/"))
+
+    def _parse(self, relpath):
+        with open(os.path.join(self.root, relpath), "r", encoding="utf-8") as f:
+            return ast.parse(f.read())
+
+    def _index_locators(self):
+        if not os.path.exists(os.path.join(self.root, LOCATORS_FILE)):
+            return
+
+        def walk(prefix, node):
+            for key, value in zip(node.keys, node.values):
+                if key is None and isinstance(value, ast.Name):
+                    self.spreads.setdefault(prefix, []).append(value.id)
+                elif isinstance(key, ast.Constant) and isinstance(key.value, str):
+                    path = f"{prefix}.{key.value}"
+                    self.locator_entries[path] = (key.lineno, value.end_lineno)
+                    if isinstance(value, ast.Dict):
+                        walk(path, value)
+
+        for statement in self._parse(LOCATORS_FILE).body:
+            if isinstance(statement, ast.Assign) and isinstance(statement.targets[0], ast.Name):
+                name = statement.targets[0].id
+                self.locator_entries[name] = (statement.lineno, statement.end_lineno)
+                if isinstance(statement.value, ast.Dict):
+                    walk(name, statement.value)
+
+    def _index_pages(self, relpath):
+        for node in self._parse(relpath).body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            class_key = f"{relpath}::{node.name}"
+            info = {"span": (node.lineno, node.end_lineno), "bases": [ast.unparse(b).split(".")[-1] for b in node.bases],
+                    "aliases": {}, "elements": {}}
+            self.classes[class_key] = info
+            for item in node.body:
+                if isinstance(item, ast.Assign) and isinstance(item.value, ast.Call) \
+                        and ast.unparse(item.value.func).endswith("Element") and len(item.value.args) == 2:
+                    keys = [a.value for a in item.value.args if isinstance(a, ast.Constant)]
+                    for target in item.targets:
+                        if isinstance(target, ast.Name) and len(keys) == 2:
+                            info["elements"][target.id] = "LOCATORS." + ".".join(keys)
+                elif isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    self.methods[f"{class_key}.{item.name}"] = {"span": (item.lineno, item.end_lineno), "node": item}
+                    # self.locators = LOCATORS["LoginPage"] makes self.locators[...] a LOCATORS["LoginPage"] reference
+                    for sub in ast.walk(item):
+                        if isinstance(sub, ast.Assign) and len(sub.targets) == 1 and _is_self_attribute(sub.targets[0]):
+                            path = self._reference(sub.value, {})
+                            if path:
+                                info["aliases"][sub.targets[0].attr] = path
+
+    def _class_chain(self, class_key):
+        # The class and its bases found in pages/, nearest first
+        chain, pending = [], [class_key]
+        while pending:
+            key = pending.pop(0)
+            if key in chain or key not in self.classes:
+                continue
+            chain.append(key)
+            for base in self.classes[key]["bases"]:
+                pending.extend(k for k in self.classes if k.endswith(f"::{base}"))
+        return chain
+
+    def _reference(self, node, attributes):
+        # Locator key a Name / self.attr / subscript chain / .get() call points at, or None
+        keys = []
+        while True:
+            if isinstance(node, ast.Subscript):
+                keys.append(node.slice)
+                node = node.value
+            elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == "get" \
+                    and node.args:
+                keys.append(node.args[0])
+                node = node.func.value
+            else:
+                break
+        if isinstance(node, ast.Name) and node.id in self.locator_entries:
+            path = node.id
+        elif _is_self_attribute(node) and node.attr in attributes:
+            path = attributes[node.attr]
+        else:
+            return None
+        for key in reversed(keys):
+            if not (isinstance(key, ast.Constant) and isinstance(key.value, str)):
+                break   # LOCATORS["BasePage"]["menu_items"][name] depends on every menu item
+            path += "." + key.value
+        return path
+
+    def locator_refs(self, node, class_key=None):
+        """
+            Locator keys referenced inside a function.
+
+            Args:
+                node (ast.FunctionDef): Page method or test function
+                class_key (str): "pages/x.py::Class" for page methods, so self.<attr> aliases and Elements resolve
+        """
+        attributes = {}
+        for key in reversed(self._class_chain(class_key) if class_key else []):
+            attributes.update(self.classes[key]["elements"])
+            attributes.update(self.classes[key]["aliases"])
+        # Only the outermost expression of a chain counts, and self.locators = LOCATORS[...] is not a use yet
+        skipped = {id(sub.value) for sub in ast.walk(node) if isinstance(sub, ast.Subscript)}
+        skipped |= {id(sub.func.value) for sub in ast.walk(node)
+                    if isinstance(sub, ast.Call) and isinstance(sub.func, ast.Attribute) and sub.func.attr == "get"}
+        skipped |= {id(sub.value) for sub in ast.walk(node)
+                    if isinstance(sub, ast.Assign) and len(sub.targets) == 1 and _is_self_attribute(sub.targets[0])}
+        refs = set()
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.keyword) and sub.arg in attributes:
+                refs.add(attributes[sub.arg])   # self.fill(email_textbox=...) names Elements
+                continue
+            if id(sub) in skipped or isinstance(getattr(sub, "ctx", None), ast.Store) \
+                    or not isinstance(sub, (ast.Subscript, ast.Call, ast.Name, ast.Attribute)):
+                continue
+            path = self._reference(sub, attributes)
+            if path:
+                refs.add(path)
+        return refs
+
+    def method_refs(self, method_key):
+        method = self.methods.get(method_key)
+        if method is None:
+            return set()
+        return self.locator_refs(method["node"], method_key.rpartition(".")[0])
+
+    def spread_keys(self, key):
+        # A change to shared_locators.toast_message also changes every dict that spreads shared_locators
+        name, _, rest = key.partition(".")
+        keys = {key}
+        for target, sources in self.spreads.items():
+            if name in sources:
+                keys.add(f"{target}.{rest}" if rest else target)
+        return keys
+
+    def test_functions(self, relpath):
+        # {"tests/test_x.py::test_y" (or ::Class::test_y): (span, node)} for one test file
+        path = os.path.join(self.root, relpath)
+        if not os.path.exists(path):
+            return {}
+        functions = {}
+        for node in self._parse(relpath).body:
+            if isinstance(node, ast.FunctionDef) and node.name.startswith("test"):
+                functions[f"{relpath}::{node.name}"] = ((node.lineno, node.end_lineno), node)
+            elif isinstance(node, ast.ClassDef):
+                for item in node.body:
+                    if isinstance(item, ast.FunctionDef) and item.name.startswith("test"):
+                        functions[f"{relpath}::{node.name}::{item.name}"] = ((item.lineno, item.end_lineno), item)
+        return functions
+
+
+def _is_self_attribute(node):
+    return isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"
+
+
+# -------------------- Diff --------------------
+
+def diff_ranges(root, base="HEAD"):
+    """
+        Changed line ranges per file under root, from `git diff -U0 <base>` (working tree against base).
+
+        Returns:
+            dict: {path relative to root: [(start, end), ...]} in new-file line numbers; deleted files get (0, inf)
+            and blank or comment-only hunks are left out
+
+        Raises:
+            RuntimeError: If git fails, e.g. an unknown base revision
+    """
+    result = subprocess.run(["git", "diff", "-U0", "--relative", "--no-color", base, "--", "."],
+                            cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"git diff {base} failed: {result.stderr.strip()}")
+
+    ranges, path, hunk, lines = {}, None, None, []
+
+    def flush():
+        if path and hunk and not _is_trivial(lines):
+            ranges.setdefault(path, []).append(hunk)
+
+    for line in result.stdout.splitlines():
+        if line.startswith("diff --git"):
+            flush()
+            path, hunk, lines = None, None, []
+        elif line.startswith("--- a/"):
+            path = line[6:]
+        elif line.startswith("+++ "):
+            if line == "+++ /dev/null":
+                ranges.setdefault(path, []).append((0, float("inf")))   # Deleted file
+                path = None
+            else:
+                path = line[6:]
+        elif line.startswith("@@"):
+            flush()
+            match = _HUNK.match(line)
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            # A pure deletion (count 0) sits between line start and start + 1
+            hunk, lines = (start, start + count - 1 if count else start + 1), []
+        elif line[:1] in "+-" and hunk:
+            lines.append(line[1:])
+    flush()
+    return ranges
+
+
+def changed_entities(index, ranges):
+    """
+        Maps changed line ranges onto what tests can depend on.
+
+        Returns:
+            dict: "methods" (page method keys and class/file prefixes), "locators", "tests" (test keys, or
+            "tests/test_x.py::" for module-level changes) and "run_all" (files that affect every test)
+    """
+    changes = {"methods": set(), "locators": set(), "tests": set(), "run_all": []}
+    for path, spans in ranges.items():
+        if IGNORED.search(path):
+            continue
+        if path == LOCATORS_FILE:
+            for start, end in spans:
+                hit = [k for k, span in index.locator_entries.items() if _overlaps(span, start, end)]
+                deepest = [k for k in hit if not any(o != k and o.startswith(k + ".") for o in hit)]
+                if not deepest:
+                    changes["run_all"].append(path)   # Imports, the By class, helpers
+                for key in deepest:
+                    changes["locators"] |= index.spread_keys(key)
+        elif path.startswith(PAGES_DIR + "/") and path.endswith(".py"):
+            for start, end in spans:
+                methods = [k for k, m in index.methods.items() if k.startswith(path + "::")
+                           and _overlaps(m["span"], start, end)]
+                classes = [k for k, c in index.classes.items() if k.startswith(path + "::")
+                           and _overlaps(c["span"], start, end)]
+                if any(_within(index.methods[m]["span"], start, end) for m in methods):
+                    changes["methods"].update(methods)
+                elif classes and all(_within(index.classes[c]["span"], start, end) for c in classes):
+                    changes["methods"].update(methods)
+                    changes["methods"].update(c + "." for c in classes)   # Class attributes: every method of it
+                else:
+                    changes["methods"].add(path + "::")   # Imports or module code: every method in the file
+        elif path.startswith(TESTS_DIR + "/") and os.path.basename(path).startswith("test_") and path.endswith(".py"):
+            functions = index.test_functions(path)
+            for start, end in spans:
+                hit = [k for k, (span, _) in functions.items() if _overlaps(span, start, end)]
+                inside = any(_within(functions[k][0], start, end) for k in hit)
+                changes["tests"].update(hit if inside else [path + "::"])
+        elif path.endswith((".py", ".ini", ".cfg", ".toml", ".txt", ".json")):
+            changes["run_all"].append(path)
+    return changes
+
+
+# -------------------- Map --------------------
+
+def load_map(root):
+    path = os.path.join(root, IMPACT_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f).get("tests", {})
+
+
+def save_map(root, tests):
+    # Tests whose file is gone are dropped, everything else is kept for the next incremental update
+    tests = {nodeid: entry for nodeid, entry in tests.items()
+             if os.path.exists(os.path.join(root, nodeid.split("::")[0]))}
+    with open(os.path.join(root, IMPACT_FILE), "w") as f:
+        json.dump({"tests": dict(sorted(tests.items()))}, f, indent=2)
+
+
+def _test_key(nodeid):
+    return re.sub(r"\[.*\]$", "", nodeid)
+
+
+def affected(nodeid, entry, changes, index):
+    """
+        Why a test has to run for the given changes, or None when it is not affected.
+
+        Args:
+            nodeid (str): pytest nodeid
+            entry (dict): The test's map entry {"methods", "locators"}, or None when it never ran with the plugin
+    """
+    if changes["run_all"]:
+        return f"{changes['run_all'][0]} changed"
+    key = _test_key(nodeid)
+    if key in changes["tests"] or key.split("::")[0] + "::" in changes["tests"]:
+        return "test changed"
+    if entry is None:
+        return "not in the impact map"
+    for method in entry["methods"]:
+        if any(method == changed or (changed.endswith((":", ".")) and method.startswith(changed))
+               for changed in changes["methods"]):
+            return f"uses {method}"
+    # Locator references as recorded, plus those of the current code of the same methods and test
+    refs = set(entry["locators"])
+    for method in entry["methods"]:
+        refs |= index.method_refs(method)
+    test = index.test_functions(key.split("::")[0]).get(key)
+    if test:
+        refs |= index.locator_refs(test[1])
+    for ref in refs:
+        for changed in changes["locators"]:
+            if related(ref, changed):
+                return f"uses {changed}"
+    return None
+
+
+# -------------------- Recording --------------------
+
+def _recorded(key, function):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        EXERCISED.add(key)
+        return function(*args, **kwargs)
+    wrapper._impact_key = key
+    return wrapper
+
+
+# Called by pages/elements.py whenever an Element's locator is read
+def record_locator(key):
+    LOCATORS_USED.add(key)
+
+
+def instrument_pages(package):
+    """
+        Wraps every method of the classes defined in <package>.pages.* so calls are recorded in EXERCISED.
+        Dunder methods other than __init__ are left alone.
+
+        Returns:
+            int: Number of methods wrapped
+    """
+    pages = importlib.import_module(f"{package}.pages")
+    # GUVI's pages/ has no __init__.py: a namespace package has no __file__, only __path__
+    paths = [path for pages_dir in pages.__path__ for path in glob.glob(os.path.join(pages_dir, "*.py"))]
+    wrapped = 0
+    for path in sorted(paths):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if name == "__init__":
+            continue
+        module = importlib.import_module(f"{package}.pages.{name}")
+        for cls in vars(module).values():
+            if not inspect.isclass(cls) or cls.__module__ != module.__name__:
+                continue
+            for attribute, value in list(vars(cls).items()):
+                if not inspect.isfunction(value) or hasattr(value, "_impact_key") \
+                        or (attribute.startswith("__") and attribute != "__init__"):
+                    continue
+                setattr(cls, attribute, _recorded(f"{PAGES_DIR}/{name}.py::{cls.__qualname__}.{attribute}", value))
+                wrapped += 1
+    return wrapped
+
+
+def suite_package(rootpath):
+    # The instrumented package that lives at the pytest rootdir, if any
+    for package in IMPACT_PACKAGES:
+        spec = importlib.util.find_spec(package)
+        if spec and spec.submodule_search_locations and any(
+                os.path.realpath(location) == os.path.realpath(str(rootpath))
+                for location in spec.submodule_search_locations):
+            return package
+    return None
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("impact", "test impact analysis")
+    group.addoption("--impact-select", action="store", nargs="?", const="HEAD", default=None, metavar="BASE",
+                    help="Only run tests affected by changes since the git revision BASE (default HEAD)")
+    group.addoption("--no-impact-record", action="store_true",
+                    help="Do not record page methods per test into " + IMPACT_FILE)
+
+
+def pytest_configure(config):
+    package = suite_package(config.rootpath)
+    if package:
+        config.pluginmanager.register(ImpactAnalysis(config, package), "impact-analysis")
+
+
+class ImpactAnalysis:
+    def __init__(self, config, package):
+        self.config = config
+        self.root = str(config.rootpath)
+        self.record = not config.getoption("--no-impact-record")
+        self.base = config.getoption("--impact-select")
+        self.observed = {}
+        self.selection = None
+        if self.record:
+            instrument_pages(package)
+
+    # Deselects unaffected tests. Runs on every xdist worker too, so all of them agree on the collection.
+    def pytest_collection_modifyitems(self, config, items):
+        if not self.base:
+            return
+        index = SuiteIndex(self.root)
+        changes = changed_entities(index, diff_ranges(self.root, self.base))
+        tests = load_map(self.root)
+        selected, deselected, reasons = [], [], {}
+        for item in items:
+            reason = affected(item.nodeid, tests.get(_test_key(item.nodeid)), changes, index)
+            if reason:
+                selected.append(item)
+                reasons[item.nodeid] = reason
+            else:
+                deselected.append(item)
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+        self.selection = {"changes": changes, "reasons": reasons, "deselected": len(deselected)}
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        EXERCISED.clear()
+        LOCATORS_USED.clear()
+
+    # Methods and locators seen so far travel with every report, so the xdist controller gets them from the workers
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if self.record:
+            outcome.get_result().user_properties.extend([("impact_methods", sorted(EXERCISED)),
+                                                         ("impact_locators", sorted(LOCATORS_USED))])
+
+    def pytest_runtest_logreport(self, report):
+        if hasattr(self.config, "workerinput") or report.when == "teardown":
+            return
+        properties = dict(report.user_properties)
+        methods = properties.get("impact_methods")
+        if methods is not None and not report.skipped:
+            entry = self.observed.setdefault(_test_key(report.nodeid),
+                                             {"methods": set(), "locators": set(), "passed": True})
+            entry["methods"].update(methods)
+            entry["locators"].update(properties.get("impact_locators", []))
+            entry["passed"] = entry["passed"] and report.passed
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.selection or hasattr(self.config, "workerinput"):
+            return
+        terminalreporter.section("impact selection")
+        changes = self.selection["changes"]
+        terminalreporter.write_line(f"changes since {self.base}: {len(changes['methods'])} page method(s), "
+                                    f"{len(changes['locators'])} locator(s), {len(changes['tests'])} test(s)"
+                                    + (f", suite-wide: {', '.join(changes['run_all'])}" if changes["run_all"] else ""))
+        terminalreporter.write_line(f"selected {len(self.selection['reasons'])}, "
+                                    f"deselected {self.selection['deselected']}")
+        for nodeid, reason in self.selection["reasons"].items():
+            terminalreporter.write_line(f"  {nodeid}: {reason}")
+
+    # Replaces the entries of tests that passed, adds to those that failed part-way, keeps every other test
+    def pytest_sessionfinish(self):
+        if not self.observed or hasattr(self.config, "workerinput"):
+            return
+        tests = load_map(self.root)
+        index = SuiteIndex(self.root)
+        for key, observed in self.observed.items():
+            previous = tests.get(key, {"methods": [], "locators": []})
+            methods = set(observed["methods"]) | (set() if observed["passed"] else set(previous["methods"]))
+            # Locators read at runtime catch names passed as strings, e.g. fill(**values), that the AST cannot see
+            locators = set(observed["locators"]) | (set() if observed["passed"] else set(previous["locators"]))
+            locators |= set().union(*(index.method_refs(m) for m in methods)) if methods else set()
+            test = index.test_functions(key.split("::")[0]).get(key)
+            if test:
+                locators |= index.locator_refs(test[1])
+            tests[key] = {"methods": sorted(methods), "locators": sorted(locators),
+                          "updated": datetime.now().isoformat(timespec="seconds")}
+        save_map(self.root, tests)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="List the tests affected by changes since a git revision")
+    parser.add_argument("--base", default="HEAD", help="Git revision to diff the working tree against")
+    parser.add_argument("--root", default=".", help="Suite directory holding pages/, tests/ and " + IMPACT_FILE)
+    parser.add_argument("--nodeids", action="store_true", help="Only print the affected node ids, for pytest")
+    args = parser.parse_args(argv)
+
+    root = os.path.abspath(args.root)
+    index = SuiteIndex(root)
+    changes = changed_entities(index, diff_ranges(root, args.base))
+    tests = load_map(root)
+    reasons = {nodeid: affected(nodeid, entry, changes, index) for nodeid, entry in tests.items()}
+    reasons = {nodeid: reason for nodeid, reason in reasons.items() if reason}
+    if args.nodeids:
+        print("\n".join(reasons))
+        return 0
+    for kind in ("run_all", "methods", "locators", "tests"):
+        for entry in sorted(changes[kind]):
+            print(f"changed {kind.replace('_', ' ')}: {entry}")
+    print(f"\n{len(reasons)} of {len(tests)} mapped tests affected (tests missing from {IMPACT_FILE} always run):")
+    for nodeid, reason in reasons.items():
+        print(f"  {nodeid}: {reason}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
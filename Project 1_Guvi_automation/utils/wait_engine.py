@@ -0,0 +1,75 @@
+"""
+Adaptive wait engine used by the page objects instead of static sleeps.
+Polls a condition with exponential backoff until it holds or its timeout budget runs out,
+and records how long every wait actually took so slow conditions show up in the reports.
+"""
+import time
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+# Timeout budgets in seconds per named condition. Unknown names fall back to DEFAULT_TIMEOUT.
+WAIT_BUDGETS = {
+    "login_submit_ready": 15,
+    "login_success": 10,
+    "courses_redirect": 15,
+    "dobby_widget": 30,
+}
+DEFAULT_TIMEOUT = 10
+
+# Every wait performed during the current test. Reset by conftest before each test.
+WAIT_RECORDS = []
+
+
+class AdaptiveWait:
+    # Polling starts fast and backs off, so quick conditions return almost immediately
+    def __init__(self, driver, initial_poll=0.1, max_poll=1.0, backoff=1.5, budgets=None):
+        self.driver = driver
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.budgets = budgets if budgets is not None else WAIT_BUDGETS
+        self.ignored_exceptions = (NoSuchElementException, StaleElementReferenceException)
+
+    def until(self, condition, name, timeout=None):
+        """
+            Polls a condition until it returns a truthy value.
+
+            Args:
+                condition (callable): Takes the driver, e.g. an expected_conditions instance
+                name (str): Condition name, used for the timeout budget and the wait report
+                timeout (float): Overrides the budget for this call
+
+            Returns:
+                The truthy value returned by the condition
+
+            Raises:
+                TimeoutException: If the condition does not hold within its budget
+        """
+        timeout = timeout if timeout is not None else self.budgets.get(name, DEFAULT_TIMEOUT)
+        started = time.perf_counter()
+        deadline = started + timeout
+        poll = self.initial_poll
+        last_error = None
+
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    self._record(name, started, timeout, True)
+                    return value
+            except self.ignored_exceptions as e:
+                last_error = e
+
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                self._record(name, started, timeout, False)
+                raise TimeoutException(f"Condition '{name}' not met within {timeout}s: {last_error or ''}")
+            time.sleep(min(poll, remaining))
+            poll = min(poll * self.backoff, self.max_poll)
+
+    def _record(self, name, started, timeout, satisfied):
+        WAIT_RECORDS.append({
+            "name": name,
+            "elapsed": round(time.perf_counter() - started, 3),
+            "timeout": timeout,
+            "satisfied": satisfied,
+        })
@@ -1,9 +1,14 @@
 import os
+import importlib.util
 import pytest, re
 from datetime import datetime
 import json
 from playwright.sync_api import sync_playwright
 from project_orangehrm_playwright.utils.logger import get_logger
+try:
+    from guvi_automation.utils.dom_snapshot import save_dom_snapshot, SNAPSHOT_POLICIES
+except ImportError:   # Checked out without the GUVI suite: --dom-snapshots is accepted but nothing is saved
+    save_dom_snapshot, SNAPSHOT_POLICIES = None, ("failures", "always", "off")
 from project_orangehrm_playwright.pages.login_page import LoginPage
 from project_orangehrm_playwright.pages.dashboard_page import DashboardPage
 from project_orangehrm_playwright.pages.pim_page import PIMPage
@@ -11,6 +16,12 @@ from project_orangehrm_playwright.pages.admin_page import AdminPage
 from _pytest.runner import CallInfo
 from pytest_html import extras
 
+# Shared with the GUVI suite, loaded only when its guvi_automation package is importable (same workspace root).
+# Longest-first scheduling from historical durations, enabled with --duration-schedule.
+# Test impact map of page methods and locators per test, used by --impact-select.
+SHARED_PLUGINS = ["guvi_automation.utils.duration_scheduler", "guvi_automation.utils.test_impact"]
+pytest_plugins = SHARED_PLUGINS if importlib.util.find_spec("guvi_automation") else []
+
 #---------Capturing the HTML plugin for later use in screenshot reporting---------------------------------------
 def pytest_configure(config):
     import os
@@ -45,6 +56,8 @@ def logger():
 def pytest_addoption(parser):
     parser.addoption("--target-browser", default="chromium", help="Choose browser: chromium, firefox, webkit")
     parser.addoption("--run-headed", action="store_true", help="Run browser in headed mode")
+    parser.addoption("--dom-snapshots", default="failures", choices=SNAPSHOT_POLICIES,
+                     help="Save the page DOM to snapshots/ for the offline locator health check")
 
 # --------------------  Fixture: Playwright instance -------------------------------------------------------------------
 @pytest.fixture(scope="session")
@@ -169,6 +182,16 @@ def pytest_runtest_makereport(item, call):
     if not page or not logger:
         return
 
+    # Rendered DOM for the offline locator health check (python -m guvi_automation.utils.locator_health)
+    snapshot_policy = item.config.getoption("--dom-snapshots")
+    if save_dom_snapshot and (snapshot_policy == "always" or (snapshot_policy == "failures" and rep.failed)):
+        try:
+            snapshot_path = save_dom_snapshot(page.content(), item.name, "orangehrm", page.url,
+                                              snapshot_dir=os.path.join(os.path.dirname(__file__), "snapshots"))
+            logger.info(f" DOM snapshot saved: {snapshot_path}")
+        except Exception as e:
+            logger.warning(f" DOM snapshot failed: {e}")
+
     # Get pytest-html plugin
     pytest_html = item.config.pluginmanager.getplugin("html")
     if not pytest_html: